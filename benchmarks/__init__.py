@@ -0,0 +1,3 @@
+''' Mesures de performances du paquet huffman, à lancer depuis la racine du
+dépôt comme modules du paquet benchmarks (`python -m benchmarks.bench_debit`)
+afin que le paquet huffman soit importable sans installation. '''
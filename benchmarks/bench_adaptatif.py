@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+''' Compare le mode adaptatif (une seule passe) au mode statique : délai avant
+le premier octet compressé et débit de compression et de décompression.
+
+Le flux source simule un flux en direct qui fournit ses octets par morceaux,
+avec une attente avant chaque nouveau morceau ; le délai avant le premier
+octet est mesuré depuis le début de la compression jusqu'à la première
+écriture non vide dans la destination. Le mode statique a besoin de relire
+la source : les octets déjà reçus sont alors relus sans attente.
+
+Usage : python -m benchmarks.bench_adaptatif [--taille OCTETS] [--morceau OCTETS]
+                                             [--attente SECONDES] '''
+import argparse
+import io
+import random
+import time
+
+from huffman.adaptatif import compresser_adaptatif, decompresser_adaptatif
+from huffman.compresseur import compresser, decompresser
+
+class SourceEnDirect(io.RawIOBase):
+    ''' Source qui attend avant de fournir chaque morceau pas encore reçu. '''
+    def __init__(self, donnees: bytes, morceau: int, attente: float):
+        super().__init__()
+        self._donnees = donnees
+        self._morceau = morceau
+        self._attente = attente
+        self._position = 0
+        self._recus = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, position, whence=io.SEEK_SET):
+        self._position = position if whence == io.SEEK_SET else len(self._donnees) + position
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, tampon):
+        if self._position >= self._recus and self._recus < len(self._donnees):
+            time.sleep(self._attente)
+            self._recus += self._morceau
+        fin = min(self._position + len(tampon), self._recus, len(self._donnees))
+        nb_octets = fin - self._position
+        tampon[:nb_octets] = self._donnees[self._position:fin]
+        self._position = fin
+        return nb_octets
+
+class DestinationChronometree(io.BytesIO):
+    ''' Destination qui note l'instant de la première écriture non vide. '''
+    def __init__(self):
+        super().__init__()
+        self.premier_octet = None
+
+    def write(self, donnees):
+        if donnees and self.premier_octet is None:
+            self.premier_octet = time.perf_counter()
+        return super().write(donnees)
+
+def corpus(taille: int) -> bytes:
+    ''' Retourne un texte pseudo-aléatoire reproductible.
+
+    params:
+    - taille (int): Nombre d'octets.
+
+    returns:
+    - bytes: Octets du corpus.
+    '''
+    generateur = random.Random(0)
+    mots = [bytes(generateur.choices(b"abcdefghijklmnopqrstuvwxyz", k=generateur.randint(1, 9)))
+            for _ in range(500)]
+    texte = bytearray()
+    while len(texte) < taille:
+        texte += generateur.choice(mots) + b" "
+    return bytes(texte[:taille])
+
+def mesurer(nom: str, compression, decompression, donnees: bytes, morceau: int,
+            attente: float) -> dict:
+    ''' Mesure une compression puis une décompression.
+
+    params:
+    - nom (str): Nom du mode.
+    - compression (function): Fonction (source, destination, morceau) de compression.
+    - decompression (function): Fonction (source, destination) de décompression.
+    - donnees (bytes): Octets à compresser.
+    - morceau (int): Taille des morceaux de la source.
+    - attente (float): Attente avant chaque morceau, en secondes.
+
+    returns:
+    - dict: Mesures du mode.
+    '''
+    destination = DestinationChronometree()
+    debut = time.perf_counter()
+    compression(SourceEnDirect(donnees, morceau, attente), destination, morceau)
+    fin_compression = time.perf_counter()
+    compresse = destination.getvalue()
+
+    resultat = io.BytesIO()
+    debut_decompression = time.perf_counter()
+    decompression(io.BytesIO(compresse), resultat)
+    fin_decompression = time.perf_counter()
+    assert resultat.getvalue() == donnees
+
+    mo = len(donnees) / 1e6
+    return {"mode": nom,
+            "premier_octet_ms": 1e3 * (destination.premier_octet - debut),
+            "compression_mo_s": mo / (fin_compression - debut),
+            "decompression_mo_s": mo / (fin_decompression - debut_decompression),
+            "taux": len(compresse) / len(donnees)}
+
+def main() -> None:
+    ''' Lance la comparaison et affiche les résultats. '''
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    analyseur.add_argument("--taille", type=int, default=1 << 20,
+                           help="nombre d'octets du corpus")
+    analyseur.add_argument("--morceau", type=int, default=4096,
+                           help="taille des morceaux de la source")
+    analyseur.add_argument("--attente", type=float, default=0.0005,
+                           help="attente avant chaque morceau, en secondes")
+    arguments = analyseur.parse_args()
+    donnees = corpus(arguments.taille)
+
+    resultats = [
+        mesurer("statique", lambda source, destination, _: compresser(source, destination),
+                decompresser, donnees, arguments.morceau, arguments.attente),
+        mesurer("adaptatif", compresser_adaptatif, decompresser_adaptatif, donnees,
+                arguments.morceau, arguments.attente),
+    ]
+    print(f"{'mode':<10} {'1er octet (ms)':>15} {'compression (Mo/s)':>19} "
+          f"{'décompression (Mo/s)':>21} {'taux':>6}")
+    for mesure in resultats:
+        print(f"{mesure['mode']:<10} {mesure['premier_octet_ms']:>15.2f} "
+              f"{mesure['compression_mo_s']:>19.2f} {mesure['decompression_mo_s']:>21.2f} "
+              f"{mesure['taux']:>6.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+''' Compare `CompteurIndexe` au `Compteur` d'origine (requêtes par parcours)
+dans un scénario de surveillance d'un flux en direct : les éléments sont
+comptés un par un et les éléments les plus et les moins fréquents sont
+demandés régulièrement.
+
+Usage : python -m benchmarks.bench_compteur [--evenements N] [--elements N]
+                                            [--periode N] '''
+import argparse
+import random
+import time
+
+from huffman.compteur import Compteur
+from huffman.compteur_indexe import CompteurIndexe
+
+def evenements(nombre: int, nb_elements: int) -> list:
+    ''' Retourne une suite reproductible d'éléments de fréquences inégales.
+
+    params:
+    - nombre (int): Nombre d'éléments de la suite.
+    - nb_elements (int): Nombre d'éléments distincts.
+
+    returns:
+    - list[int]: Éléments.
+    '''
+    generateur = random.Random(0)
+    return generateur.choices(range(nb_elements), weights=range(nb_elements, 0, -1), k=nombre)
+
+def mesurer(classe, suite: list, periode: int) -> dict:
+    ''' Compte une suite d'éléments en interrogeant le compteur tous les `periode` éléments.
+
+    params:
+    - classe (type): Classe du compteur.
+    - suite (list): Éléments à compter.
+    - periode (int): Nombre d'éléments comptés entre deux séries de requêtes.
+
+    returns:
+    - dict: Durées du comptage et des requêtes, et résultat des dernières requêtes.
+    '''
+    compteur = classe()
+    duree_comptage = duree_requetes = 0.0
+    for debut in range(0, len(suite), periode):
+        instant = time.perf_counter()
+        for element in suite[debut:debut + periode]:
+            compteur.incrementer(element)
+        apres_comptage = time.perf_counter()
+        resultat = (compteur.elements_plus_frequents(), compteur.elements_moins_frequents(),
+                    compteur.elements_nb_occurrences(1))
+        duree_requetes += time.perf_counter() - apres_comptage
+        duree_comptage += apres_comptage - instant
+    return {"classe": classe.__name__, "comptage_s": duree_comptage,
+            "requetes_s": duree_requetes, "resultat": resultat}
+
+def main() -> None:
+    ''' Lance la comparaison et affiche les résultats. '''
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    analyseur.add_argument("--evenements", type=int, default=200_000,
+                           help="nombre d'éléments comptés")
+    analyseur.add_argument("--elements", type=int, default=5000,
+                           help="nombre d'éléments distincts")
+    analyseur.add_argument("--periode", type=int, default=100,
+                           help="nombre d'éléments comptés entre deux séries de requêtes")
+    arguments = analyseur.parse_args()
+    suite = evenements(arguments.evenements, arguments.elements)
+
+    resultats = [mesurer(classe, suite, arguments.periode) for classe in (Compteur, CompteurIndexe)]
+    assert resultats[0]["resultat"] == resultats[1]["resultat"]
+    print(f"{'compteur':<16} {'comptage (s)':>13} {'requêtes (s)':>13} {'total (s)':>10}")
+    for mesure in resultats:
+        print(f"{mesure['classe']:<16} {mesure['comptage_s']:>13.3f} {mesure['requetes_s']:>13.3f} "
+              f"{mesure['comptage_s'] + mesure['requetes_s']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
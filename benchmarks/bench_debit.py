@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+''' Mesure de bout en bout le débit et la mémoire de chaque étape de la
+compression sur des corpus reproductibles : comptage (`statistiques`),
+construction de l'arbre, génération des codes, compression et décompression.
+
+Les corpus sont générés localement à partir d'une graine : octets aléatoires,
+texte proche de l'anglais, journaux applicatifs (niveaux et routes très
+inégalement répartis) et un unique symbole répété. Un motif d'au plus
+`TAILLE_MOTIF` octets est généré puis écrit autant de fois que nécessaire
+dans le fichier du corpus : le code de Huffman ne dépendant que des
+occurrences des octets, la répétition ne change pas les mesures et les grands
+corpus (jusqu'au Go) se génèrent vite, sans jamais être entiers en mémoire.
+
+Chaque étape est mesurée dans un processus neuf, sur des fichiers d'un
+répertoire temporaire ouverts directement (lus dans leur projection en
+mémoire, comme le ferait un utilisateur), pour que le pic de mémoire
+résidente (RSS) mesuré soit celui de l'étape. Le débit est le nombre de Mo d'origine traités par
+seconde (meilleure de plusieurs répétitions), y compris pour l'arbre et les
+codes dont le coût ne dépend pas de la taille des données.
+
+Les résultats sont écrits en JSON ; `--reference` compare le débit de chaque
+mesure à celui d'un fichier de résultats précédent.
+
+Usage : python -m benchmarks.bench_debit [--corpus NOM ...] [--tailles 1K,64K,1M]
+                                         [--repetitions N] [--sortie FICHIER]
+                                         [--reference FICHIER] '''
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from huffman.codec import vider_cache
+from huffman.compresseur import (arbre_de_huffman, codes_binaire, compresser, decompresser,
+                                 statistiques)
+
+TAILLE_MOTIF = 1 << 20
+# Durée cumulée en dessous de laquelle une étape rapide est répétée davantage
+DUREE_MINIMALE = 0.2
+NB_REPETITIONS_MAX = 1000
+ETAPES = ("statistiques", "arbre", "codes", "compression", "decompression")
+SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+MOTS = ("the of and to in is that it was for on are as with his they at be this from "
+        "have or by one had not but what all were when we there can an your which their "
+        "said if do will each about how up out them then she many some so these would "
+        "other into has more her two like him see time could no make than first been its "
+        "who now people my made over did down only way find use may water long little "
+        "very after words called just where most know get through back much before go "
+        "good new write our used me man too any day same right look think also around "
+        "another came come work three word must because does part even place well such").split()
+
+def motif_aleatoire(generateur: random.Random, taille: int) -> bytes:
+    ''' Octets uniformément aléatoires (données chiffrées ou déjà compressées). '''
+    return generateur.randbytes(taille)
+
+def motif_texte(generateur: random.Random, taille: int) -> bytes:
+    ''' Phrases de mots anglais courants, de fréquences décroissantes (loi de Zipf). '''
+    poids = [1 / rang for rang in range(1, len(MOTS) + 1)]
+    morceaux, longueur = [], 0
+    while longueur < taille:
+        mots = generateur.choices(MOTS, weights=poids, k=generateur.randint(5, 20))
+        phrase = " ".join(mots).capitalize() + generateur.choice(".....?!,;") + " "
+        if generateur.random() < 0.1:
+            phrase += "\n\n"
+        morceaux.append(phrase)
+        longueur += len(phrase)
+    return "".join(morceaux).encode()[:taille]
+
+def motif_journaux(generateur: random.Random, taille: int) -> bytes:
+    ''' Lignes de journal applicatif dont les niveaux, routes et codes de
+    retour sont très inégalement répartis. '''
+    niveaux = ["INFO", "DEBUG", "WARN", "ERROR"]
+    routes = ["/api/v1/articles", "/api/v1/panier", "/sante", "/api/v1/utilisateurs", "/connexion"]
+    statuts = [200, 304, 404, 500]
+    morceaux, longueur, instant = [], 0, 1_700_000_000.0
+    while longueur < taille:
+        instant += generateur.expovariate(50)
+        ligne = (f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(instant))}"
+                 f".{int(instant * 1000) % 1000:03d}Z "
+                 f"{generateur.choices(niveaux, weights=[80, 15, 4, 1])[0]:<5} "
+                 f"[serveur-{generateur.randint(1, 4)}] GET "
+                 f"{generateur.choices(routes, weights=[50, 20, 20, 5, 5])[0]}/"
+                 f"{generateur.randint(1, 99999)} "
+                 f"{generateur.choices(statuts, weights=[90, 6, 3, 1])[0]} "
+                 f"{int(generateur.lognormvariate(2.5, 0.8))}ms\n")
+        morceaux.append(ligne)
+        longueur += len(ligne)
+    return "".join(morceaux).encode()[:taille]
+
+def motif_symbole_unique(_generateur: random.Random, taille: int) -> bytes:
+    ''' Un seul octet répété (arbre réduit à une feuille). '''
+    return b"a" * taille
+
+CORPUS = {"aleatoire": motif_aleatoire, "texte": motif_texte, "journaux": motif_journaux,
+          "symbole_unique": motif_symbole_unique}
+
+def ecrire_corpus(chemin: str, nom: str, taille: int, graine: int = 0) -> None:
+    ''' Écrit un corpus reproductible dans un fichier, motif par motif.
+
+    params:
+    - chemin (str): Fichier à écrire.
+    - nom (str): Nom du corpus (clé de `CORPUS`).
+    - taille (int): Nombre d'octets.
+    - graine (int, optionnel): Graine du générateur pseudo-aléatoire.
+    '''
+    motif = CORPUS[nom](random.Random(graine), min(taille, TAILLE_MOTIF))
+    with open(chemin, "wb") as fichier:
+        restant = taille
+        while restant and motif:
+            restant -= fichier.write(motif[:restant])
+
+def lire_taille(texte: str) -> int:
+    ''' Convertit une taille comme « 64K », « 1M » ou « 1G » en octets. '''
+    texte = texte.strip().upper()
+    if texte and texte[-1] in SUFFIXES:
+        return int(texte[:-1]) * SUFFIXES[texte[-1]]
+    return int(texte)
+
+def rss_pic() -> int:
+    ''' Retourne le pic de mémoire résidente du processus, en octets. '''
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux donne des kio, macOS des octets
+    return pic if sys.platform == "darwin" else pic * 1024
+
+def chronometrer(fonction, repetitions: int) -> float:
+    ''' Retourne la plus courte durée d'exécution d'une fonction, répétée au
+    moins `repetitions` fois et jusqu'à `DUREE_MINIMALE` secondes cumulées. '''
+    durees = []
+    while len(durees) < repetitions or (sum(durees) < DUREE_MINIMALE
+                                        and len(durees) < NB_REPETITIONS_MAX):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+def mesurer_etape(etape: str, chemin_corpus: str, chemin_compresse: str,
+                  repetitions: int) -> dict:
+    ''' Mesure une étape ; exécutée dans un processus neuf.
+
+    params:
+    - etape (str): Nom de l'étape (voir `ETAPES`).
+    - chemin_corpus (str): Fichier contenant le corpus.
+    - chemin_compresse (str): Fichier écrit par l'étape de compression et lu
+    par celle de décompression.
+    - repetitions (int): Nombre minimal de répétitions.
+
+    returns:
+    - dict: Durée, pic de RSS du processus et pic atteint pendant l'étape
+    au-delà de celui de la préparation, en octets.
+    '''
+    taille = os.path.getsize(chemin_corpus)
+    if etape == "decompression":
+        chemin_sortie = chemin_compresse + ".sortie"
+        def fonction():
+            with open(chemin_compresse, "rb") as source, open(chemin_sortie, "w+b") as destination:
+                decompresser(source, destination)
+    elif etape == "statistiques":
+        def fonction():
+            with open(chemin_corpus, "rb") as source:
+                return statistiques(source)
+    elif etape == "compression":
+        def fonction():
+            vider_cache()
+            with open(chemin_corpus, "rb") as source, open(chemin_compresse, "w+b") as destination:
+                compresser(source, destination)
+    else:
+        with open(chemin_corpus, "rb") as source:
+            stat, _ = statistiques(source)
+        arbre = arbre_de_huffman(stat) if taille else None
+        if etape == "arbre":
+            fonction = lambda: arbre_de_huffman(stat) if taille else None
+        else:
+            fonction = lambda: codes_binaire(arbre) if taille else None
+    avant = rss_pic()
+    duree = chronometrer(fonction, repetitions)
+    mesure = {"duree_s": duree, "rss_pic_octets": rss_pic(),
+              "rss_etape_octets": rss_pic() - avant}
+    if etape == "compression":
+        mesure["taux"] = os.path.getsize(chemin_compresse) / taille if taille else None
+    elif etape == "decompression":
+        os.remove(chemin_sortie)
+    return mesure
+
+def lancer(noms_corpus: list, tailles: list, repetitions: int) -> list:
+    ''' Mesure toutes les étapes pour chaque corpus et chaque taille.
+
+    params:
+    - noms_corpus (list[str]): Corpus à mesurer.
+    - tailles (list[int]): Tailles, en octets.
+    - repetitions (int): Nombre minimal de répétitions de chaque étape.
+
+    returns:
+    - list[dict]: Une mesure par corpus, taille et étape.
+    '''
+    contexte = get_context("spawn")
+    resultats = []
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin_corpus = os.path.join(repertoire, "corpus")
+        chemin_compresse = os.path.join(repertoire, "compresse")
+        for nom in noms_corpus:
+            for taille in tailles:
+                ecrire_corpus(chemin_corpus, nom, taille)
+                # Les étapes s'exécutent dans l'ordre : la compression prépare la décompression
+                for etape in ETAPES:
+                    with ProcessPoolExecutor(1, mp_context=contexte) as executeur:
+                        mesure = executeur.submit(mesurer_etape, etape, chemin_corpus,
+                                                  chemin_compresse, repetitions).result()
+                    mesure = {"corpus": nom, "taille": taille, "etape": etape,
+                              "mo_s": taille / 1e6 / mesure["duree_s"] if mesure["duree_s"] else None,
+                              **mesure}
+                    resultats.append(mesure)
+                    print(f"{nom:<15} {taille:>11} {etape:<14} {mesure['mo_s'] or 0:>10.2f} Mo/s "
+                          f"{mesure['rss_pic_octets'] / 1e6:>9.1f} Mo RSS", file=sys.stderr)
+    return resultats
+
+def comparer(resultats: list, reference: dict) -> None:
+    ''' Affiche le rapport entre le débit de chaque mesure et celui de la
+    même mesure (corpus, taille, étape) d'un fichier de résultats précédent. '''
+    anciens = {(mesure["corpus"], mesure["taille"], mesure["etape"]): mesure
+               for mesure in reference["resultats"]}
+    print(f"{'corpus':<15} {'taille':>11} {'étape':<14} {'débit / référence':>18}", file=sys.stderr)
+    for mesure in resultats:
+        ancien = anciens.get((mesure["corpus"], mesure["taille"], mesure["etape"]))
+        if ancien and ancien["mo_s"] and mesure["mo_s"]:
+            print(f"{mesure['corpus']:<15} {mesure['taille']:>11} {mesure['etape']:<14} "
+                  f"{mesure['mo_s'] / ancien['mo_s']:>18.2f}", file=sys.stderr)
+
+def main() -> None:
+    ''' Lance les mesures et écrit les résultats en JSON. '''
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    analyseur.add_argument("--corpus", nargs="+", choices=sorted(CORPUS), default=list(CORPUS),
+                           help="corpus à mesurer")
+    analyseur.add_argument("--tailles", default="1K,64K,1M",
+                           help="tailles séparées par des virgules (suffixes K, M, G), "
+                                "jusqu'à 1G")
+    analyseur.add_argument("--repetitions", type=int, default=3,
+                           help="nombre minimal de répétitions de chaque étape")
+    analyseur.add_argument("--sortie", default="-",
+                           help="fichier JSON des résultats (par défaut, la sortie standard)")
+    analyseur.add_argument("--reference", default=None,
+                           help="fichier JSON d'une exécution précédente à comparer")
+    arguments = analyseur.parse_args()
+    tailles = [lire_taille(taille) for taille in arguments.tailles.split(",")]
+
+    rapport = {"machine": {"python": platform.python_version(), "systeme": platform.platform(),
+                           "processeur": platform.processor(), "nb_coeurs": os.cpu_count()},
+               "parametres": {"corpus": arguments.corpus, "tailles": tailles,
+                              "repetitions": arguments.repetitions, "graine": 0},
+               "resultats": lancer(arguments.corpus, tailles, arguments.repetitions)}
+    if arguments.reference:
+        with open(arguments.reference, encoding="utf-8") as fichier:
+            comparer(rapport["resultats"], json.load(fichier))
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if arguments.sortie == "-":
+        print(texte)
+    else:
+        with open(arguments.sortie, "w", encoding="utf-8") as fichier:
+            fichier.write(texte + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+''' Compare la compression d'un lot de petits tampons indépendants par
+`lot.compresser_plusieurs` à des appels de `compresseur.compresser` en boucle.
+
+Les tampons sont des messages JSON pseudo-aléatoires reproductibles. Pour
+chaque façon de faire, le débit est mesuré en tampons par seconde et en Mo/s
+d'octets d'origine, compression puis décompression (en mode canonique,
+dont l'entête convient aux petits tampons).
+
+Usage : python -m benchmarks.bench_lot [--nombre TAMPONS] [--taille OCTETS]
+                                       [--travailleurs N] '''
+import argparse
+import io
+import json
+import random
+import time
+
+from huffman.codec import vider_cache
+from huffman.compresseur import compresser, decompresser
+from huffman.lot import compresser_plusieurs, decompresser_plusieurs
+
+def corpus(nombre: int, taille: int) -> list:
+    ''' Retourne des messages JSON pseudo-aléatoires reproductibles.
+
+    params:
+    - nombre (int): Nombre de messages.
+    - taille (int): Taille approximative de chaque message, en octets.
+
+    returns:
+    - list[bytes]: Messages.
+    '''
+    generateur = random.Random(0)
+    actions = ["connexion", "achat", "consultation", "deconnexion"]
+    messages = []
+    for _ in range(nombre):
+        evenements = []
+        while len(json.dumps(evenements)) < taille:
+            evenements.append({"utilisateur": generateur.randint(0, 10**6),
+                               "action": generateur.choice(actions),
+                               "montant": round(generateur.random() * 100, 2)})
+        messages.append(json.dumps(evenements).encode())
+    return messages
+
+def compresser_en_boucle(tampons: list) -> list:
+    ''' Compresse chaque tampon avec `compresseur.compresser` en mode canonique. '''
+    resultats = []
+    for tampon in tampons:
+        destination = io.BytesIO()
+        compresser(io.BytesIO(tampon), destination, canonique=True)
+        resultats.append(destination.getvalue())
+    return resultats
+
+def decompresser_en_boucle(compresses: list) -> list:
+    ''' Décompresse chaque tampon avec `compresseur.decompresser`. '''
+    resultats = []
+    for compresse in compresses:
+        destination = io.BytesIO()
+        decompresser(io.BytesIO(compresse), destination)
+        resultats.append(destination.getvalue())
+    return resultats
+
+def mesurer(nom: str, compression, decompression, tampons: list) -> dict:
+    ''' Mesure la compression puis la décompression d'un lot.
+
+    params:
+    - nom (str): Nom de la façon de faire.
+    - compression (function): Fonction (tampons) -> tampons compressés.
+    - decompression (function): Fonction (tampons compressés) -> tampons.
+    - tampons (list[bytes]): Lot à compresser.
+
+    returns:
+    - dict: Mesures.
+    '''
+    vider_cache()
+    debut = time.perf_counter()
+    compresses = compression(tampons)
+    fin_compression = time.perf_counter()
+    resultats = decompression(compresses)
+    fin_decompression = time.perf_counter()
+    assert resultats == tampons
+
+    mo = sum(len(tampon) for tampon in tampons) / 1e6
+    return {"nom": nom,
+            "compression_tampons_s": len(tampons) / (fin_compression - debut),
+            "compression_mo_s": mo / (fin_compression - debut),
+            "decompression_tampons_s": len(tampons) / (fin_decompression - fin_compression),
+            "decompression_mo_s": mo / (fin_decompression - fin_compression),
+            "taux": sum(len(compresse) for compresse in compresses) / (mo * 1e6)}
+
+def main() -> None:
+    ''' Lance la comparaison et affiche les résultats. '''
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    analyseur.add_argument("--nombre", type=int, default=2000, help="nombre de tampons")
+    analyseur.add_argument("--taille", type=int, default=2048,
+                           help="taille approximative de chaque tampon")
+    analyseur.add_argument("--travailleurs", type=int, default=None,
+                           help="nombre de fils ou de processus (par défaut, le nombre de cœurs)")
+    arguments = analyseur.parse_args()
+    tampons = corpus(arguments.nombre, arguments.taille)
+    travailleurs = arguments.travailleurs
+
+    resultats = [
+        mesurer("boucle", compresser_en_boucle, decompresser_en_boucle, tampons),
+        mesurer("lot (appelant)",
+                lambda lot: compresser_plusieurs(lot, 1, canonique=True),
+                lambda lot: decompresser_plusieurs(lot, 1), tampons),
+        mesurer("lot (fils)",
+                lambda lot: compresser_plusieurs(lot, travailleurs, False, canonique=True),
+                lambda lot: decompresser_plusieurs(lot, travailleurs, False), tampons),
+        mesurer("lot (processus)",
+                lambda lot: compresser_plusieurs(lot, travailleurs, True, canonique=True),
+                lambda lot: decompresser_plusieurs(lot, travailleurs, True), tampons),
+        mesurer("lot (table commune)",
+                lambda lot: compresser_plusieurs(lot, 1, table_commune=True, canonique=True),
+                lambda lot: decompresser_plusieurs(lot, 1), tampons),
+    ]
+    print(f"{'mode':<20} {'compr. (tampons/s)':>19} {'compr. (Mo/s)':>14} "
+          f"{'décompr. (tampons/s)':>21} {'décompr. (Mo/s)':>16} {'taux':>6}")
+    for mesure in resultats:
+        print(f"{mesure['nom']:<20} {mesure['compression_tampons_s']:>19.0f} "
+              f"{mesure['compression_mo_s']:>14.2f} {mesure['decompression_tampons_s']:>21.0f} "
+              f"{mesure['decompression_mo_s']:>16.2f} {mesure['taux']:>6.3f}")
+
+if __name__ == "__main__":
+    main()
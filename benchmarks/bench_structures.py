@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+
+''' Micro-benchmarks des structures de base (`Compteur`, `FileDePriorite`,
+`CodeBinaire`, `ArbreHuffman`) : chaque opération est mesurée sur des
+entrées de tailles croissantes, puis sa courbe de coût est ajustée pour en
+déduire l'exposant (pente en échelle log-log) et la classe de complexité la
+plus proche (O(1), O(log n), O(n), O(n log n), O(n²) ou O(n³)).
+
+La durée d'une mesure est celle de l'opération entière sur une entrée de
+taille n (par exemple n appels à `enfiler` dans une file vide), la meilleure
+de plusieurs répétitions, l'entrée étant reconstruite hors chronométrage
+avant chacune d'elles.
+
+`--enregistrer` écrit les mesures dans un fichier JSON de référence ;
+`--comparer` mesure de nouveau et termine avec le code 1 si une opération
+est plus lente que la référence au-delà de la tolérance (rapport médian des
+durées sur les tailles communes, chaque durée étant rapportée à celle d'une
+boucle étalon mesurée au début de l'exécution), ou si sa classe de complexité s'est
+dégradée avec un exposant en hausse de plus de `MARGE_EXPOSANT`.
+
+Usage : python -m benchmarks.bench_structures [--operations NOM ...] [--repetitions N]
+                                              [--enregistrer FICHIER | --comparer FICHIER]
+                                              [--tolerance FRACTION] '''
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+from math import log
+
+from huffman.arbre_huffman import ArbreHuffman
+from huffman.code_binaire import Bit, CodeBinaire
+from huffman.compresseur import arbre_de_huffman, codes_binaire
+from huffman.compteur import Compteur
+from huffman.file_de_priorite import FileDePriorite
+
+# Classes de complexité, de la meilleure à la pire
+CLASSES = {"O(1)": lambda n: 1.0,
+           "O(log n)": log,
+           "O(n)": lambda n: n,
+           "O(n log n)": lambda n: n * log(n),
+           "O(n²)": lambda n: n * n,
+           "O(n³)": lambda n: n ** 3}
+# Hausse de l'exposant, en plus du changement de classe, pour signaler une
+# dégradation de complexité (les classes voisines se confondent dans le bruit)
+MARGE_EXPOSANT = 0.25
+# Ralentissement toléré par défaut : sur une machine partagée, deux exécutions
+# identiques diffèrent couramment de 30 % ; à réduire sur une machine dédiée
+TOLERANCE = 0.5
+NB_REPETITIONS_ETALON = 20
+TAILLES = tuple(1 << puissance for puissance in range(8, 15))
+TAILLES_CODES = tuple(1 << puissance for puissance in range(6, 13))
+
+def melanges(n: int) -> list:
+    ''' Retourne les entiers de 0 à n - 1 dans un ordre pseudo-aléatoire reproductible. '''
+    elements = list(range(n))
+    random.Random(n).shuffle(elements)
+    return elements
+
+def compteur_aleatoire(n: int) -> Compteur:
+    ''' Retourne un compteur de n éléments aux occurrences pseudo-aléatoires. '''
+    generateur = random.Random(n)
+    return Compteur({element: generateur.randint(1, 1000) for element in range(n)})
+
+def code_aleatoire(n: int) -> CodeBinaire:
+    ''' Retourne un code pseudo-aléatoire de n bits. '''
+    return CodeBinaire.depuis_entier(random.Random(n).getrandbits(n), n)
+
+def preparer_incrementer(n: int):
+    ''' n appels à `Compteur.incrementer` sur 64 éléments distincts. '''
+    elements = [element % 64 for element in melanges(n)]
+    def operation():
+        compteur = Compteur()
+        for element in elements:
+            compteur.incrementer(element)
+    return operation
+
+def preparer_plus_frequents(n: int):
+    ''' `Compteur.elements_plus_frequents` sur un compteur de n éléments. '''
+    compteur = compteur_aleatoire(n)
+    return compteur.elements_plus_frequents
+
+def preparer_fusionner(n: int):
+    ''' `Compteur.fusionner` de n / 64 compteurs de 64 éléments. '''
+    compteurs = [compteur_aleatoire(64) for _ in range(n // 64)]
+    return lambda: Compteur.fusionner(compteurs)
+
+def preparer_construire_file(n: int):
+    ''' Construction d'une file de n éléments. '''
+    elements = melanges(n)
+    return lambda: FileDePriorite(elements)
+
+def preparer_enfiler(n: int):
+    ''' n appels à `enfiler` dans une file vide. '''
+    elements = melanges(n)
+    def operation():
+        file = FileDePriorite()
+        for element in elements:
+            file.enfiler(element)
+    return operation
+
+def preparer_defiler(n: int):
+    ''' Vidage d'une file de n éléments par `defiler`. '''
+    file = FileDePriorite(melanges(n))
+    def operation():
+        while not file.est_vide:
+            file.defiler()
+    return operation
+
+def preparer_ajouter_bits(n: int):
+    ''' n appels à `CodeBinaire.ajouter` sur un code vide. '''
+    bits = [Bit.BIT_1 if bit else Bit.BIT_0 for bit in code_aleatoire(n).bits]
+    def operation():
+        code = CodeBinaire()
+        for bit in bits:
+            code.ajouter(bit)
+    return operation
+
+def preparer_concatener(n: int):
+    ''' Concaténation de n / 8 codes de 8 bits. '''
+    morceaux = [code_aleatoire(8) for _ in range(n // 8)]
+    def operation():
+        code = CodeBinaire()
+        for morceau in morceaux:
+            code = code + morceau
+    return operation
+
+def preparer_parcourir_bits(n: int):
+    ''' Lecture des n bits d'un code un par un. '''
+    code = code_aleatoire(n)
+    return lambda: [code[index] for index in range(len(code))]
+
+def preparer_construire_arbre(n: int):
+    ''' `arbre_de_huffman` d'un compteur de n éléments. '''
+    stat = compteur_aleatoire(n)
+    return lambda: arbre_de_huffman(stat)
+
+def preparer_codes(n: int):
+    ''' `codes_binaire` d'un arbre de n feuilles. '''
+    arbre = arbre_de_huffman(compteur_aleatoire(n))
+    return lambda: codes_binaire(arbre)
+
+def preparer_equivalent(n: int):
+    ''' `ArbreHuffman.equivalent` de deux arbres identiques de n feuilles. '''
+    arbre, copie = arbre_de_huffman(compteur_aleatoire(n)), arbre_de_huffman(compteur_aleatoire(n))
+    return lambda: arbre.equivalent(copie)
+
+def preparer_fusion_arbres(n: int):
+    ''' n - 1 fusions d'arbres par `+`. '''
+    feuilles = [ArbreHuffman(element, 1) for element in range(n)]
+    def operation():
+        # Fusion en peigne : le coût d'une fusion ne dépend pas de la taille du sous-arbre
+        arbre = feuilles[0]
+        for feuille in feuilles[1:]:
+            arbre = arbre + feuille
+    return operation
+
+# Nom de l'opération -> (préparation d'une entrée de taille n, tailles mesurées)
+OPERATIONS = {
+    "Compteur.incrementer": (preparer_incrementer, TAILLES),
+    "Compteur.elements_plus_frequents": (preparer_plus_frequents, TAILLES),
+    "Compteur.fusionner": (preparer_fusionner, TAILLES),
+    "FileDePriorite.__init__": (preparer_construire_file, TAILLES),
+    "FileDePriorite.enfiler": (preparer_enfiler, TAILLES),
+    "FileDePriorite.defiler": (preparer_defiler, TAILLES),
+    "CodeBinaire.ajouter": (preparer_ajouter_bits, TAILLES_CODES),
+    "CodeBinaire.__add__": (preparer_concatener, TAILLES_CODES),
+    "CodeBinaire.__getitem__": (preparer_parcourir_bits, TAILLES_CODES),
+    "ArbreHuffman.__add__": (preparer_fusion_arbres, TAILLES),
+    "ArbreHuffman.equivalent": (preparer_equivalent, TAILLES),
+    "arbre_de_huffman": (preparer_construire_arbre, TAILLES),
+    "codes_binaire": (preparer_codes, TAILLES),
+}
+
+def chronometrer(preparation, n: int, repetitions: int) -> float:
+    ''' Retourne la plus courte durée de l'opération sur une entrée de taille n,
+    l'entrée étant préparée de nouveau avant chaque répétition. Le ramasse-miettes
+    est suspendu pendant la mesure, comme dans `timeit`. '''
+    durees = []
+    for _ in range(repetitions):
+        operation = preparation(n)
+        gc.collect()
+        gc.disable()
+        try:
+            debut = time.perf_counter()
+            operation()
+            durees.append(time.perf_counter() - debut)
+        finally:
+            gc.enable()
+    return min(durees)
+
+def etalonner(repetitions: int) -> float:
+    ''' Retourne la durée d'une boucle Python de référence, qui sert d'unité aux
+    comparaisons : les durées rapportées à l'étalon restent comparables d'une
+    exécution à l'autre malgré les changements de fréquence du processeur ou
+    la charge de la machine. '''
+    def boucle():
+        total = 0
+        for valeur in range(200_000):
+            total += valeur & 7
+        return total
+    return chronometrer(lambda n: boucle, 0, max(repetitions, NB_REPETITIONS_ETALON))
+
+def ajuster(tailles: list, durees: list) -> (float, str):
+    ''' Ajuste une courbe de coût mesurée.
+
+    params:
+    - tailles (list[int]): Tailles des entrées (au moins deux, distinctes).
+    - durees (list[float]): Durée mesurée pour chaque taille.
+
+    returns:
+    - tuple[float, str]: Exposant (pente de log(durée) en fonction de log(n),
+    par moindres carrés) et classe de `CLASSES` dont le modèle c × f(n) suit
+    le mieux les mesures (plus petite variance de log(durée / f(n))).
+    '''
+    x = [log(n) for n in tailles]
+    y = [log(max(duree, 1e-9)) for duree in durees]
+    moyenne_x, moyenne_y = statistics.fmean(x), statistics.fmean(y)
+    exposant = (sum((xi - moyenne_x) * (yi - moyenne_y) for xi, yi in zip(x, y))
+                / sum((xi - moyenne_x) ** 2 for xi in x))
+    ecarts = {classe: statistics.pvariance([yi - log(f(n)) for n, yi in zip(tailles, y)])
+              for classe, f in CLASSES.items()}
+    return exposant, min(ecarts, key=ecarts.get)
+
+def mesurer(noms: list, repetitions: int) -> dict:
+    ''' Mesure et ajuste chaque opération.
+
+    params:
+    - noms (list[str]): Opérations à mesurer (clés de `OPERATIONS`).
+    - repetitions (int): Nombre de répétitions de chaque mesure.
+
+    returns:
+    - dict: Durée de l'étalon (voir `etalonner`) et, par opération, tailles,
+    durées, exposant et classe de complexité.
+    '''
+    resultats = {"etalon_s": etalonner(repetitions), "operations": {}}
+    for nom in noms:
+        preparation, tailles = OPERATIONS[nom]
+        durees = [chronometrer(preparation, n, repetitions) for n in tailles]
+        exposant, classe = ajuster(tailles, durees)
+        resultats["operations"][nom] = {"tailles": list(tailles), "durees_s": durees,
+                          "exposant": exposant, "classe": classe}
+    return resultats
+
+def comparer(resultats: dict, reference: dict, tolerance: float) -> list:
+    ''' Compare des mesures à une référence, les durées étant rapportées à
+    l'étalon de leur exécution.
+
+    params:
+    - resultats (dict): Mesures (voir `mesurer`).
+    - reference (dict): Mesures de référence.
+    - tolerance (float): Ralentissement toléré (0.5 pour 50 %).
+
+    returns:
+    - list[str]: Description de chaque régression (vide s'il n'y en a pas).
+    '''
+    rangs = list(CLASSES)
+    echelle = reference["etalon_s"] / resultats["etalon_s"]
+    regressions = []
+    for nom, mesure in resultats["operations"].items():
+        ancienne = reference["operations"].get(nom)
+        if ancienne is None:
+            continue
+        anciennes_durees = dict(zip(ancienne["tailles"], ancienne["durees_s"]))
+        rapports = [duree * echelle / anciennes_durees[n]
+                    for n, duree in zip(mesure["tailles"], mesure["durees_s"])
+                    if anciennes_durees.get(n)]
+        if rapports and statistics.median(rapports) > 1 + tolerance:
+            regressions.append(f"{nom} : {statistics.median(rapports):.2f} fois plus lent")
+        if (rangs.index(mesure["classe"]) > rangs.index(ancienne["classe"])
+                and mesure["exposant"] - ancienne["exposant"] > MARGE_EXPOSANT):
+            regressions.append(f"{nom} : {ancienne['classe']} -> {mesure['classe']} "
+                               f"(exposant {ancienne['exposant']:.2f} -> {mesure['exposant']:.2f})")
+    return regressions
+
+def main() -> None:
+    ''' Lance les mesures, puis les enregistre ou les compare à une référence. '''
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    analyseur.add_argument("--operations", nargs="+", choices=list(OPERATIONS),
+                           default=list(OPERATIONS), help="opérations à mesurer")
+    analyseur.add_argument("--repetitions", type=int, default=5,
+                           help="nombre de répétitions de chaque mesure")
+    mode = analyseur.add_mutually_exclusive_group()
+    mode.add_argument("--enregistrer", default=None,
+                      help="fichier JSON où enregistrer les mesures comme référence")
+    mode.add_argument("--comparer", default=None,
+                      help="fichier JSON de référence auquel comparer les mesures")
+    analyseur.add_argument("--tolerance", type=float, default=TOLERANCE,
+                           help="ralentissement toléré par rapport à la référence (0.5 pour 50 %%)")
+    arguments = analyseur.parse_args()
+
+    resultats = mesurer(arguments.operations, arguments.repetitions)
+    print(f"{'opération':<34} {'n max':>7} {'durée (ms)':>11} {'exposant':>9} {'classe':>11}")
+    for nom, mesure in resultats["operations"].items():
+        print(f"{nom:<34} {mesure['tailles'][-1]:>7} {mesure['durees_s'][-1] * 1e3:>11.3f} "
+              f"{mesure['exposant']:>9.2f} {mesure['classe']:>11}")
+
+    if arguments.enregistrer:
+        with open(arguments.enregistrer, "w", encoding="utf-8") as fichier:
+            json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+            fichier.write("\n")
+    elif arguments.comparer:
+        with open(arguments.comparer, encoding="utf-8") as fichier:
+            regressions = comparer(resultats, json.load(fichier), arguments.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("Aucune régression")
+
+if __name__ == "__main__":
+    main()
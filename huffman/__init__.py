@@ -1 +1 @@
-__all__ = ["CodeBinaire", "Compteur", "FileDePriorite", "ArbreHuffman"]
\ No newline at end of file
+__all__ = ["CodeBinaire", "Compteur", "CompteurOctets", "FileDePriorite", "ArbreHuffman"]
\ No newline at end of file
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+
+''' Module proposant une compression de Huffman adaptative en une seule passe
+(algorithme FGK).
+
+L'arbre est mis à jour après chaque symbole codé, de la même manière par le
+compresseur et par le décompresseur : aucune table ni aucun compteur n'est
+transmis et les premiers octets compressés sont produits dès les premiers
+octets lus. Un flux adaptatif commence par l'identifiant et le mode
+`MODE_ADAPTATIF`, sans taille d'origine. La première occurrence d'un symbole
+est codée par le code du nœud NYT (« pas encore transmis ») suivi du symbole
+sur `NB_BITS_SYMBOLE` bits ; le symbole `FIN` termine le flux. '''
+import io
+
+from huffman.arbre_huffman import ArbreHuffman
+from huffman.flux_binaire import BitWriter
+from huffman.format_fichier import IDENTIFIANT, MODE_ADAPTATIF, FormatInvalideErreur
+
+ENTETE_ADAPTATIF = IDENTIFIANT + bytes([MODE_ADAPTATIF])
+
+# Les 256 octets et le symbole de fin de flux
+NB_SYMBOLES = 257
+FIN = 256
+NB_BITS_SYMBOLE = 9
+# Une feuille et un nœud interne par symbole, plus le nœud NYT
+NB_NOEUDS = 2 * NB_SYMBOLES + 1
+
+TAILLE_LECTURE = 1 << 16
+
+# Valeur d'un fils ou d'un symbole absent
+AUCUN = -1
+
+class ArbreAdaptatif:
+    ''' Arbre de Huffman adaptatif (algorithme FGK).
+
+    Les nœuds sont rangés par numéro : le poids est croissant avec le numéro,
+    deux frères ont des numéros consécutifs et la racine a le plus grand
+    numéro (propriété de fratrie). Pour conserver cette propriété, un nœud
+    dont le poids augmente est d'abord échangé, avec son sous-arbre, contre
+    le nœud de plus grand numéro ayant le même poids.
+
+    arguments:
+    - _poids (list[int]): Poids de chaque nœud.
+    - _parent (list[int]): Parent de chaque nœud (`AUCUN` pour la racine).
+    - _gauche (list[int]): Fils gauche de chaque nœud (`AUCUN` pour une feuille).
+    - _droit (list[int]): Fils droit de chaque nœud (`AUCUN` pour une feuille).
+    - _symboles (list[int]): Symbole de chaque feuille (`AUCUN` sinon).
+    - _feuilles (list[int]): Numéro de la feuille de chaque symbole (`AUCUN` si absent).
+    - _nyt (int): Numéro du nœud NYT.
+    '''
+    def __init__(self):
+        ''' Initialise un arbre réduit au nœud NYT. '''
+        self._poids = [0] * NB_NOEUDS
+        self._parent = [AUCUN] * NB_NOEUDS
+        self._gauche = [AUCUN] * NB_NOEUDS
+        self._droit = [AUCUN] * NB_NOEUDS
+        self._symboles = [AUCUN] * NB_NOEUDS
+        self._feuilles = [AUCUN] * NB_SYMBOLES
+        self._nyt = NB_NOEUDS - 1
+
+    @property
+    def racine(self) -> int:
+        ''' Retourne le numéro de la racine.
+
+        returns:
+        - int: Numéro du nœud.
+        '''
+        return NB_NOEUDS - 1
+
+    @property
+    def nyt(self) -> int:
+        ''' Retourne le numéro du nœud NYT.
+
+        returns:
+        - int: Numéro du nœud.
+        '''
+        return self._nyt
+
+    def contient(self, symbole: int) -> bool:
+        ''' Indique si un symbole a déjà été transmis.
+
+        params:
+        - symbole (int): Symbole recherché.
+
+        returns:
+        - bool: True si le symbole a une feuille.
+        '''
+        return self._feuilles[symbole] != AUCUN
+
+    def fils(self, noeud: int, bit: int) -> int:
+        ''' Retourne le fils d'un nœud interne désigné par un bit.
+
+        params:
+        - noeud (int): Numéro du nœud interne.
+        - bit (int): 0 pour le fils gauche, 1 pour le fils droit.
+
+        returns:
+        - int: Numéro du fils.
+        '''
+        return self._droit[noeud] if bit else self._gauche[noeud]
+
+    def symbole(self, noeud: int) -> int:
+        ''' Retourne le symbole d'une feuille.
+
+        params:
+        - noeud (int): Numéro du nœud.
+
+        returns:
+        - int: Symbole de la feuille, `AUCUN` pour un nœud interne ou le nœud NYT.
+        '''
+        return self._symboles[noeud]
+
+    def est_une_feuille(self, noeud: int) -> bool:
+        ''' Indique si un nœud est une feuille (le nœud NYT compris).
+
+        params:
+        - noeud (int): Numéro du nœud.
+
+        returns:
+        - bool: True si le nœud n'a pas de fils.
+        '''
+        return self._gauche[noeud] == AUCUN
+
+    def code(self, symbole: int) -> (int, int):
+        ''' Retourne le code courant d'un symbole déjà transmis, ou celui du
+        nœud NYT si le symbole est absent.
+
+        params:
+        - symbole (int): Symbole à coder.
+
+        returns:
+        - (int, int): Valeur du code (premier bit en poids faible, prête pour
+        `BitWriter.ecrire`) et longueur du code.
+        '''
+        noeud = self._feuilles[symbole]
+        if noeud == AUCUN:
+            noeud = self._nyt
+        parent, droit = self._parent, self._droit
+        valeur = longueur = 0
+        while (pere := parent[noeud]) != AUCUN:
+            valeur = (valeur << 1) | (droit[pere] == noeud)
+            longueur += 1
+            noeud = pere
+        return valeur, longueur
+
+    def mettre_a_jour(self, symbole: int) -> None:
+        ''' Incrémente le poids d'un symbole et réorganise l'arbre.
+
+        params:
+        - symbole (int): Symbole qui vient d'être codé ou décodé.
+        '''
+        poids, parent = self._poids, self._parent
+        noeud = self._feuilles[symbole]
+        if noeud == AUCUN:
+            # Le nœud NYT devient un nœud interne : nouveau NYT à gauche, nouvelle feuille à droite
+            ancien_nyt = self._nyt
+            feuille = ancien_nyt - 1
+            self._nyt = ancien_nyt - 2
+            self._gauche[ancien_nyt] = self._nyt
+            self._droit[ancien_nyt] = feuille
+            parent[self._nyt] = parent[feuille] = ancien_nyt
+            self._symboles[feuille] = symbole
+            self._feuilles[symbole] = feuille
+            poids[feuille] = 1
+            noeud = ancien_nyt
+
+        racine = self.racine
+        while noeud != AUCUN:
+            meneur = noeud
+            while meneur < racine and poids[meneur + 1] == poids[noeud]:
+                meneur += 1
+            if meneur != noeud and meneur != parent[noeud]:
+                self._echanger(noeud, meneur)
+                noeud = meneur
+            poids[noeud] += 1
+            noeud = parent[noeud]
+
+    def arbre_huffman(self) -> ArbreHuffman:
+        ''' Retourne l'arbre courant sous forme d'ArbreHuffman, sans le nœud NYT.
+
+        returns:
+        - ArbreHuffman: Arbre dont les feuilles sont les symboles transmis.
+
+        raises:
+        - ArbreAdaptatifVideErreur: Levée si aucun symbole n'a été transmis.
+        '''
+        if self._nyt == self.racine:
+            raise ArbreAdaptatifVideErreur("Aucun symbole n'a été transmis")
+        arbres = {}
+        for noeud in range(self._nyt + 1, NB_NOEUDS):
+            if self.est_une_feuille(noeud):
+                arbres[noeud] = ArbreHuffman(self._symboles[noeud], self._poids[noeud])
+            elif self._gauche[noeud] == self._nyt:
+                arbres[noeud] = arbres[self._droit[noeud]]
+            else:
+                arbres[noeud] = arbres[self._gauche[noeud]] + arbres[self._droit[noeud]]
+        return arbres[self.racine]
+
+    def _echanger(self, premier: int, second: int) -> None:
+        ''' Échange deux nœuds, avec leurs sous-arbres, en conservant les numéros.
+
+        params:
+        - premier (int): Numéro du premier nœud.
+        - second (int): Numéro du second nœud.
+        '''
+        for tableau in (self._poids, self._gauche, self._droit, self._symboles):
+            tableau[premier], tableau[second] = tableau[second], tableau[premier]
+        for noeud in (premier, second):
+            if self._gauche[noeud] == AUCUN:
+                if self._symboles[noeud] != AUCUN:
+                    self._feuilles[self._symboles[noeud]] = noeud
+            else:
+                self._parent[self._gauche[noeud]] = noeud
+                self._parent[self._droit[noeud]] = noeud
+
+class CompresseurAdaptatif:
+    ''' Compresse un flux d'octets fourni morceau par morceau, en une seule passe.
+
+    arguments:
+    - _arbre (ArbreAdaptatif): Arbre courant.
+    - _ecrivain (BitWriter): Bits produits pas encore retournés.
+    - _entete_ecrite (bool): Indique si l'entête du flux a été produite.
+    - _termine (bool): Indique si `flush` a été appelée.
+    '''
+    def __init__(self):
+        ''' Initialise le compresseur. '''
+        self._arbre = ArbreAdaptatif()
+        self._ecrivain = BitWriter()
+        self._entete_ecrite = False
+        self._termine = False
+
+    def compress(self, donnees) -> bytes:
+        ''' Compresse des octets.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets à compresser.
+
+        returns:
+        - bytes: Octets compressés complets produits par cet appel (les derniers
+        bits d'un octet incomplet sont retournés par un appel suivant).
+
+        raises:
+        - FluxAdaptatifTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        self._verifier_non_termine()
+        arbre = self._arbre
+        ecrire = self._ecrivain.ecrire
+        for octet in donnees:
+            valeur, longueur = arbre.code(octet)
+            ecrire(valeur, longueur)
+            if not arbre.contient(octet):
+                ecrire(octet, NB_BITS_SYMBOLE)
+            arbre.mettre_a_jour(octet)
+        return self._entete() + self._ecrivain.valeur()
+
+    def flush(self) -> bytes:
+        ''' Termine le flux par le symbole de fin.
+
+        returns:
+        - bytes: Derniers octets compressés.
+
+        raises:
+        - FluxAdaptatifTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        self._verifier_non_termine()
+        self._ecrivain.ecrire(*self._arbre.code(FIN))
+        self._ecrivain.ecrire(FIN, NB_BITS_SYMBOLE)
+        self._ecrivain.vider()
+        self._termine = True
+        return self._entete() + self._ecrivain.valeur()
+
+    def _entete(self) -> bytes:
+        ''' Retourne l'entête du flux si elle n'a pas encore été produite.
+
+        returns:
+        - bytes: Identifiant et mode, ou rien.
+        '''
+        if self._entete_ecrite:
+            return b""
+        self._entete_ecrite = True
+        return ENTETE_ADAPTATIF
+
+    def _verifier_non_termine(self) -> None:
+        ''' Vérifie que le flux n'a pas été terminé.
+
+        raises:
+        - FluxAdaptatifTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        if self._termine:
+            raise FluxAdaptatifTermineErreur("Le flux compressé est déjà terminé")
+
+class DecompresseurAdaptatif:
+    ''' Décompresse un flux produit par CompresseurAdaptatif, fourni morceau par morceau.
+
+    arguments:
+    - _arbre (ArbreAdaptatif): Arbre courant.
+    - _entete (bytearray): Octets de l'entête reçus (None une fois l'entête lue).
+    - _noeud (int): Nœud atteint dans l'arbre par les bits déjà lus du code courant.
+    - _symbole (int): Bits déjà lus d'un symbole transmis en clair.
+    - _nb_bits_symbole (int): Nombre de bits dans `_symbole` (`AUCUN` hors lecture en clair).
+    - eof (bool): Indique si le symbole de fin a été atteint.
+    - unused_data (bytes): Octets reçus après le symbole de fin.
+    '''
+    def __init__(self, entete_lue: bool = False):
+        ''' Initialise le décompresseur.
+
+        params:
+        - entete_lue (bool, optionnel): Indique que l'identifiant et le mode ont
+        déjà été lus (les données fournies commencent par les bits compressés).
+        '''
+        self._arbre = ArbreAdaptatif()
+        self._entete = None if entete_lue else bytearray()
+        self._noeud = self._arbre.racine
+        # Le premier symbole est toujours transmis en clair
+        self._symbole = 0
+        self._nb_bits_symbole = 0
+        self.eof = False
+        self.unused_data = b""
+
+    def decompress(self, donnees) -> bytes:
+        ''' Ajoute des octets compressés et retourne les octets décodés.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets compressés.
+
+        returns:
+        - bytes: Octets décodés.
+
+        raises:
+        - FormatInvalideErreur: Levée si le flux n'a pas le format attendu.
+        '''
+        donnees = bytes(donnees)
+        if self.eof:
+            self.unused_data += donnees
+            return b""
+        if self._entete is not None:
+            manquant = len(ENTETE_ADAPTATIF) - len(self._entete)
+            self._entete += donnees[:manquant]
+            donnees = donnees[manquant:]
+            if len(self._entete) < len(ENTETE_ADAPTATIF):
+                return b""
+            if self._entete != ENTETE_ADAPTATIF:
+                raise FormatInvalideErreur("Entête de flux adaptatif invalide")
+            self._entete = None
+
+        arbre = self._arbre
+        racine = arbre.racine
+        fils, est_une_feuille = arbre.fils, arbre.est_une_feuille
+        noeud, symbole, nb_bits_symbole = self._noeud, self._symbole, self._nb_bits_symbole
+        sortie = bytearray()
+        for position, octet in enumerate(donnees):
+            for decalage in range(8):
+                bit = (octet >> decalage) & 1
+                if nb_bits_symbole == AUCUN:
+                    noeud = fils(noeud, bit)
+                    if not est_une_feuille(noeud):
+                        continue
+                    if noeud != arbre.nyt:
+                        sortie.append(arbre.symbole(noeud))
+                        arbre.mettre_a_jour(arbre.symbole(noeud))
+                        noeud = racine
+                        continue
+                    symbole, nb_bits_symbole = 0, 0
+                    continue
+                symbole |= bit << nb_bits_symbole
+                nb_bits_symbole += 1
+                if nb_bits_symbole < NB_BITS_SYMBOLE:
+                    continue
+                if symbole == FIN:
+                    self.eof = True
+                    self.unused_data = donnees[position + 1:]
+                    return bytes(sortie)
+                if symbole > FIN or arbre.contient(symbole):
+                    raise FormatInvalideErreur(f"Symbole transmis en clair invalide : {symbole}")
+                sortie.append(symbole)
+                arbre.mettre_a_jour(symbole)
+                noeud, nb_bits_symbole = racine, AUCUN
+        self._noeud, self._symbole, self._nb_bits_symbole = noeud, symbole, nb_bits_symbole
+        return bytes(sortie)
+
+def compresser_adaptatif(source: io.RawIOBase, destination: io.RawIOBase,
+                         taille_lecture: int = TAILLE_LECTURE) -> None:
+    ''' Compresse une source lue séquentiellement, sans statistiques préalables.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - taille_lecture (int, optionnel): Nombre maximal d'octets lus à la fois ;
+    les octets compressés de chaque lecture sont écrits aussitôt.
+    '''
+    compresseur = CompresseurAdaptatif()
+    while (chunk := source.read(taille_lecture)):
+        destination.write(compresseur.compress(chunk))
+    destination.write(compresseur.flush())
+
+def decompresser_adaptatif(source: io.RawIOBase, destination: io.RawIOBase,
+                           entete_lue: bool = False,
+                           taille_lecture: int = TAILLE_LECTURE) -> None:
+    ''' Décompresse une source lue séquentiellement.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - entete_lue (bool, optionnel): Indique que l'identifiant et le mode ont déjà été lus.
+    - taille_lecture (int, optionnel): Nombre maximal d'octets lus à la fois.
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux est tronqué ou n'a pas le format attendu.
+    '''
+    decompresseur = DecompresseurAdaptatif(entete_lue)
+    while not decompresseur.eof and (chunk := source.read(taille_lecture)):
+        destination.write(decompresseur.decompress(chunk))
+    if not decompresseur.eof:
+        raise FormatInvalideErreur("Flux compressé tronqué")
+
+class ArbreAdaptatifVideErreur(Exception):
+    ''' Exception levée lorsqu'on convertit un arbre adaptatif sans symbole. '''
+
+class FluxAdaptatifTermineErreur(Exception):
+    ''' Exception levée lorsqu'on utilise un CompresseurAdaptatif déjà terminé. '''
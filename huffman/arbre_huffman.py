@@ -25,12 +25,13 @@ class ArbreHuffman:
         raises:
         - ArbreHuffmanIncoherentErreur : Levée si les paramètres sont incohérents.
         '''
-        if element and nb_occurrences and not (fils_gauche and fils_droit):
+        est_feuille = element is not None and nb_occurrences is not None
+        if est_feuille and not (fils_gauche and fils_droit):
             self._element = element
             self._nb_occurrences = nb_occurrences
             self._fils_gauche = fils_gauche
             self._fils_droit = fils_droit
-        elif fils_gauche and fils_droit and not (element and nb_occurrences):
+        elif fils_gauche and fils_droit and not est_feuille:
             if fils_gauche == fils_droit:
                 raise ArbreHuffmanIncoherentErreur(
                     "Le fils gauche et le fils droit sont identiques.")
@@ -49,7 +50,7 @@ class ArbreHuffman:
         returns:
         - True si l'arbre est une feuille, False sinon.
         '''
-        return bool(self._element)
+        return self._element is not None
 
     @property
     def nb_occurrences(self):
@@ -72,7 +73,7 @@ class ArbreHuffman:
         raises:
         - DoitEtreUneFeuilleErreur : Levée si l'arbre n'est pas une feuille.
         '''
-        if self._element:
+        if self._element is not None:
             return self._element
         raise DoitEtreUneFeuilleErreur("Doit être une feuille.")
 
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe ArbrePlat, un arbre de Huffman stocké dans des
+tableaux parallèles, et la classe VueArbrePlat, qui présente un de ses nœuds
+avec l'interface d'ArbreHuffman.
+
+Chaque nœud est un indice dans les tableaux des fils gauches, des fils
+droits, des parents, des éléments et des nombres d'occurrences : construire
+un arbre n'alloue aucun objet par nœud. Les parcours (attribution des codes,
+comparaison, représentation) sont itératifs et, grâce au tableau des
+parents, n'utilisent pas de pile : leur mémoire ne dépend pas de la
+profondeur de l'arbre. '''
+from array import array
+from itertools import zip_longest
+from typing import Dict
+
+from huffman.arbre_huffman import (ArbreHuffman, ArbreHuffmanIncoherentErreur,
+                                   DoitEtreUneFeuilleErreur, NeDoitPasEtreUneFeuilleErreur)
+from huffman.code_binaire import CodeBinaire, Bit
+from huffman.compteur import Compteur
+from huffman.file_de_priorite import FileDePriorite
+from huffman.format_fichier import CompteurVideErreur
+
+# Indice désignant l'absence de nœud (fils d'une feuille, parent de la racine)
+AUCUN = -1
+
+class ArbrePlat:
+    ''' Arbre binaire dont les nœuds sont des indices dans des tableaux parallèles.
+
+    La racine est le dernier nœud ajouté.
+
+    arguments:
+    - _gauche (array[int]): Fils gauche de chaque nœud (`AUCUN` pour une feuille).
+    - _droit (array[int]): Fils droit de chaque nœud (`AUCUN` pour une feuille).
+    - _parents (array[int]): Parent de chaque nœud (`AUCUN` pour un nœud sans parent).
+    - _elements (list): Élément de chaque feuille (None pour un nœud interne).
+    - _poids (array[int]): Nombre d'occurrences de chaque nœud.
+    '''
+    def __init__(self):
+        ''' Initialise un arbre sans nœud. '''
+        self._gauche = array('i')
+        self._droit = array('i')
+        self._parents = array('i')
+        self._elements = []
+        self._poids = array('q')
+
+    @classmethod
+    def de_huffman(cls, stat: Compteur):
+        ''' Construit l'arbre de Huffman d'un compteur, identique à celui de
+        `compresseur.arbre_de_huffman` (mêmes fusions, dans le même ordre).
+
+        params:
+        - stat (Compteur): Nombre d'occurrences de chaque élément.
+
+        returns:
+        - ArbrePlat: L'arbre.
+
+        raises:
+        - CompteurVideErreur: Levée si le compteur est vide.
+        '''
+        if not stat.elements:
+            raise CompteurVideErreur("Impossible de construire un arbre de Huffman sans élément")
+        arbre = cls()
+        poids = arbre._poids
+        file = FileDePriorite((arbre.ajouter_feuille(element, stat.nb_occurrences(element))
+                               for element in sorted(stat.elements)),
+                              cle=lambda noeud: poids[noeud])
+        while len(file) > 1:
+            fils_gauche = file.defiler()
+            file.remplacer(arbre.ajouter_noeud(fils_gauche, file.element))
+        return arbre
+
+    @classmethod
+    def depuis_arbre(cls, abr: ArbreHuffman):
+        ''' Copie un ArbreHuffman (ou une vue) sans récursion.
+
+        params:
+        - abr (ArbreHuffman): Arbre à copier.
+
+        returns:
+        - ArbrePlat: L'arbre, de même structure.
+        '''
+        arbre = cls()
+        # Parcours postfixe : (sous-arbre, fils déjà copiés)
+        a_visiter = [(abr, False)]
+        copies = []
+        while a_visiter:
+            sous_arbre, fils_copies = a_visiter.pop()
+            if sous_arbre.est_une_feuille:
+                copies.append(arbre.ajouter_feuille(sous_arbre.element, sous_arbre.nb_occurrences))
+            elif fils_copies:
+                droit = copies.pop()
+                copies.append(arbre.ajouter_noeud(copies.pop(), droit))
+            else:
+                a_visiter.append((sous_arbre, True))
+                a_visiter.append((sous_arbre.fils_droit, False))
+                a_visiter.append((sous_arbre.fils_gauche, False))
+        return arbre
+
+    @property
+    def racine(self) -> int:
+        ''' Retourne l'indice de la racine.
+
+        returns:
+        - int: Indice du dernier nœud ajouté (`AUCUN` si l'arbre est vide).
+        '''
+        return len(self._elements) - 1
+
+    def ajouter_feuille(self, element, nb_occurrences: int) -> int:
+        ''' Ajoute une feuille.
+
+        params:
+        - element: Élément de la feuille (non None).
+        - nb_occurrences (int): Nombre d'occurrences de l'élément.
+
+        returns:
+        - int: Indice de la feuille.
+
+        raises:
+        - ArbreHuffmanIncoherentErreur: Levée si l'élément est None.
+        '''
+        if element is None or nb_occurrences is None:
+            raise ArbreHuffmanIncoherentErreur("Une feuille doit avoir un élément et des occurrences")
+        return self._ajouter(AUCUN, AUCUN, element, nb_occurrences)
+
+    def ajouter_noeud(self, fils_gauche: int, fils_droit: int) -> int:
+        ''' Ajoute un nœud interne réunissant deux nœuds sans parent.
+
+        params:
+        - fils_gauche (int): Indice du fils gauche.
+        - fils_droit (int): Indice du fils droit.
+
+        returns:
+        - int: Indice du nœud.
+
+        raises:
+        - ArbreHuffmanIncoherentErreur: Levée si les fils sont identiques, inconnus
+        ou ont déjà un parent.
+        '''
+        if fils_gauche == fils_droit:
+            raise ArbreHuffmanIncoherentErreur("Le fils gauche et le fils droit sont identiques.")
+        for fils in (fils_gauche, fils_droit):
+            if not 0 <= fils < len(self._elements) or self._parents[fils] != AUCUN:
+                raise ArbreHuffmanIncoherentErreur(f"Le nœud {fils} ne peut pas être un fils")
+        noeud = self._ajouter(fils_gauche, fils_droit, None,
+                              self._poids[fils_gauche] + self._poids[fils_droit])
+        self._parents[fils_gauche] = self._parents[fils_droit] = noeud
+        return noeud
+
+    def est_une_feuille(self, noeud: int) -> bool:
+        ''' Indique si un nœud est une feuille.
+
+        params:
+        - noeud (int): Indice du nœud.
+
+        returns:
+        - bool: True pour une feuille.
+        '''
+        return self._gauche[noeud] == AUCUN
+
+    def element(self, noeud: int):
+        ''' Retourne l'élément d'une feuille (None pour un nœud interne).
+
+        params:
+        - noeud (int): Indice du nœud.
+
+        returns:
+        - L'élément.
+        '''
+        return self._elements[noeud]
+
+    def nb_occurrences(self, noeud: int) -> int:
+        ''' Retourne le nombre d'occurrences d'un nœud.
+
+        params:
+        - noeud (int): Indice du nœud.
+
+        returns:
+        - int: Nombre d'occurrences.
+        '''
+        return self._poids[noeud]
+
+    def fils_gauche(self, noeud: int) -> int:
+        ''' Retourne le fils gauche d'un nœud (`AUCUN` pour une feuille).
+
+        params:
+        - noeud (int): Indice du nœud.
+
+        returns:
+        - int: Indice du fils gauche.
+        '''
+        return self._gauche[noeud]
+
+    def fils_droit(self, noeud: int) -> int:
+        ''' Retourne le fils droit d'un nœud (`AUCUN` pour une feuille).
+
+        params:
+        - noeud (int): Indice du nœud.
+
+        returns:
+        - int: Indice du fils droit.
+        '''
+        return self._droit[noeud]
+
+    def codes(self, racine: int = None) -> Dict[object, CodeBinaire]:
+        ''' Retourne le code binaire de chaque feuille d'un sous-arbre, par un
+        parcours en profondeur sans pile.
+
+        params:
+        - racine (int, optionnel): Racine du sous-arbre (par défaut, celle de l'arbre).
+
+        returns:
+        - dict[object, CodeBinaire]: Code de chaque élément (un bit si la racine
+        est une feuille, comme `compresseur.codes_binaire`).
+        '''
+        racine = self.racine if racine is None else racine
+        gauche, droit, parents = self._gauche, self._droit, self._parents
+        if gauche[racine] == AUCUN:
+            return {self._elements[racine]: CodeBinaire(Bit.BIT_0)}
+        codes = {}
+        noeud, valeur, longueur = racine, 0, 0
+        while True:
+            if gauche[noeud] != AUCUN:
+                noeud, valeur, longueur = gauche[noeud], valeur << 1, longueur + 1
+                continue
+            codes[self._elements[noeud]] = CodeBinaire.depuis_entier(valeur, longueur)
+            # Remontée jusqu'au premier ancêtre atteint par son fils gauche
+            while noeud != racine:
+                parent = parents[noeud]
+                if gauche[parent] == noeud:
+                    noeud, valeur = droit[parent], valeur | 1
+                    break
+                noeud, valeur, longueur = parent, valeur >> 1, longueur - 1
+            else:
+                return codes
+
+    def prefixe(self, racine: int = None):
+        ''' Parcourt un sous-arbre en ordre préfixe (nœud, fils gauche, fils droit)
+        sans pile.
+
+        params:
+        - racine (int, optionnel): Racine du sous-arbre (par défaut, celle de l'arbre).
+
+        returns:
+        - Iterator[int]: Indices des nœuds.
+        '''
+        racine = self.racine if racine is None else racine
+        gauche, droit, parents = self._gauche, self._droit, self._parents
+        noeud = racine
+        while True:
+            yield noeud
+            if gauche[noeud] != AUCUN:
+                noeud = gauche[noeud]
+                continue
+            while noeud != racine:
+                parent = parents[noeud]
+                if gauche[parent] == noeud:
+                    noeud = droit[parent]
+                    break
+                noeud = parent
+            else:
+                return
+
+    def equivalent(self, autre, racine: int = None, racine_autre: int = None) -> bool:
+        ''' Vérifie si deux sous-arbres ont la même structure, les mêmes éléments
+        et les mêmes nombres d'occurrences, en mémoire constante.
+
+        La suite préfixe des nœuds, chacun marqué feuille ou non, détermine
+        un arbre binaire complet : il suffit de comparer les deux suites.
+
+        params:
+        - autre (ArbrePlat): L'autre arbre.
+        - racine (int, optionnel): Racine du sous-arbre comparé.
+        - racine_autre (int, optionnel): Racine du sous-arbre de l'autre arbre.
+
+        returns:
+        - bool: True si les sous-arbres sont équivalents.
+        '''
+        if not isinstance(autre, ArbrePlat):
+            return False
+        for noeud, noeud_autre in zip_longest(self.prefixe(racine), autre.prefixe(racine_autre)):
+            if noeud is None or noeud_autre is None:
+                return False
+            if (self.est_une_feuille(noeud) != autre.est_une_feuille(noeud_autre)
+                    or self._poids[noeud] != autre.nb_occurrences(noeud_autre)
+                    or self._elements[noeud] != autre.element(noeud_autre)):
+                return False
+        return True
+
+    def vue(self, noeud: int = None):
+        ''' Retourne une vue d'un nœud avec l'interface d'ArbreHuffman.
+
+        params:
+        - noeud (int, optionnel): Indice du nœud (par défaut, la racine).
+
+        returns:
+        - VueArbrePlat: La vue.
+        '''
+        return VueArbrePlat(self, self.racine if noeud is None else noeud)
+
+    def _ajouter(self, fils_gauche: int, fils_droit: int, element, nb_occurrences: int) -> int:
+        ''' Ajoute un nœud à la fin des tableaux.
+
+        returns:
+        - int: Indice du nœud.
+        '''
+        self._gauche.append(fils_gauche)
+        self._droit.append(fils_droit)
+        self._parents.append(AUCUN)
+        self._elements.append(element)
+        self._poids.append(nb_occurrences)
+        return len(self._elements) - 1
+
+    def __len__(self):
+        ''' Retourne le nombre de nœuds. '''
+        return len(self._elements)
+
+class VueArbrePlat:
+    ''' Nœud d'un ArbrePlat présenté avec l'interface (en lecture) d'ArbreHuffman.
+
+    arguments:
+    - _arbre (ArbrePlat): Arbre contenant le nœud.
+    - _noeud (int): Indice du nœud.
+    '''
+    __slots__ = ("_arbre", "_noeud")
+
+    def __init__(self, arbre: ArbrePlat, noeud: int):
+        ''' Initialise une vue.
+
+        params:
+        - arbre (ArbrePlat): Arbre contenant le nœud.
+        - noeud (int): Indice du nœud.
+        '''
+        self._arbre = arbre
+        self._noeud = noeud
+
+    @property
+    def est_une_feuille(self) -> bool:
+        ''' Vérifie si le nœud est une feuille. '''
+        return self._arbre.est_une_feuille(self._noeud)
+
+    @property
+    def nb_occurrences(self) -> int:
+        ''' Retourne le nombre d'occurrences du nœud. '''
+        return self._arbre.nb_occurrences(self._noeud)
+
+    @property
+    def element(self):
+        ''' Retourne l'élément d'une feuille.
+
+        raises:
+        - DoitEtreUneFeuilleErreur : Levée si le nœud n'est pas une feuille.
+        '''
+        if self.est_une_feuille:
+            return self._arbre.element(self._noeud)
+        raise DoitEtreUneFeuilleErreur("Doit être une feuille.")
+
+    @property
+    def fils_gauche(self):
+        ''' Retourne une vue du fils gauche d'un nœud interne.
+
+        raises:
+        - NeDoitPasEtreUneFeuilleErreur : Levée si le nœud est une feuille.
+        '''
+        if self.est_une_feuille:
+            raise NeDoitPasEtreUneFeuilleErreur("Ne doit pas être une feuille.")
+        return VueArbrePlat(self._arbre, self._arbre.fils_gauche(self._noeud))
+
+    @property
+    def fils_droit(self):
+        ''' Retourne une vue du fils droit d'un nœud interne.
+
+        raises:
+        - NeDoitPasEtreUneFeuilleErreur : Levée si le nœud est une feuille.
+        '''
+        if self.est_une_feuille:
+            raise NeDoitPasEtreUneFeuilleErreur("Ne doit pas être une feuille.")
+        return VueArbrePlat(self._arbre, self._arbre.fils_droit(self._noeud))
+
+    def codes(self) -> Dict[object, CodeBinaire]:
+        ''' Retourne le code binaire de chaque élément du sous-arbre (voir `ArbrePlat.codes`). '''
+        return self._arbre.codes(self._noeud)
+
+    def equivalent(self, autre) -> bool:
+        ''' Vérifie si deux arbres sont équivalents (structure et valeurs identiques).
+
+        params:
+        - autre (VueArbrePlat | ArbreHuffman) : L'autre arbre, copié s'il
+        s'agit d'un ArbreHuffman.
+
+        returns:
+        - bool: True si les arbres sont équivalents, False sinon.
+        '''
+        if isinstance(autre, ArbreHuffman):
+            autre = ArbrePlat.depuis_arbre(autre).vue()
+        if not isinstance(autre, VueArbrePlat):
+            return False
+        return self._arbre.equivalent(autre._arbre, self._noeud, autre._noeud)
+
+    def __gt__(self, autre):
+        return self.nb_occurrences > autre.nb_occurrences
+
+    def __ge__(self, autre):
+        return self.nb_occurrences >= autre.nb_occurrences
+
+    def __lt__(self, autre):
+        return self.nb_occurrences < autre.nb_occurrences
+
+    def __le__(self, autre):
+        return self.nb_occurrences <= autre.nb_occurrences
+
+    def __repr__(self):
+        ''' Retourne une représentation textuelle formelle de l'arbre, de la
+        forme de celle d'ArbreHuffman, construite sans récursion. '''
+        arbre = self._arbre
+        morceaux = []
+        a_ecrire = [self._noeud]
+        while a_ecrire:
+            suivant = a_ecrire.pop()
+            if isinstance(suivant, str):
+                morceaux.append(suivant)
+            elif arbre.est_une_feuille(suivant):
+                morceaux.append(f"ArbreHuffman(element={arbre.element(suivant)}, "
+                                f"nb_occurrences={arbre.nb_occurrences(suivant)})")
+            else:
+                morceaux.append("ArbreHuffman(fils_gauche=")
+                a_ecrire += [")", arbre.fils_droit(suivant), ", fils_droit=",
+                             arbre.fils_gauche(suivant)]
+        return "".join(morceaux)
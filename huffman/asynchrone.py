@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+''' Module proposant la compression et la décompression de flux réseau
+asyncio (`asyncio.StreamReader` / `asyncio.StreamWriter`) découpés en blocs
+(voir le module `blocs`).
+
+Les lectures et les écritures se font sans bloquer la boucle d'événements ;
+l'encodage et le décodage des blocs, coûteux en calcul, sont confiés à un
+exécuteur (par défaut celui de la boucle ; un `ProcessPoolExecutor` évite que
+les calculs ne se partagent le verrou global de l'interpréteur avec la
+boucle). Au plus `blocs_en_vol` blocs sont en cours de traitement : tant que
+le plus ancien n'est pas écrit (`drain` compris), aucun nouveau bloc n'est
+lu, ce qui répercute la lenteur d'un côté sur l'autre et borne la mémoire
+utilisée par une connexion. Le flux produit est identique à celui de
+`flux.compresser_flux`. '''
+import asyncio
+from collections import deque
+
+from huffman.blocs import (encoder_bloc, decoder_bloc, lire_entete_bloc, bloc_fin, encoder_index,
+                           table_du_bloc, verifier_nb_flux, ENTETE_FLUX, SEUIL_BRUT, TAILLE_BLOC,
+                           TAILLE_ENTETE_BLOC, TYPE_FIN, TYPE_INDEX)
+from huffman.format_fichier import FormatInvalideErreur
+
+# Nombre de blocs lus mais pas encore écrits, par connexion
+BLOCS_EN_VOL = 4
+
+async def compresser_asynchrone(lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter,
+                                taille_bloc: int = TAILLE_BLOC, max_bits: int = None,
+                                index: bool = False, nb_flux: int = 1, executeur=None,
+                                blocs_en_vol: int = BLOCS_EN_VOL,
+                                seuil_brut: float = SEUIL_BRUT) -> None:
+    ''' Compresse un flux asyncio jusqu'à sa fin, bloc par bloc.
+
+    params:
+    - lecteur (asyncio.StreamReader): Flux à compresser.
+    - ecrivain (asyncio.StreamWriter): Flux recevant les blocs compressés (il
+    n'est pas fermé).
+    - taille_bloc (int, optionnel): Nombre d'octets d'origine par bloc.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+    - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile de chaque bloc.
+    - executeur (Executor, optionnel): Exécuteur encodant les blocs.
+    - blocs_en_vol (int, optionnel): Nombre maximal de blocs en cours de traitement.
+    - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle un
+    bloc est écrit sans codage (0 pour toujours coder).
+    '''
+    if taille_bloc <= 0:
+        raise ValueError("La taille d'un bloc doit être positive")
+    verifier_nb_flux(nb_flux)
+    _verifier_blocs_en_vol(blocs_en_vol)
+    boucle = asyncio.get_running_loop()
+    en_vol = deque()
+    positions = []
+    position, taille_origine = len(ENTETE_FLUX), 0
+
+    async def ecrire_le_plus_ancien():
+        nonlocal position, taille_origine
+        taille, tache = en_vol.popleft()
+        bloc_compresse = await tache
+        ecrivain.write(bloc_compresse)
+        await ecrivain.drain()
+        positions.append((position, taille_origine))
+        position += len(bloc_compresse)
+        taille_origine += taille
+
+    ecrivain.write(ENTETE_FLUX)
+    try:
+        while (bloc := await _lire_bloc(lecteur, taille_bloc)):
+            en_vol.append((len(bloc), boucle.run_in_executor(executeur, encoder_bloc, bloc,
+                                                             max_bits, nb_flux, seuil_brut)))
+            if len(en_vol) >= blocs_en_vol:
+                await ecrire_le_plus_ancien()
+        while en_vol:
+            await ecrire_le_plus_ancien()
+    finally:
+        for _, tache in en_vol:
+            tache.cancel()
+    if index:
+        bloc_index = encoder_index(positions, taille_origine)
+        ecrivain.write(bloc_index)
+        ecrivain.write(bloc_fin(len(bloc_index)))
+    else:
+        ecrivain.write(bloc_fin())
+    await ecrivain.drain()
+
+async def decompresser_asynchrone(lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter,
+                                  executeur=None, blocs_en_vol: int = BLOCS_EN_VOL) -> None:
+    ''' Décompresse un flux asyncio découpé en blocs jusqu'à son bloc de fin.
+
+    params:
+    - lecteur (asyncio.StreamReader): Flux compressé.
+    - ecrivain (asyncio.StreamWriter): Flux recevant les octets décodés (il n'est pas fermé).
+    - executeur (Executor, optionnel): Exécuteur décodant les blocs.
+    - blocs_en_vol (int, optionnel): Nombre maximal de blocs en cours de traitement.
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux est tronqué ou n'a pas le format attendu.
+    '''
+    _verifier_blocs_en_vol(blocs_en_vol)
+    boucle = asyncio.get_running_loop()
+    en_vol = deque()
+
+    async def ecrire_le_plus_ancien():
+        ecrivain.write(await en_vol.popleft())
+        await ecrivain.drain()
+
+    try:
+        if await _lire_exactement(lecteur, len(ENTETE_FLUX)) != ENTETE_FLUX:
+            raise FormatInvalideErreur("Entête de flux compressé invalide")
+        # Un bloc sans table est décodé avec la table du dernier bloc qui en contient une
+        table = None
+        while True:
+            type_bloc, taille, taille_corps = lire_entete_bloc(
+                await _lire_exactement(lecteur, TAILLE_ENTETE_BLOC))
+            if type_bloc == TYPE_FIN:
+                break
+            corps = await _lire_exactement(lecteur, taille_corps)
+            if type_bloc == TYPE_INDEX:
+                continue
+            en_vol.append(boucle.run_in_executor(executeur, decoder_bloc, type_bloc, taille,
+                                                 corps, None, table))
+            table = table_du_bloc(type_bloc, corps) or table
+            if len(en_vol) >= blocs_en_vol:
+                await ecrire_le_plus_ancien()
+        while en_vol:
+            await ecrire_le_plus_ancien()
+    finally:
+        for tache in en_vol:
+            tache.cancel()
+
+async def _lire_bloc(lecteur: asyncio.StreamReader, taille_bloc: int) -> bytes:
+    ''' Lit un bloc complet, ou les derniers octets du flux.
+
+    params:
+    - lecteur (asyncio.StreamReader): Flux à lire.
+    - taille_bloc (int): Nombre d'octets d'un bloc.
+
+    returns:
+    - bytes: Octets lus (moins de `taille_bloc` uniquement à la fin du flux).
+    '''
+    try:
+        return await lecteur.readexactly(taille_bloc)
+    except asyncio.IncompleteReadError as erreur:
+        return erreur.partial
+
+async def _lire_exactement(lecteur: asyncio.StreamReader, nb_octets: int) -> bytes:
+    ''' Lit exactement nb_octets octets d'un flux compressé.
+
+    params:
+    - lecteur (asyncio.StreamReader): Flux compressé.
+    - nb_octets (int): Nombre d'octets à lire.
+
+    returns:
+    - bytes: Octets lus.
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux se termine avant.
+    '''
+    try:
+        return await lecteur.readexactly(nb_octets)
+    except asyncio.IncompleteReadError as erreur:
+        raise FormatInvalideErreur("Flux compressé tronqué") from erreur
+
+def _verifier_blocs_en_vol(blocs_en_vol: int) -> None:
+    ''' Vérifie le nombre maximal de blocs en cours de traitement.
+
+    params:
+    - blocs_en_vol (int): Nombre à vérifier.
+
+    raises:
+    - ValueError: Levée si le nombre n'est pas strictement positif.
+    '''
+    if blocs_en_vol < 1:
+        raise ValueError("Au moins un bloc doit pouvoir être en cours de traitement")
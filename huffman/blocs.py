@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+
+''' Module proposant l'encodage et le décodage de blocs indépendants.
+
+Un flux découpé en blocs commence par l'identifiant et le mode `MODE_BLOCS`,
+suivis d'une suite de blocs terminée par un bloc de type `TYPE_FIN`. Chaque
+bloc commence par une entête de `TAILLE_ENTETE_BLOC` octets :
+
+- type du bloc (1 octet) ;
+- nombre d'octets d'origine (4 octets) ;
+- nombre d'octets du corps du bloc qui suit (4 octets).
+
+Le corps d'un bloc `TYPE_HUFFMAN` contient les longueurs des codes canoniques
+(taille sur 2 octets puis longueurs encodées) suivies de la charge utile.
+
+Le corps d'un bloc `TYPE_HUFFMAN_MULTIFLUX` contient les mêmes longueurs puis
+le nombre N de sous-flux (1 octet) et une table de sauts donnant la taille des
+N - 1 premiers sous-flux (4 octets chacune), suivis des sous-flux. Le bloc est
+découpé en N segments consécutifs de même taille (le dernier étant plus court)
+codés chacun dans son propre sous-flux avec la table de codes commune : les
+sous-flux peuvent être décodés indépendamment les uns des autres.
+
+Le corps d'un bloc `TYPE_HUFFMAN_TABLE_PRECEDENTE` ne contient que la charge
+utile : il est décodé avec la table du dernier bloc précédent qui en contient
+une. L'apparition d'un bloc avec table marque donc un changement de table.
+
+Le corps d'un bloc `TYPE_BRUT` contient les octets d'origine, sans codage :
+il est produit lorsque l'entropie des octets du bloc laisse espérer une
+économie inférieure à un seuil (données déjà compressées ou chiffrées), ce
+qui évite de construire l'arbre et de coder la charge utile, ou lorsque le
+codage ne réduit pas la taille du bloc. Il ne change pas la table utilisée
+par les blocs `TYPE_HUFFMAN_TABLE_PRECEDENTE` qui le suivent.
+
+Un flux peut se terminer par un bloc `TYPE_INDEX`, placé juste avant le bloc
+de fin, qui donne la position de chaque bloc dans le flux compressé et dans
+les données d'origine. Le champ « nombre d'octets d'origine » du bloc de fin
+contient alors la taille du bloc d'index, ce qui permet de le retrouver
+depuis la fin du fichier. Les lecteurs séquentiels ignorent ce bloc. '''
+from functools import lru_cache
+from typing import Dict
+
+from huffman.canonique import (codes_canoniques, longueurs_codes, encoder_longueurs,
+                               decoder_longueurs, LongueursInvalidesErreur)
+from huffman.codage import codes_canoniques_compteur, entropie, table_de_codage
+from huffman.code_binaire import CodeBinaire
+from huffman.compteur import Compteur
+from huffman.compteur_octets import CompteurOctets
+from huffman.decodeur import DecodeurTable, CodeInvalideErreur
+from huffman.flux_binaire import BitWriter, FinDeFluxErreur
+from huffman.format_fichier import (lire_exactement, FormatInvalideErreur, IDENTIFIANT,
+                                    MODE_BLOCS, NB_OCTETS_CODAGE_INT,
+                                    NB_OCTETS_TAILLE_LONGUEURS)
+
+TAILLE_BLOC = 1 << 20
+
+TYPE_FIN = 0
+TYPE_HUFFMAN = 1
+TYPE_INDEX = 2
+TYPE_HUFFMAN_MULTIFLUX = 3
+TYPE_HUFFMAN_TABLE_PRECEDENTE = 4
+TYPE_BRUT = 5
+TYPES_DONNEES = (TYPE_HUFFMAN, TYPE_HUFFMAN_MULTIFLUX, TYPE_HUFFMAN_TABLE_PRECEDENTE, TYPE_BRUT)
+
+# Économie estimée (fraction de la taille d'origine) en dessous de laquelle un
+# bloc est écrit sans codage : la redondance du code de Huffman et la table
+# des longueurs absorbent en pratique une économie de cet ordre.
+SEUIL_BRUT = 0.05
+
+TAILLE_ENTETE_BLOC = 1 + 2 * NB_OCTETS_CODAGE_INT
+NB_OCTETS_POSITION = 8
+NB_FLUX_MAX = 255
+NB_DECODEURS_EN_CACHE = 16
+ENTETE_FLUX = IDENTIFIANT + bytes([MODE_BLOCS])
+
+def entete_bloc(type_bloc: int, taille: int, taille_corps: int) -> bytes:
+    ''' Construit l'entête d'un bloc.
+
+    params:
+    - type_bloc (int): Type du bloc.
+    - taille (int): Nombre d'octets d'origine.
+    - taille_corps (int): Nombre d'octets du corps du bloc.
+
+    returns:
+    - bytes: Entête de `TAILLE_ENTETE_BLOC` octets.
+    '''
+    return (bytes([type_bloc]) + taille.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+            + taille_corps.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big"))
+
+def lire_entete_bloc(donnees, position: int = 0) -> (int, int, int):
+    ''' Lit l'entête d'un bloc.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Données contenant l'entête.
+    - position (int, optionnel): Position de l'entête dans les données.
+
+    returns:
+    - (int, int, int): Type du bloc, nombre d'octets d'origine et nombre d'octets du corps.
+
+    raises:
+    - FormatInvalideErreur: Levée si l'entête est tronquée.
+    '''
+    if len(donnees) - position < TAILLE_ENTETE_BLOC:
+        raise FormatInvalideErreur("Entête de bloc tronquée")
+    debut = position + 1
+    milieu = debut + NB_OCTETS_CODAGE_INT
+    return (donnees[position],
+            int.from_bytes(donnees[debut:milieu], byteorder="big"),
+            int.from_bytes(donnees[milieu:milieu + NB_OCTETS_CODAGE_INT], byteorder="big"))
+
+def encoder_bloc(donnees, max_bits: int = None, nb_flux: int = 1,
+                 seuil_brut: float = SEUIL_BRUT) -> bytes:
+    ''' Compresse un bloc d'octets non vide avec ses propres codes canoniques,
+    ou l'écrit dans un bloc `TYPE_BRUT` si la compression ne vaut pas la peine.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Octets du bloc.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile (un
+    bloc `TYPE_HUFFMAN_MULTIFLUX` est produit au-delà de 1).
+    - seuil_brut (float, optionnel): Économie estimée (voir `economie_estimee`)
+    en dessous de laquelle le bloc n'est pas codé (0 pour toujours coder).
+
+    returns:
+    - bytes: Bloc compressé, entête comprise.
+
+    raises:
+    - ValueError: Levée si le nombre de sous-flux n'est pas compris entre 1 et `NB_FLUX_MAX`.
+    '''
+    verifier_nb_flux(nb_flux)
+    stat = CompteurOctets()
+    stat.ajouter_octets(donnees)
+    if economie_estimee(stat, len(donnees)) < seuil_brut:
+        return encoder_bloc_brut(donnees)
+    bloc = encoder_bloc_codes(donnees, codes_du_bloc(stat, max_bits), nb_flux)
+    if len(bloc) >= TAILLE_ENTETE_BLOC + len(donnees):
+        return encoder_bloc_brut(donnees)
+    return bloc
+
+def encoder_bloc_brut(donnees) -> bytes:
+    ''' Écrit un bloc d'octets sans codage.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Octets du bloc.
+
+    returns:
+    - bytes: Bloc `TYPE_BRUT`, entête comprise.
+    '''
+    return entete_bloc(TYPE_BRUT, len(donnees), len(donnees)) + bytes(donnees)
+
+def economie_estimee(stat: Compteur, taille: int) -> float:
+    ''' Estime, à partir des seules occurrences, la fraction de la taille d'un
+    bloc qu'un code préfixe peut économiser : 1 - entropie / (8 bits × taille).
+
+    L'estimation est optimiste (le code de Huffman peut perdre jusqu'à un bit
+    par octet par rapport à l'entropie et la table s'ajoute à la charge utile).
+
+    params:
+    - stat (Compteur): Occurrences des octets du bloc.
+    - taille (int): Nombre d'octets du bloc.
+
+    returns:
+    - float: Économie estimée, entre 0 et 1 (0 pour un bloc vide).
+    '''
+    if not taille:
+        return 0.0
+    return 1 - entropie(stat) / (8 * taille)
+
+def codes_du_bloc(stat: Compteur, max_bits: int = None) -> Dict[int, CodeBinaire]:
+    ''' Construit les codes canoniques correspondant aux occurrences d'un bloc.
+
+    params:
+    - stat (Compteur): Occurrences des octets (au moins un octet).
+    - max_bits (int, optionnel): Longueur maximale des codes.
+
+    returns:
+    - dict[int, CodeBinaire]: Code canonique de chaque octet présent.
+    '''
+    return codes_canoniques_compteur(stat, max_bits)
+
+def encoder_bloc_codes(donnees, codes: Dict[int, CodeBinaire], nb_flux: int = 1,
+                       table_precedente: bool = False) -> bytes:
+    ''' Compresse un bloc d'octets avec des codes canoniques donnés.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Octets du bloc, tous présents dans `codes`.
+    - codes (dict[int, CodeBinaire]): Codes canoniques.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile.
+    - table_precedente (bool, optionnel): Produit un bloc
+    `TYPE_HUFFMAN_TABLE_PRECEDENTE`, sans les longueurs des codes, qui doit
+    suivre un bloc contenant la même table.
+
+    returns:
+    - bytes: Bloc compressé, entête comprise.
+
+    raises:
+    - ValueError: Levée si le nombre de sous-flux est invalide ou si un bloc
+    sans table est demandé avec plusieurs sous-flux.
+    '''
+    verifier_nb_flux(nb_flux)
+    table = table_de_codage(codes)
+    if table_precedente:
+        if nb_flux != 1:
+            raise ValueError("Un bloc sans table ne peut pas avoir plusieurs sous-flux")
+        corps = _encoder_charge(donnees, table)
+        return entete_bloc(TYPE_HUFFMAN_TABLE_PRECEDENTE, len(donnees), len(corps)) + corps
+
+    longueurs_encodees = encoder_longueurs(longueurs_codes(codes))
+    entete_longueurs = (len(longueurs_encodees).to_bytes(NB_OCTETS_TAILLE_LONGUEURS,
+                                                         byteorder="big")
+                        + longueurs_encodees)
+    if nb_flux == 1:
+        corps = entete_longueurs + _encoder_charge(donnees, table)
+        return entete_bloc(TYPE_HUFFMAN, len(donnees), len(corps)) + corps
+    with memoryview(donnees) as vue:
+        charges = [_encoder_charge(vue[debut:fin], table)
+                   for debut, fin in _segments(len(donnees), nb_flux)]
+    table_sauts = b"".join(len(charge).to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+                           for charge in charges[:-1])
+    corps = entete_longueurs + bytes([nb_flux]) + table_sauts + b"".join(charges)
+    return entete_bloc(TYPE_HUFFMAN_MULTIFLUX, len(donnees), len(corps)) + corps
+
+def decoder_bloc(type_bloc: int, taille: int, corps, executeur=None,
+                 table_precedente: bytes = None) -> bytearray:
+    ''' Décompresse le corps d'un bloc.
+
+    params:
+    - type_bloc (int): Type du bloc.
+    - taille (int): Nombre d'octets d'origine.
+    - corps (bytes | bytearray | memoryview): Corps du bloc.
+    - executeur (concurrent.futures.Executor, optionnel): Exécuteur auquel
+    confier les sous-flux d'un bloc `TYPE_HUFFMAN_MULTIFLUX` (décodés à la
+    suite sinon).
+    - table_precedente (bytes, optionnel): Table du dernier bloc qui en
+    contient une (voir `table_du_bloc`), nécessaire pour un bloc
+    `TYPE_HUFFMAN_TABLE_PRECEDENTE`.
+
+    returns:
+    - bytearray: Octets d'origine.
+
+    raises:
+    - FormatInvalideErreur: Levée si le bloc est invalide.
+    '''
+    if type_bloc not in TYPES_DONNEES:
+        raise FormatInvalideErreur(f"Type de bloc non supporté : {type_bloc}")
+    corps = memoryview(corps)
+    if type_bloc == TYPE_BRUT:
+        if len(corps) != taille:
+            raise FormatInvalideErreur("Taille d'un bloc brut incohérente")
+        return bytearray(corps)
+    try:
+        if type_bloc == TYPE_HUFFMAN_TABLE_PRECEDENTE:
+            if table_precedente is None:
+                raise FormatInvalideErreur("Bloc sans table non précédé d'une table")
+            return _decodeur(bytes(table_precedente)).decoder_octets(corps, taille)
+        nb_octets_longueurs = int.from_bytes(corps[:NB_OCTETS_TAILLE_LONGUEURS], byteorder="big")
+        debut_charge = NB_OCTETS_TAILLE_LONGUEURS + nb_octets_longueurs
+        decodeur = _decodeur(bytes(corps[NB_OCTETS_TAILLE_LONGUEURS:debut_charge]))
+        if type_bloc == TYPE_HUFFMAN:
+            return decodeur.decoder_octets(corps[debut_charge:], taille)
+        return _decoder_multiflux(decodeur, corps[debut_charge:], taille, executeur)
+    except (LongueursInvalidesErreur, CodeInvalideErreur, FinDeFluxErreur) as erreur:
+        raise FormatInvalideErreur(f"Bloc invalide : {erreur}") from erreur
+
+def table_du_bloc(type_bloc: int, corps) -> bytes:
+    ''' Retourne la table (longueurs des codes encodées) contenue dans un bloc,
+    à fournir au décodage des blocs `TYPE_HUFFMAN_TABLE_PRECEDENTE` qui le suivent.
+
+    params:
+    - type_bloc (int): Type du bloc.
+    - corps (bytes | bytearray | memoryview): Corps du bloc (ou son début).
+
+    returns:
+    - bytes: Longueurs encodées, ou None si le bloc ne contient pas de table.
+    '''
+    if type_bloc not in (TYPE_HUFFMAN, TYPE_HUFFMAN_MULTIFLUX):
+        return None
+    nb_octets_longueurs = int.from_bytes(corps[:NB_OCTETS_TAILLE_LONGUEURS], byteorder="big")
+    return bytes(corps[NB_OCTETS_TAILLE_LONGUEURS:NB_OCTETS_TAILLE_LONGUEURS
+                       + nb_octets_longueurs])
+
+def verifier_nb_flux(nb_flux: int) -> None:
+    ''' Vérifie un nombre de sous-flux par bloc.
+
+    params:
+    - nb_flux (int): Nombre de sous-flux.
+
+    raises:
+    - ValueError: Levée si le nombre n'est pas compris entre 1 et `NB_FLUX_MAX`.
+    '''
+    if not 1 <= nb_flux <= NB_FLUX_MAX:
+        raise ValueError(f"Le nombre de sous-flux doit être compris entre 1 et {NB_FLUX_MAX}")
+
+def bloc_fin(taille_index: int = 0) -> bytes:
+    ''' Retourne le bloc de fin d'un flux découpé en blocs.
+
+    params:
+    - taille_index (int, optionnel): Taille du bloc d'index qui précède (0 sans index).
+
+    returns:
+    - bytes: Entête d'un bloc `TYPE_FIN` vide.
+    '''
+    return entete_bloc(TYPE_FIN, taille_index, 0)
+
+def encoder_index(positions: list, taille_origine: int) -> bytes:
+    ''' Construit le bloc d'index d'un flux.
+
+    params:
+    - positions (list[tuple[int, int]]): Pour chaque bloc, sa position dans le
+    flux compressé puis celle de son premier octet dans les données d'origine.
+    - taille_origine (int): Nombre total d'octets d'origine.
+
+    returns:
+    - bytes: Bloc `TYPE_INDEX`, entête comprise.
+    '''
+    corps = b"".join(position.to_bytes(NB_OCTETS_POSITION, byteorder="big")
+                     for paire in positions for position in paire)
+    corps += taille_origine.to_bytes(NB_OCTETS_POSITION, byteorder="big")
+    return entete_bloc(TYPE_INDEX, 0, len(corps)) + corps
+
+def decoder_index(corps) -> (list, int):
+    ''' Décode le corps d'un bloc d'index.
+
+    params:
+    - corps (bytes | bytearray | memoryview): Corps du bloc `TYPE_INDEX`.
+
+    returns:
+    - (list[tuple[int, int]], int): Positions de chaque bloc (compressée puis
+    d'origine) et nombre total d'octets d'origine.
+
+    raises:
+    - FormatInvalideErreur: Levée si le corps n'a pas la taille attendue.
+    '''
+    if len(corps) % (2 * NB_OCTETS_POSITION) != NB_OCTETS_POSITION:
+        raise FormatInvalideErreur("Bloc d'index invalide")
+    valeurs = [int.from_bytes(corps[debut:debut + NB_OCTETS_POSITION], byteorder="big")
+               for debut in range(0, len(corps), NB_OCTETS_POSITION)]
+    return list(zip(valeurs[:-1:2], valeurs[1:-1:2])), valeurs[-1]
+
+@lru_cache(maxsize=NB_DECODEURS_EN_CACHE)
+def _decodeur(longueurs_encodees: bytes) -> DecodeurTable:
+    ''' Retourne le décodeur d'une table, construit une seule fois pour des
+    blocs successifs utilisant la même table.
+
+    params:
+    - longueurs_encodees (bytes): Longueurs des codes encodées par `encoder_longueurs`.
+
+    returns:
+    - DecodeurTable: Le décodeur.
+
+    raises:
+    - LongueursInvalidesErreur: Levée si les longueurs sont invalides.
+    - CodeInvalideErreur: Levée si les codes ne forment pas un code préfixe.
+    '''
+    return DecodeurTable(codes_canoniques(decoder_longueurs(longueurs_encodees)))
+
+def _encoder_charge(donnees, table) -> bytes:
+    ''' Code des octets avec une table de codes, complétés jusqu'à un octet entier.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Octets à coder.
+    - table (list[tuple[int, int]]): Table retournée par `table_de_codage`.
+
+    returns:
+    - bytes: Charge utile.
+    '''
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(donnees, table)
+    ecrivain.vider()
+    return ecrivain.valeur()
+
+def _segments(taille: int, nb_flux: int) -> list:
+    ''' Découpe un bloc en segments consécutifs, un par sous-flux.
+
+    params:
+    - taille (int): Nombre d'octets d'origine du bloc.
+    - nb_flux (int): Nombre de sous-flux.
+
+    returns:
+    - list[tuple[int, int]]: Début et fin de chaque segment.
+    '''
+    taille_segment = -(-taille // nb_flux)
+    return [(min(i * taille_segment, taille), min((i + 1) * taille_segment, taille))
+            for i in range(nb_flux)]
+
+def _decoder_multiflux(decodeur: DecodeurTable, charge: memoryview, taille: int,
+                       executeur=None) -> bytearray:
+    ''' Décode les sous-flux d'un bloc `TYPE_HUFFMAN_MULTIFLUX`.
+
+    params:
+    - decodeur (DecodeurTable): Décodeur de la table de codes commune.
+    - charge (memoryview): Nombre de sous-flux, table de sauts puis sous-flux.
+    - taille (int): Nombre d'octets d'origine.
+    - executeur (concurrent.futures.Executor, optionnel): Exécuteur des décodages.
+
+    returns:
+    - bytearray: Octets d'origine.
+
+    raises:
+    - FormatInvalideErreur: Levée si la table de sauts est invalide.
+    '''
+    nb_flux = charge[0] if len(charge) else 0
+    debut = 1 + (nb_flux - 1) * NB_OCTETS_CODAGE_INT
+    if not nb_flux or len(charge) < debut:
+        raise FormatInvalideErreur("Table de sauts invalide")
+    bornes = [debut]
+    for position in range(1, debut, NB_OCTETS_CODAGE_INT):
+        bornes.append(bornes[-1] + int.from_bytes(charge[position:position
+                                                         + NB_OCTETS_CODAGE_INT],
+                                                  byteorder="big"))
+    if bornes[-1] > len(charge):
+        raise FormatInvalideErreur("Table de sauts invalide")
+    bornes.append(len(charge))
+    sous_flux = [charge[bornes[i]:bornes[i + 1]] for i in range(nb_flux)]
+    segments = _segments(taille, nb_flux)
+
+    sortie = bytearray(taille)
+    if executeur is None:
+        with memoryview(sortie) as vue:
+            for flux, (debut, fin) in zip(sous_flux, segments):
+                decodeur.decoder_octets(flux, fin - debut, vue[debut:fin])
+    else:
+        resultats = executeur.map(decodeur.decoder_octets, [bytes(flux) for flux in sous_flux],
+                                  [fin - debut for debut, fin in segments])
+        for (debut, fin), octets in zip(segments, resultats):
+            sortie[debut:fin] = octets
+    return sortie
+
+def lire_blocs(source):
+    ''' Parcourt les blocs d'un flux découpé en blocs, entête du flux comprise.
+
+    params:
+    - source: Flux binaire positionné au début du flux compressé.
+
+    returns:
+    - Iterator[tuple[int, int, bytes]]: Type, nombre d'octets d'origine et corps
+    de chaque bloc de données, jusqu'au bloc de fin (exclu).
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux est tronqué ou n'a pas le format attendu.
+    '''
+    if lire_exactement(source, len(ENTETE_FLUX)) != ENTETE_FLUX:
+        raise FormatInvalideErreur("Entête de flux compressé invalide")
+    while True:
+        type_bloc, taille, taille_corps = lire_entete_bloc(
+            lire_exactement(source, TAILLE_ENTETE_BLOC))
+        if type_bloc == TYPE_FIN:
+            return
+        corps = lire_exactement(source, taille_corps)
+        if type_bloc != TYPE_INDEX:
+            yield type_bloc, taille, corps
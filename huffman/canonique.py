@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+''' Module proposant les codes de Huffman canoniques et l'encodage compact
+de leurs longueurs.
+
+Un code canonique est entièrement déterminé par la longueur du code de chaque
+octet : les codes sont attribués par longueur croissante puis par valeur
+d'octet croissante. Il suffit donc de transmettre 256 longueurs, dont la
+plupart sont nulles pour de petits messages. '''
+from typing import Dict
+
+from huffman.code_binaire import CodeBinaire
+from huffman.flux_binaire import BitWriter, BitReader, FinDeFluxErreur
+
+NB_SYMBOLES = 256
+# Nombre de bits du champ donnant la taille des champs de longueur
+NB_BITS_TAILLE_CHAMP = 4
+# Nombre de bits du champ donnant la longueur d'une suite de longueurs nulles
+NB_BITS_SUITE_ZEROS = 8
+
+def longueurs_codes(codes: Dict[int, CodeBinaire]) -> Dict[int, int]:
+    ''' Retourne la longueur du code de chaque octet.
+
+    params:
+    - codes (dict[int, CodeBinaire]): Codes binaires des octets.
+
+    returns:
+    - dict[int, int]: Longueur du code de chaque octet codé.
+    '''
+    return {octet: len(code) for octet, code in codes.items()}
+
+def codes_canoniques(longueurs: Dict[int, int]) -> Dict[int, CodeBinaire]:
+    ''' Construit les codes canoniques correspondant à des longueurs de codes.
+
+    params:
+    - longueurs (dict[int, int]): Longueur du code de chaque octet (les
+    longueurs nulles sont ignorées).
+
+    returns:
+    - dict[int, CodeBinaire]: Code canonique de chaque octet.
+
+    raises:
+    - LongueursInvalidesErreur: Levée si aucun code préfixe n'a ces longueurs.
+    '''
+    symboles = sorted((longueur, octet) for octet, longueur in longueurs.items() if longueur)
+    if not symboles:
+        return {}
+    longueur_max = symboles[-1][0]
+    if sum(1 << (longueur_max - longueur) for longueur, _ in symboles) > 1 << longueur_max:
+        raise LongueursInvalidesErreur("Les longueurs ne respectent pas l'inégalité de Kraft")
+
+    codes = {}
+    valeur = 0
+    longueur_precedente = symboles[0][0]
+    for longueur, octet in symboles:
+        valeur <<= longueur - longueur_precedente
+        codes[octet] = CodeBinaire.depuis_entier(valeur, longueur)
+        valeur += 1
+        longueur_precedente = longueur
+    return codes
+
+def encoder_longueurs(longueurs: Dict[int, int]) -> bytes:
+    ''' Encode les longueurs des 256 codes sous forme compacte.
+
+    Le premier champ (4 bits) donne la taille t des champs de longueur. Chaque
+    longueur est ensuite écrite sur t bits ; une longueur nulle est suivie
+    d'un champ de 8 bits donnant le nombre de longueurs nulles supplémentaires
+    qui la suivent.
+
+    params:
+    - longueurs (dict[int, int]): Longueur du code de chaque octet.
+
+    returns:
+    - bytes: Longueurs encodées, complétées jusqu'à l'octet.
+
+    raises:
+    - LongueursInvalidesErreur: Levée si une longueur n'est pas représentable.
+    '''
+    table = [longueurs.get(octet, 0) for octet in range(NB_SYMBOLES)]
+    if any(not 0 <= longueur < NB_SYMBOLES for longueur in table):
+        raise LongueursInvalidesErreur("Une longueur de code doit être comprise entre 0 et 255")
+    taille_champ = max(max(table).bit_length(), 1)
+
+    ecrivain = BitWriter()
+    ecrivain.ecrire(taille_champ - 1, NB_BITS_TAILLE_CHAMP)
+    octet = 0
+    while octet < NB_SYMBOLES:
+        ecrivain.ecrire(table[octet], taille_champ)
+        if table[octet]:
+            octet += 1
+            continue
+        fin = octet + 1
+        while fin < NB_SYMBOLES and fin - octet < 1 << NB_BITS_SUITE_ZEROS and not table[fin]:
+            fin += 1
+        ecrivain.ecrire(fin - octet - 1, NB_BITS_SUITE_ZEROS)
+        octet = fin
+    ecrivain.vider()
+    return ecrivain.valeur()
+
+def decoder_longueurs(donnees) -> Dict[int, int]:
+    ''' Décode des longueurs encodées par `encoder_longueurs`.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Longueurs encodées.
+
+    returns:
+    - dict[int, int]: Longueur non nulle du code de chaque octet codé.
+
+    raises:
+    - LongueursInvalidesErreur: Levée si les données sont incohérentes.
+    '''
+    lecteur = BitReader(donnees)
+    longueurs = {}
+    try:
+        taille_champ = lecteur.lire(NB_BITS_TAILLE_CHAMP) + 1
+        octet = 0
+        while octet < NB_SYMBOLES:
+            longueur = lecteur.lire(taille_champ)
+            if longueur:
+                longueurs[octet] = longueur
+                octet += 1
+            else:
+                octet += lecteur.lire(NB_BITS_SUITE_ZEROS) + 1
+    except FinDeFluxErreur:
+        raise LongueursInvalidesErreur("Longueurs de codes tronquées") from None
+    if octet != NB_SYMBOLES:
+        raise LongueursInvalidesErreur("Suite de longueurs nulles hors des 256 octets")
+    return longueurs
+
+class LongueursInvalidesErreur(Exception):
+    ''' Exception levée lorsque des longueurs de codes ne permettent pas
+    de construire un code canonique. '''
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+''' Module proposant la construction des codes d'un compteur et de la table
+de codage utilisée par BitWriter, pour les modes de compression (codec,
+blocs, dictionnaires) qui n'ont besoin ni de l'arbre de Huffman en objets
+ni du module principal `compresseur`.
+
+Les codes sont calculés avec un ArbrePlat, dont les fusions sont celles de
+`compresseur.arbre_de_huffman`, ou par package-merge lorsque leur longueur
+est limitée : ils sont identiques à ceux obtenus par `compresseur.codes_binaire`. '''
+from math import log2
+from typing import Dict
+
+from huffman.arbre_plat import ArbrePlat
+from huffman.canonique import codes_canoniques, longueurs_codes
+from huffman.code_binaire import CodeBinaire
+from huffman.compteur import Compteur
+from huffman.flux_binaire import inverser_bits
+from huffman.format_fichier import CompteurVideErreur
+from huffman.longueur_limitee import longueurs_package_merge
+
+def codes_canoniques_compteur(stat: Compteur, max_bits: int = None) -> Dict[int, CodeBinaire]:
+    ''' Construit les codes canoniques des éléments d'un compteur.
+
+    params:
+    - stat (Compteur): Nombre d'occurrences de chaque élément.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+
+    returns:
+    - dict[int, CodeBinaire]: Code canonique de chaque élément présent.
+
+    raises:
+    - CompteurVideErreur: Levée si le compteur est vide.
+    - LongueurMaxInsuffisanteErreur: Levée si `max_bits` bits ne suffisent
+    pas à coder tous les éléments.
+    '''
+    if not stat.elements:
+        raise CompteurVideErreur("Impossible de construire des codes sans élément")
+    if max_bits is None:
+        longueurs = longueurs_codes(ArbrePlat.de_huffman(stat).codes())
+    else:
+        poids = {element: stat.nb_occurrences(element) for element in stat.elements}
+        longueurs = longueurs_package_merge(poids, max_bits)
+    return codes_canoniques(longueurs)
+
+def table_de_codage(codes: Dict[int, CodeBinaire]) -> list:
+    ''' Construit, pour chacun des 256 octets, le couple (valeur inversée,
+    longueur) de son code binaire, prêt à être écrit par un BitWriter.
+
+    params:
+    - codes (dict[int, CodeBinaire]): Code binaire de chaque octet.
+
+    returns:
+    - list[tuple[int, int]]: Couple de chaque octet ((0, 0) pour un octet sans code).
+    '''
+    table = [(0, 0)] * 256
+    for octet, code in codes.items():
+        table[octet] = (inverser_bits(code.valeur, len(code)), len(code))
+    return table
+
+def entropie(stat: Compteur) -> float:
+    ''' Calcule le nombre minimal de bits nécessaires pour coder les
+    occurrences d'un compteur (entropie de Shannon multipliée par le nombre
+    d'occurrences), borne inférieure du coût de tout code préfixe.
+
+    params:
+    - stat (Compteur): Nombre d'occurrences de chaque élément.
+
+    returns:
+    - float: Nombre de bits.
+    '''
+    occurrences = [stat.nb_occurrences(element) for element in stat.elements]
+    total = sum(occurrences)
+    return sum(nb * log2(total / nb) for nb in occurrences if nb)
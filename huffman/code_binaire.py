@@ -25,12 +25,21 @@ class Bit(Enum):
         '''
         return f"{self.name}"
 
+# Correspondances entre les bits et leur valeur entière
+_VALEUR_BIT = {Bit.BIT_0: 0, Bit.BIT_1: 1}
+_BITS = (Bit.BIT_0, Bit.BIT_1)
+
 class CodeBinaire:
     '''Classe représentant un code binaire constitué de bits.
-    
+
+    Le code est stocké sous forme d'un entier et de sa longueur en bits, le
+    premier bit du code étant le bit de poids fort.
+
     arguments:
-    - _bits (list[Bit]): Liste des bits constituant le code binaire.
+    - _valeur (int): Valeur entière des bits du code.
+    - _longueur (int): Nombre de bits du code.
     '''
+    __slots__ = ("_valeur", "_longueur")
 
     def __init__(self, *bits):
         ''' Initialise un CodeBinaire à partir de bits.
@@ -41,8 +50,37 @@ class CodeBinaire:
         raises:
         TypeError: levée si un élément n'est pas un Bit.
         '''
-        self._verifier_type_bits(bits)
-        self._bits = list(bits)
+        self._remplacer_bits(bits)
+
+    @classmethod
+    def depuis_entier(cls, valeur: int, longueur: int):
+        ''' Construit un CodeBinaire directement à partir de sa valeur entière.
+
+        params:
+        - valeur (int): Valeur des bits, le premier bit étant le poids fort.
+        - longueur (int): Nombre de bits du code.
+
+        returns:
+        - CodeBinaire: Le code binaire correspondant.
+
+        raises:
+        - ValueError: Levée si la valeur ne tient pas sur `longueur` bits.
+        '''
+        if longueur < 0 or valeur < 0 or valeur >> longueur:
+            raise ValueError(f"{valeur} ne tient pas sur {longueur} bits")
+        code = cls.__new__(cls)
+        code._valeur = valeur
+        code._longueur = longueur
+        return code
+
+    @property
+    def valeur(self) -> int:
+        ''' Retourne la valeur entière du code (premier bit en poids fort).
+
+        returns:
+        - int: Valeur des bits du code.
+        '''
+        return self._valeur
 
     @property
     def bits(self):
@@ -51,7 +89,7 @@ class CodeBinaire:
         returns:
         - tuple[Bit]: Séquence des bits du CodeBinaire.
         '''
-        return tuple(self._bits)
+        return tuple(self)
 
     def ajouter(self, bit):
         ''' Ajoute un bit au CodeBinaire. 
@@ -62,8 +100,9 @@ class CodeBinaire:
         raises:
         - TypeError: Levée si l'élément ajouté n'est pas un Bit.
         '''
-        self._verifier_type_bits([bit])
-        self._bits.extend([bit])
+        self._verifier_type_bits((bit,))
+        self._valeur = (self._valeur << 1) | _VALEUR_BIT[bit]
+        self._longueur += 1
 
     def __len__(self):
         ''' Retourne la longueur du CodeBinaire (nombre de bits).
@@ -71,7 +110,7 @@ class CodeBinaire:
         returns:
         - int: Nombre de bits du CodeBinaire.
         '''
-        return len(self._bits)
+        return self._longueur
 
     def __add__(self, other):
         ''' Concatène deux `CodeBinaire` pour en former un nouveau.
@@ -85,8 +124,12 @@ class CodeBinaire:
         raises:
         - TypeError : Levée si `other` n'est pas un `CodeBinaire`.
         '''
-        self._verifier_type_bits(other)
-        return CodeBinaire(*self._bits, *other._bits)
+        if not isinstance(other, CodeBinaire):
+            raise TypeError("Un CodeBinaire ne peut être concaténé qu'à un CodeBinaire")
+        code = CodeBinaire.__new__(CodeBinaire)
+        code._valeur = (self._valeur << other._longueur) | other._valeur
+        code._longueur = self._longueur + other._longueur
+        return code
 
     def __getitem__(self, index):
         ''' Accède à un ou plusieurs bits du CodeBinaire.
@@ -97,10 +140,17 @@ class CodeBinaire:
         returns:
         - Bit: Si `index` est un entier.
         - CodeBinaire: Si `index` est un `slice`.
+
+        raises:
+        - IndexError: Levée si l'index est hors du code.
         '''
         if isinstance(index, slice):
-            return CodeBinaire(*self._bits[index])
-        return self._bits[index]
+            return CodeBinaire(*self.bits[index])
+        if index < 0:
+            index += self._longueur
+        if not 0 <= index < self._longueur:
+            raise IndexError("Index hors du CodeBinaire")
+        return _BITS[(self._valeur >> (self._longueur - 1 - index)) & 1]
 
     def __setitem__(self, index, value):
         ''' Modifie un ou plusieurs bits du CodeBinaire.
@@ -108,14 +158,16 @@ class CodeBinaire:
         params:
         - index (int | slice): Index ou slice à modifier.
         - value (Bit | list[Bit] | CodeBinaire): Nouveau(s) bit(s) ou CodeBinaire.
+
+        raises:
+        - TypeError: Levée si une valeur n'est pas un Bit.
         '''
+        bits = list(self)
         if isinstance(index, slice):
-            if isinstance(value, CodeBinaire):
-                self._bits[index] = list(value._bits)
-            else:
-                self._bits[index] = list(value)
+            bits[index] = list(value)
         else:
-            self._bits[index] = value
+            bits[index] = value
+        self._remplacer_bits(bits)
 
     def __delitem__(self, index):
         ''' Supprime un ou plusieurs bits du CodeBinaire.
@@ -127,7 +179,9 @@ class CodeBinaire:
         - AuMoinsUnBitErreur: Levée si le code binaire est nul après suppression.
         '''
         self._verifier_au_moins_un_bit(self, index)
-        del self._bits[index]
+        bits = list(self)
+        del bits[index]
+        self._remplacer_bits(bits)
 
     def __repr__(self):
         ''' Retourne une représentation formelle du CodeBinaire.
@@ -143,7 +197,9 @@ class CodeBinaire:
         returns:
         - str: Chaîne binaire correspondant aux bits du CodeBinaire.
         '''
-        return "".join("0" if bit == Bit.BIT_0 else "1" for bit in self._bits)
+        if not self._longueur:
+            return ""
+        return format(self._valeur, f"0{self._longueur}b")
 
     def __iter__(self):
         ''' Permet d'itérer sur les bits du CodeBinaire.
@@ -151,7 +207,9 @@ class CodeBinaire:
         returns:
         - Iterator[Bit]: Itérateur sur les bits.
         '''
-        return iter(self._bits)
+        valeur = self._valeur
+        return (_BITS[(valeur >> decalage) & 1]
+                for decalage in range(self._longueur - 1, -1, -1))
 
     def __eq__(self, other):
         ''' Vérifie l'égalité entre deux CodeBinaire.
@@ -164,7 +222,23 @@ class CodeBinaire:
         '''
         if not isinstance(other, CodeBinaire):
             return False
-        return self.bits == other.bits
+        return self._valeur == other._valeur and self._longueur == other._longueur
+
+    def _remplacer_bits(self, bits):
+        ''' Remplace le contenu du CodeBinaire par une séquence de bits.
+
+        params:
+        - bits (list[Bit]): Nouveaux bits du code.
+
+        raises:
+        - TypeError: Levée si un élément n'est pas un Bit.
+        '''
+        self._verifier_type_bits(bits)
+        valeur = 0
+        for bit in bits:
+            valeur = (valeur << 1) | _VALEUR_BIT[bit]
+        self._valeur = valeur
+        self._longueur = len(bits)
 
     @staticmethod
     def _verifier_type_bits(bits):
@@ -191,11 +265,11 @@ class CodeBinaire:
         '''
         if isinstance(index, slice):
             length = index.stop - index.start if index.start else index.stop
-            if len(bits.bits) - length <= 0:
+            if len(bits) - length <= 0:
                 raise AuMoinsUnBitErreur("Un CodeBinaire doit contenir au moins un bit.")
         else:
             # Vérifier si la suppression laisse le code binaire vide
-            if len(bits.bits) == 1:
+            if len(bits) == 1:
                 raise AuMoinsUnBitErreur("Un CodeBinaire doit contenir au moins un bit.")
 
 class AuMoinsUnBitErreur(Exception):
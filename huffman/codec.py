@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe Codec, qui regroupe tout ce qui est dérivé
+d'un compteur pour compresser ou décompresser : table de codage, tables de
+décodage et table sérialisée de l'entête.
+
+Un Codec ne contient que des types simples (listes, dictionnaires, octets) :
+il peut être sérialisé avec `pickle`, par exemple pour être envoyé à des
+processus de travail. `codec_pour` conserve les derniers codecs construits,
+indexés par le contenu du compteur, de sorte que des compressions de données
+ayant la même distribution d'octets ne reconstruisent ni arbre ni table. '''
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from huffman.arbre_plat import ArbrePlat
+from huffman.canonique import encoder_longueurs, longueurs_codes
+from huffman.codage import codes_canoniques_compteur, table_de_codage
+from huffman.code_binaire import CodeBinaire
+from huffman.compteur import Compteur
+from huffman.compteur_octets import CompteurOctets
+from huffman.decodeur import DecodeurTable
+from huffman.format_fichier import (CompteurVideErreur, IDENTIFIANT, MODE_CANONIQUE,
+                                    MODE_OCCURRENCES, NB_OCTETS_CODAGE_INT,
+                                    NB_OCTETS_TAILLE_LONGUEURS)
+
+NB_CODECS_EN_CACHE = 32
+
+class Codec:
+    ''' Codes compilés d'une distribution d'octets.
+
+    arguments:
+    - _mode (int): Mode de l'entête (`MODE_OCCURRENCES` ou `MODE_CANONIQUE`).
+    - _codes (dict[int, CodeBinaire]): Code binaire de chaque octet.
+    - _table (list[tuple[int, int]]): Table de codage (voir `table_de_codage`).
+    - _decodeur (DecodeurTable): Tables de décodage.
+    - _table_serialisee (bytes): Partie de l'entête qui suit le nombre d'octets d'origine.
+    '''
+    def __init__(self, stat: Compteur, canonique: bool = False, max_bits: int = None):
+        ''' Construit les codes d'un compteur d'octets.
+
+        params:
+        - stat (Compteur): Nombre d'occurrences de chaque octet.
+        - canonique (bool, optionnel): Codes canoniques, dont seules les longueurs
+        sont écrites dans l'entête.
+        - max_bits (int, optionnel): Longueur maximale des codes (mode canonique).
+
+        raises:
+        - ValueError: Levée si `max_bits` est donné hors du mode canonique.
+        - CompteurVideErreur: Levée si le compteur est vide.
+        '''
+        if max_bits is not None and not canonique:
+            raise ValueError("La longueur des codes ne peut être limitée qu'en mode canonique")
+        if canonique:
+            codes = codes_canoniques_compteur(stat, max_bits)
+            longueurs_encodees = encoder_longueurs(longueurs_codes(codes))
+            self._mode = MODE_CANONIQUE
+            self._table_serialisee = (len(longueurs_encodees).to_bytes(
+                NB_OCTETS_TAILLE_LONGUEURS, byteorder="big") + longueurs_encodees)
+        else:
+            codes = ArbrePlat.de_huffman(stat).codes()
+            self._mode = MODE_OCCURRENCES
+            self._table_serialisee = b"".join(
+                stat.nb_occurrences(octet).to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+                for octet in range(256))
+        self._codes = codes
+        self._table = table_de_codage(codes)
+        self._decodeur = DecodeurTable(codes)
+
+    @property
+    def mode(self) -> int:
+        ''' Retourne le mode de l'entête écrite par le codec.
+
+        returns:
+        - int: `MODE_OCCURRENCES` ou `MODE_CANONIQUE`.
+        '''
+        return self._mode
+
+    @property
+    def codes(self) -> Dict[int, CodeBinaire]:
+        ''' Retourne le code binaire de chaque octet.
+
+        returns:
+        - dict[int, CodeBinaire]: Copie des codes.
+        '''
+        return dict(self._codes)
+
+    @property
+    def table(self) -> list:
+        ''' Retourne la table de codage, à passer à `BitWriter.ecrire_octets`.
+
+        returns:
+        - list[tuple[int, int]]: Couple (valeur inversée, longueur) de chaque octet.
+        '''
+        return self._table
+
+    @property
+    def decodeur(self) -> DecodeurTable:
+        ''' Retourne les tables de décodage.
+
+        returns:
+        - DecodeurTable: Le décodeur.
+        '''
+        return self._decodeur
+
+    def entete(self, taille: int) -> bytes:
+        ''' Retourne l'entête complète d'un fichier compressé avec ce codec,
+        identique à celle écrite par `compresseur.compresser`.
+
+        params:
+        - taille (int): Nombre d'octets d'origine.
+
+        returns:
+        - bytes: Identifiant, mode, nombre d'octets d'origine puis table.
+        '''
+        return (IDENTIFIANT + bytes([self._mode])
+                + taille.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+                + self._table_serialisee)
+
+def codec_pour(stat: Compteur, canonique: bool = False, max_bits: int = None) -> Codec:
+    ''' Retourne le codec d'un compteur, construit seulement si aucun codec
+    récent n'a été construit pour les mêmes occurrences et options.
+
+    params:
+    - stat (Compteur): Nombre d'occurrences de chaque octet.
+    - canonique (bool, optionnel): Codes canoniques.
+    - max_bits (int, optionnel): Longueur maximale des codes (mode canonique).
+
+    returns:
+    - Codec: Le codec, partagé avec les autres appels de mêmes paramètres.
+
+    raises:
+    - ValueError: Levée si `max_bits` est donné hors du mode canonique.
+    - CompteurVideErreur: Levée si le compteur est vide.
+    '''
+    if max_bits is not None and not canonique:
+        raise ValueError("La longueur des codes ne peut être limitée qu'en mode canonique")
+    if not stat.elements:
+        raise CompteurVideErreur("Impossible de construire un codec sans élément")
+    return _codec_en_cache(empreinte(stat), canonique, max_bits)
+
+def empreinte(stat: Compteur) -> Tuple[int, ...]:
+    ''' Retourne le contenu d'un compteur d'octets sous une forme hachable,
+    utilisée comme clé du cache des codecs.
+
+    params:
+    - stat (Compteur): Nombre d'occurrences de chaque octet.
+
+    returns:
+    - tuple[int, ...]: Nombre d'occurrences de chacun des 256 octets.
+    '''
+    if isinstance(stat, CompteurOctets):
+        return tuple(stat.occurrences)
+    return tuple(stat.nb_occurrences(octet) for octet in range(256))
+
+def vider_cache() -> None:
+    ''' Oublie tous les codecs conservés par `codec_pour`. '''
+    _codec_en_cache.cache_clear()
+
+@lru_cache(maxsize=NB_CODECS_EN_CACHE)
+def _codec_en_cache(occurrences: Tuple[int, ...], canonique: bool, max_bits: int) -> Codec:
+    ''' Construit un codec à partir des occurrences des 256 octets.
+
+    params:
+    - occurrences (tuple[int, ...]): Nombre d'occurrences de chaque octet.
+    - canonique (bool): Codes canoniques.
+    - max_bits (int): Longueur maximale des codes, ou None.
+
+    returns:
+    - Codec: Le codec.
+    '''
+    stat = CompteurOctets({octet: nb for octet, nb in enumerate(occurrences) if nb})
+    return Codec(stat, canonique, max_bits)
@@ -1,16 +1,103 @@
 #!/usr/bin/env python3
 """ script principal du module """
+from contextlib import contextmanager
 from typing import Dict
 import io
 import logging
+import mmap
+import os
 from huffman.compteur import Compteur
+from huffman.compteur_octets import CompteurOctets
+from huffman.adaptatif import decompresser_adaptatif
 from huffman.arbre_huffman import ArbreHuffman
+from huffman.arbre_plat import VueArbrePlat
 from huffman.file_de_priorite import FileDePriorite
 from huffman.code_binaire import CodeBinaire, Bit
+# Fonctions déplacées dans codage, toujours accessibles depuis ce module
+from huffman.codage import entropie, table_de_codage  # pylint: disable=unused-import
+from huffman.codec import codec_pour
+from huffman.flux_binaire import BitWriter
+from huffman.decodeur import DecodeurTable
+from huffman.dictionnaire import decompresser_message
+from huffman.flux import decompresser_flux
+from huffman.canonique import (codes_canoniques, longueurs_codes, encoder_longueurs,
+                               decoder_longueurs, LongueursInvalidesErreur)
+from huffman.format_fichier import (lire_exactement, CompteurVideErreur, FormatInvalideErreur,
+                                    IDENTIFIANT, MODE_ADAPTATIF, MODE_BLOCS, MODE_CANONIQUE,
+                                    MODE_DICTIONNAIRE, MODE_OCCURRENCES, NB_OCTETS_CODAGE_INT,
+                                    NB_OCTETS_TAILLE_LONGUEURS, TAILLE_BLOC_LECTURE)
+from huffman.longueur_limitee import longueurs_package_merge, arbre_depuis_longueurs, cout
 
 LOGGER = logging.getLogger()
 
-NB_OCTETS_CODAGE_INT = 4
+@contextmanager
+def vue_projetee(fichier, taille_ecriture: int = None, taille_lecture: int = None):
+    """ gestionnaire de contexte qui fournit une memoryview de la projection
+en mémoire d'un fichier binaire sur disque à partir de sa position courante
+(jusqu'à la fin du fichier, ou sur au plus taille_lecture octets), puis place
+le fichier après la zone projetée ; avec taille_ecriture, la vue, inscriptible,
+couvre taille_ecriture octets qui remplacent ceux du fichier à partir de sa
+position courante : le fichier n'est étendu que s'il est trop court, et
+retrouve sa taille d'origine si une exception interrompt l'écriture.
+Fournit None si le flux ne peut pas être projeté (tube, BytesIO, zone vide,
+fichier ouvert en écriture seule...) """
+    projection = None
+    taille_initiale = None
+    if not isinstance(fichier, io.TextIOBase):
+        try:
+            descripteur = fichier.fileno()
+            debut = fichier.tell()
+            if taille_ecriture is None:
+                fin = os.fstat(descripteur).st_size
+                if taille_lecture is not None:
+                    fin = min(fin, debut + taille_lecture)
+                if fin > debut:
+                    projection = mmap.mmap(descripteur, fin, access=mmap.ACCESS_READ)
+            elif fichier.readable() and taille_ecriture:
+                fichier.flush()
+                fin = debut + taille_ecriture
+                if os.fstat(descripteur).st_size < fin:
+                    taille_initiale = os.fstat(descripteur).st_size
+                    fichier.truncate(fin)
+                projection = mmap.mmap(descripteur, fin, access=mmap.ACCESS_WRITE)
+        except (AttributeError, io.UnsupportedOperation, OSError, ValueError):
+            projection = None
+    if projection is None:
+        yield None
+        return
+    try:
+        with projection:
+            with memoryview(projection) as vue, vue[debut:fin] as zone:
+                yield zone
+    except BaseException:
+        if taille_initiale is not None:
+            # Les octets ajoutés pour l'écriture interrompue sont retirés
+            fichier.truncate(taille_initiale)
+            fichier.seek(debut)
+        raise
+    fichier.seek(fin)
+
+def lire_par_blocs(source: io.BufferedReader):
+    """ générateur qui parcourt un flux par blocs d'au plus TAILLE_BLOC_LECTURE
+éléments ; un fichier sur disque est parcouru dans sa projection en mémoire,
+un autre flux binaire est lu par readinto dans un unique tampon réutilisé :
+chaque bloc doit donc être consommé avant de demander le suivant """
+    with vue_projetee(source) as vue:
+        if vue is not None:
+            for debut in range(0, len(vue), TAILLE_BLOC_LECTURE):
+                with vue[debut:debut + TAILLE_BLOC_LECTURE] as bloc:
+                    yield bloc
+            return
+    lire_dans = getattr(source, "readinto", None)
+    if lire_dans is None or isinstance(source, io.TextIOBase):
+        while (chunk := source.read(TAILLE_BLOC_LECTURE)):
+            yield chunk
+        return
+    tampon = bytearray(TAILLE_BLOC_LECTURE)
+    with memoryview(tampon) as vue:
+        while (nb_octets := lire_dans(tampon)):
+            with vue[:nb_octets] as bloc:
+                yield bloc
 
 def statistiques(source: io.BufferedReader) -> (Compteur, int):
     """ fonction qui retourne le nombre d'occurences (Compteur)
@@ -18,14 +105,21 @@ d'un flux d'octets et ainsi que le nombre d'octets"""
 # @u:start statistiques
 
     taille = 0
-    compteur = Compteur()
-    BUFFER_SIZE = 4096
-    while (chunk := source.read(BUFFER_SIZE)):  # Lecture par blocs
+    compteur = None
+    for chunk in lire_par_blocs(source):  # Lecture par blocs
         taille += len(chunk)  # Comptabilisation du nombre total d'octets
-        for octet in chunk:  # Parcours des octets du chunk
-            compteur.incrementer(octet)
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            # Flux d'octets : comptage du bloc entier dans le tableau de 256 cases
+            if compteur is None:
+                compteur = CompteurOctets()
+            compteur.ajouter_octets(chunk)
+        else:
+            if compteur is None:
+                compteur = Compteur()
+            for element in chunk:  # Parcours des éléments du chunk
+                compteur.incrementer(element)
 
-    return compteur, taille
+    return (compteur if compteur is not None else CompteurOctets()), taille
 
 # @u:end statistiques
 
@@ -33,18 +127,199 @@ def arbre_de_huffman(stat: Compteur) -> ArbreHuffman:
     """ fonction qui retourne un arbre d'huffman à partir d'un compteur """
 # @u:start arbre_de_huffman
 
-    pass
+    if not stat.elements:
+        raise CompteurVideErreur("Impossible de construire un arbre de Huffman sans élément")
+
+    # Feuilles insérées dans l'ordre des éléments : à occurrences égales,
+    # la file restitue les arbres dans leur ordre d'arrivée.
+    file = FileDePriorite((ArbreHuffman(element, stat.nb_occurrences(element))
+                           for element in sorted(stat.elements)),
+                          cle=lambda arbre: arbre.nb_occurrences)
+    while len(file) > 1:
+        fils_gauche = file.defiler()
+        # Le fils droit est retiré et la fusion insérée en une seule opération
+        file.remplacer(fils_gauche + file.element)
+    return file.defiler()
 
 # @u:end arbre_de_huffman
 
+def arbre_de_huffman_limite(stat: Compteur, max_bits: int) -> ArbreHuffman:
+    """ fonction qui retourne un arbre de codes de longueur au plus max_bits,
+optimal sous cette contrainte (package-merge), à partir d'un compteur """
+    if not stat.elements:
+        raise CompteurVideErreur("Impossible de construire un arbre de Huffman sans élément")
+    poids = {element: stat.nb_occurrences(element) for element in stat.elements}
+    return arbre_depuis_longueurs(poids, longueurs_package_merge(poids, max_bits))
+
+def cout_longueur_limitee(stat: Compteur, max_bits: int) -> (int, int):
+    """ fonction qui retourne le nombre de bits de la charge utile avec des
+codes limités à max_bits puis avec des codes de Huffman sans contrainte """
+    if not stat.elements:
+        return 0, 0
+    poids = {element: stat.nb_occurrences(element) for element in stat.elements}
+    longueurs_huffman = longueurs_codes(codes_binaire(arbre_de_huffman(stat)))
+    return cout(poids, longueurs_package_merge(poids, max_bits)), cout(poids, longueurs_huffman)
+
 def codes_binaire(abr: ArbreHuffman) -> Dict[int, CodeBinaire]:
     """ fonction qui retourne le code binaire de tous les éléments
 d'un arbre d'Huffman """
 # @u:start code_binaire
 
-    pass
+    if isinstance(abr, VueArbrePlat):
+        # Arbre stocké dans des tableaux : parcours sans pile ni objet par nœud
+        return abr.codes()
+    if abr.est_une_feuille:
+        # Un seul élément : il faut tout de même un bit par occurrence
+        return {abr.element: CodeBinaire(Bit.BIT_0)}
+
+    codes = {}
+    # Parcours en profondeur itératif : (sous-arbre, valeur du code, longueur du code)
+    a_visiter = [(abr, 0, 0)]
+    while a_visiter:
+        arbre, valeur, longueur = a_visiter.pop()
+        if arbre.est_une_feuille:
+            codes[arbre.element] = CodeBinaire.depuis_entier(valeur, longueur)
+        else:
+            a_visiter.append((arbre.fils_droit, (valeur << 1) | 1, longueur + 1))
+            a_visiter.append((arbre.fils_gauche, valeur << 1, longueur + 1))
+    return codes
 
 # @u:end code_binaire
 
+def ecrire_entete(destination: io.BufferedWriter, stat: Compteur, taille: int) -> None:
+    """ fonction qui écrit l'entête : identifiant, mode, nombre d'octets
+d'origine puis nombre d'occurrences de chacun des 256 octets """
+    destination.write(IDENTIFIANT + bytes([MODE_OCCURRENCES]))
+    destination.write(taille.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big"))
+    destination.write(b"".join(stat.nb_occurrences(octet).to_bytes(NB_OCTETS_CODAGE_INT,
+                                                                   byteorder="big")
+                               for octet in range(256)))
+
+def ecrire_entete_canonique(destination: io.BufferedWriter, longueurs: Dict[int, int],
+                            taille: int) -> None:
+    """ fonction qui écrit l'entête du mode canonique : identifiant, mode,
+nombre d'octets d'origine, taille des longueurs encodées puis longueurs des
+codes encodées par encoder_longueurs """
+    longueurs_encodees = encoder_longueurs(longueurs)
+    destination.write(IDENTIFIANT + bytes([MODE_CANONIQUE]))
+    destination.write(taille.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big"))
+    destination.write(len(longueurs_encodees).to_bytes(NB_OCTETS_TAILLE_LONGUEURS,
+                                                       byteorder="big"))
+    destination.write(longueurs_encodees)
+
+def compresser(source: io.BufferedReader, destination: io.BufferedWriter,
+               canonique: bool = False, max_bits: int = None) -> None:
+    """ fonction qui compresse un flux d'octets (relu une seconde fois
+après le calcul des statistiques) dans un flux de destination ; en mode
+canonique, seules les longueurs des codes sont écrites dans l'entête et leur
+longueur peut être limitée à max_bits """
+    if max_bits is not None and not canonique:
+        raise ValueError("La longueur des codes ne peut être limitée qu'en mode canonique")
+    # La source est relue à partir de sa position initiale, pas du début du fichier
+    debut = source.tell()
+    stat, taille = statistiques(source)
+    source.seek(debut)
+    if not taille:
+        if canonique:
+            ecrire_entete_canonique(destination, {}, taille)
+        else:
+            ecrire_entete(destination, stat, taille)
+        return
+    # Arbre, tables et entête réutilisés si le même compteur a déjà été compilé
+    codec = codec_pour(stat, canonique, max_bits)
+    destination.write(codec.entete(taille))
+    ecrivain = BitWriter(destination)
+    for chunk in lire_par_blocs(source):
+        ecrivain.ecrire_octets(chunk, codec.table)
+    ecrivain.vider()
+
+def lire_mode(source: io.BufferedReader) -> int:
+    """ fonction qui vérifie l'identifiant d'un flux compressé et retourne
+son mode """
+    entete = lire_exactement(source, len(IDENTIFIANT) + 1)
+    if entete[:len(IDENTIFIANT)] != IDENTIFIANT:
+        raise FormatInvalideErreur("Identifiant de fichier compressé absent")
+    return entete[len(IDENTIFIANT)]
+
+def lire_entete(source: io.BufferedReader) -> (Compteur, int):
+    """ fonction qui lit la suite de l'entête écrite par ecrire_entete (après
+le mode) et retourne le compteur des occurrences et le nombre d'octets d'origine """
+    donnees = lire_exactement(source, NB_OCTETS_CODAGE_INT * 257)
+    taille = int.from_bytes(donnees[:NB_OCTETS_CODAGE_INT], byteorder="big")
+    stat = CompteurOctets()
+    for octet in range(256):
+        debut = NB_OCTETS_CODAGE_INT * (octet + 1)
+        nb_occurrences = int.from_bytes(donnees[debut:debut + NB_OCTETS_CODAGE_INT],
+                                        byteorder="big")
+        if nb_occurrences:
+            # Un octet absent du flux d'origine n'a pas de code
+            stat.fixer(octet, nb_occurrences)
+    return stat, taille
+
+def lire_entete_canonique(source: io.BufferedReader) -> (Dict[int, int], int):
+    """ fonction qui lit la suite de l'entête écrite par ecrire_entete_canonique
+(après le mode) et retourne les longueurs des codes et le nombre d'octets d'origine """
+    donnees = lire_exactement(source, NB_OCTETS_CODAGE_INT + NB_OCTETS_TAILLE_LONGUEURS)
+    taille = int.from_bytes(donnees[:NB_OCTETS_CODAGE_INT], byteorder="big")
+    nb_octets_longueurs = int.from_bytes(donnees[NB_OCTETS_CODAGE_INT:], byteorder="big")
+    try:
+        longueurs = decoder_longueurs(lire_exactement(source, nb_octets_longueurs))
+    except LongueursInvalidesErreur as erreur:
+        raise FormatInvalideErreur(str(erreur)) from erreur
+    return longueurs, taille
+
+def decompresser(source: io.BufferedReader, destination: io.BufferedWriter) -> None:
+    """ fonction qui décompresse un flux produit par compresser dans un flux
+de destination, un octet complet étant décodé par consultation de table ; les
+octets décodés remplacent ceux de la destination à partir de sa position
+courante (les octets suivants sont conservés) et une source positionnable est
+laissée juste après la charge utile """
+    mode = lire_mode(source)
+    if mode == MODE_OCCURRENCES:
+        stat, taille = lire_entete(source)
+        if taille:
+            decodeur = codec_pour(stat).decodeur
+    elif mode == MODE_CANONIQUE:
+        # Les codes sont reconstruits à partir des longueurs, sans arbre
+        longueurs, taille = lire_entete_canonique(source)
+        if taille:
+            decodeur = DecodeurTable(codes_canoniques(longueurs))
+    elif mode == MODE_ADAPTATIF:
+        # Flux en une seule passe : ni taille d'origine ni table dans l'entête
+        decompresser_adaptatif(source, destination, entete_lue=True)
+        return
+    elif mode == MODE_BLOCS:
+        # Suite de blocs indépendants produite par flux.compresser_flux
+        decompresser_flux(source, destination, entete_lue=True)
+        return
+    elif mode == MODE_DICTIONNAIRE:
+        # Message sans table : le dictionnaire enregistré est désigné par son identifiant
+        destination.write(decompresser_message(IDENTIFIANT + bytes([mode]) + source.read()))
+        return
+    else:
+        raise FormatInvalideErreur(f"Mode de compression non supporté : {mode}")
+    if taille:
+        # La charge utile ne peut pas dépasser taille codes de longueur maximale :
+        # la source n'est pas lue au-delà
+        borne = -(-taille * decodeur.longueur_max // 8)
+        positionnable = getattr(source, "seekable", None)
+        debut = source.tell() if positionnable is not None and positionnable() else None
+        # Charge utile lue dans la projection de la source et octets décodés
+        # écrits directement dans la projection de la destination si possible
+        with vue_projetee(source, taille_lecture=borne) as charge:
+            if charge is None:
+                charge = source.read(borne)
+            if taille * decodeur.longueur_min > 8 * len(charge):
+                # Vérifié avant de réserver la destination
+                raise FormatInvalideErreur("Flux compressé tronqué")
+            with vue_projetee(destination, taille) as sortie:
+                if sortie is None:
+                    decodes, nb_octets_lus = decodeur.decoder_charge(charge, taille)
+                    destination.write(decodes)
+                else:
+                    nb_octets_lus = decodeur.decoder_charge(charge, taille, sortie)[1]
+        if debut is not None:
+            source.seek(debut + nb_octets_lus)
+
 if __name__ == "__main__":
     pass
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 ''' Module proposant la classe Compteur '''
-from typing import TypeVar
+from typing import Iterable, TypeVar
 
 T = TypeVar('T')
 
@@ -129,6 +129,87 @@ class Compteur:
             resultat[nb_occurrences].add(element)
         return resultat
     
+    def ajouter(self, autre: "Compteur") -> None:
+        ''' Ajoute les occurrences d'un autre compteur à celles du compteur.
+
+        params:
+        - autre (Compteur): Compteur dont les occurrences sont ajoutées.
+        '''
+        for element, nb_occurrences in autre.compteur.items():
+            self.fixer(element, self.nb_occurrences(element) + nb_occurrences)
+
+    def retirer(self, autre: "Compteur") -> None:
+        ''' Retire les occurrences d'un autre compteur de celles du compteur ;
+        les éléments dont le nombre d'occurrences devient nul ou négatif sont supprimés.
+
+        params:
+        - autre (Compteur): Compteur dont les occurrences sont retirées.
+        '''
+        for element, nb_occurrences in autre.compteur.items():
+            if element in self.compteur:
+                reste = self.compteur[element] - nb_occurrences
+                if reste > 0:
+                    self.compteur[element] = reste
+                else:
+                    del self.compteur[element]
+
+    @classmethod
+    def fusionner(cls, compteurs: Iterable["Compteur"]) -> "Compteur":
+        ''' Retourne la somme de plusieurs compteurs (par exemple ceux de plusieurs
+        parties d'un même fichier).
+
+        params:
+        - compteurs (Iterable[Compteur]): Compteurs à additionner.
+
+        returns:
+        - Compteur: Nouveau compteur, du type de la classe appelée.
+        '''
+        resultat = cls()
+        for compteur in compteurs:
+            resultat.ajouter(compteur)
+        return resultat
+
+    def __add__(self, autre):
+        ''' Retourne la somme de deux compteurs.
+
+        returns:
+        - Compteur: Nouveau compteur, du type du compteur de gauche.
+        '''
+        if not isinstance(autre, Compteur):
+            return NotImplemented
+        return type(self).fusionner((self, autre))
+
+    def __radd__(self, autre):
+        ''' Permet d'additionner des compteurs avec `sum`, qui commence par 0. '''
+        if autre == 0:
+            return type(self).fusionner((self,))
+        return NotImplemented
+
+    def __iadd__(self, autre):
+        if not isinstance(autre, Compteur):
+            return NotImplemented
+        self.ajouter(autre)
+        return self
+
+    def __sub__(self, autre):
+        ''' Retourne la différence de deux compteurs, sans les éléments dont le
+        nombre d'occurrences devient nul ou négatif.
+
+        returns:
+        - Compteur: Nouveau compteur, du type du compteur de gauche.
+        '''
+        if not isinstance(autre, Compteur):
+            return NotImplemented
+        resultat = type(self).fusionner((self,))
+        resultat.retirer(autre)
+        return resultat
+
+    def __isub__(self, autre):
+        if not isinstance(autre, Compteur):
+            return NotImplemented
+        self.retirer(autre)
+        return self
+
     def __eq__(self, autre):
         if isinstance(autre, Compteur):
             return self.compteur == autre.compteur
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe CompteurIndexe '''
+from types import MappingProxyType
+from typing import TypeVar
+
+from huffman.compteur import Compteur
+
+T = TypeVar('T')
+
+class CompteurIndexe(Compteur):
+    ''' Compteur qui maintient, à chaque modification, l'ensemble des éléments
+    de chaque nombre d'occurrences ainsi que les nombres d'occurrences minimal
+    et maximal.
+
+    Les requêtes par nombre d'occurrences (`elements_nb_occurrences`,
+    `elements_moins_frequents`, `elements_plus_frequents`, `obtenir_cle`) ne
+    parcourent plus tout le compteur : leur coût est celui de la copie du
+    résultat. `incrementer` reste en temps constant ; `fixer` peut parcourir
+    les nombres d'occurrences distincts lorsqu'il vide l'ensemble du minimum
+    ou du maximum.
+
+    arguments:
+    - _occurrences (dict[T, int]): Nombre d'occurrences de chaque élément.
+    - _paquets (dict[int, set[T]]): Éléments de chaque nombre d'occurrences.
+    - _min (int): Plus petit nombre d'occurrences (None si le compteur est vide).
+    - _max (int): Plus grand nombre d'occurrences (None si le compteur est vide).
+    '''
+    def __init__(self, val_init: dict[T, int] = None):
+        ''' Initialise un compteur indexé avec des éléments et leurs occurrences.
+
+        params:
+        - val_init (dict[T, int], optionnel): Dictionnaire contenant des éléments
+        et leurs occurrences initiales.
+        '''
+        # pylint: disable=super-init-not-called
+        self._occurrences = {}
+        self._paquets = {}
+        self._min = self._max = None
+        if val_init:
+            for element, nb_occurrences in val_init.items():
+                self.fixer(element, nb_occurrences)
+
+    @property
+    def compteur(self) -> MappingProxyType:
+        ''' Retourne les occurrences en lecture seule : une modification directe
+        ne mettrait pas à jour les ensembles de chaque nombre d'occurrences.
+
+        returns:
+        - MappingProxyType[T, int]: Vue du dictionnaire élément -> nombre d'occurrences.
+        '''
+        return MappingProxyType(self._occurrences)
+
+    @compteur.setter
+    def compteur(self, valeurs: dict[T, int]) -> None:
+        ''' Remplace toutes les occurrences par celles du dictionnaire.
+
+        params:
+        - valeurs (dict[T, int]): Nouvelles occurrences.
+        '''
+        self.__init__(valeurs)
+
+    def incrementer(self, element: T) -> None:
+        ''' Ajoute un élément dans le compteur ou incrémente son occurrence.
+
+        params:
+        - element (T): Élément à ajouter ou incrémenter.
+        '''
+        ancien = self._occurrences.get(element)
+        if ancien is None:
+            self._occurrences[element] = 1
+            self._ajouter_au_paquet(element, 1)
+            self._min = 1 if self._min is None else min(self._min, 1)
+            self._max = 1 if self._max is None else max(self._max, 1)
+            return
+        nouveau = ancien + 1
+        self._occurrences[element] = nouveau
+        paquet = self._paquets[ancien]
+        paquet.discard(element)
+        if not paquet:
+            del self._paquets[ancien]
+            if ancien == self._min:
+                # L'élément déplacé occupe désormais le plus petit nombre restant
+                self._min = nouveau
+        self._ajouter_au_paquet(element, nouveau)
+        if nouveau > self._max:
+            self._max = nouveau
+
+    def fixer(self, element: T, nb_occurrences: int) -> None:
+        ''' Fixe le nombre d'occurrences d'un élément.
+
+        params:
+        - element (T): Élément dont on veut fixer l'occurrence.
+        - nb_occurrences (int): Nombre d'occurrences à attribuer.
+        '''
+        if element in self._occurrences:
+            self._retirer_du_paquet(element)
+        self._occurrences[element] = nb_occurrences
+        self._ajouter_au_paquet(element, nb_occurrences)
+        self._min = nb_occurrences if self._min is None else min(self._min, nb_occurrences)
+        self._max = nb_occurrences if self._max is None else max(self._max, nb_occurrences)
+
+    def nb_occurrences(self, element: T) -> int:
+        ''' Retourne le nombre d'occurrences d'un élément.
+
+        params:
+        - element (T): Élément à rechercher.
+
+        returns:
+        - int: Nombre d'occurrences de l'élément (0 s'il est absent).
+        '''
+        return self._occurrences.get(element, 0)
+
+    @property
+    def elements(self) -> set[T]:
+        ''' Retourne tous les éléments présents dans le compteur.
+
+        returns:
+        - set[T]: Ensemble des éléments enregistrés.
+        '''
+        return set(self._occurrences)
+
+    def elements_nb_occurrences(self, nb_occurrences: int) -> set[T]:
+        ''' Retourne tous les éléments correspondant à un nombre d'occurrences donné.
+
+        params:
+        - nb_occurrences (int): Nombre d'occurrences recherché.
+
+        returns:
+        - set[T]: Ensemble des éléments ayant ce nombre d'occurrences.
+        '''
+        return set(self._paquets.get(nb_occurrences, ()))
+
+    def elements_moins_frequents(self) -> set[T]:
+        ''' Retourne les éléments les moins fréquents dans le compteur.
+
+        returns:
+        - set[T]: Ensemble des éléments ayant le plus faible nombre d'occurrences.
+        '''
+        return self.elements_nb_occurrences(self._min)
+
+    def elements_plus_frequents(self) -> set[T]:
+        ''' Retourne les éléments les plus fréquents dans le compteur.
+
+        returns:
+        - set[T]: Ensemble des éléments ayant le plus grand nombre d'occurrences.
+        '''
+        return self.elements_nb_occurrences(self._max)
+
+    def obtenir_cle(self, element: T) -> int:
+        ''' Retourne la liste des clés correspondant à un nombre d'occurrences donné.
+
+        params:
+        - element (T): Nombre d'occurrences recherché.
+
+        returns:
+        - list[int]: Liste des clés associées à ce nombre d'occurrences.
+        '''
+        return list(self._paquets.get(element, ()))
+
+    def elements_par_nb_occurrences(self) -> dict[int, set[T]]:
+        ''' Retourne un dictionnaire regroupant les éléments par nombre d'occurrences.
+
+        returns:
+        - dict[int, set[T]]: Copie des ensembles d'éléments de chaque nombre d'occurrences.
+        '''
+        return {nb_occurrences: set(paquet) for nb_occurrences, paquet in self._paquets.items()}
+
+    def retirer(self, autre: Compteur) -> None:
+        ''' Retire les occurrences d'un autre compteur de celles du compteur ;
+        les éléments dont le nombre d'occurrences devient nul ou négatif sont supprimés.
+
+        params:
+        - autre (Compteur): Compteur dont les occurrences sont retirées.
+        '''
+        # Copie : l'autre compteur peut être ce compteur lui-même
+        for element, nb_occurrences in list(autre.compteur.items()):
+            if element in self._occurrences:
+                reste = self._occurrences[element] - nb_occurrences
+                if reste > 0:
+                    self.fixer(element, reste)
+                else:
+                    self._retirer_du_paquet(element)
+                    del self._occurrences[element]
+
+    def _ajouter_au_paquet(self, element: T, nb_occurrences: int) -> None:
+        ''' Range un élément dans l'ensemble de son nombre d'occurrences.
+
+        params:
+        - element (T): Élément.
+        - nb_occurrences (int): Nombre d'occurrences de l'élément.
+        '''
+        paquet = self._paquets.get(nb_occurrences)
+        if paquet is None:
+            self._paquets[nb_occurrences] = {element}
+        else:
+            paquet.add(element)
+
+    def _retirer_du_paquet(self, element: T) -> None:
+        ''' Retire un élément de l'ensemble de son nombre d'occurrences actuel et
+        met à jour le minimum et le maximum si cet ensemble devient vide.
+
+        params:
+        - element (T): Élément présent dans le compteur.
+        '''
+        ancien = self._occurrences[element]
+        paquet = self._paquets[ancien]
+        paquet.discard(element)
+        if paquet:
+            return
+        del self._paquets[ancien]
+        if not self._paquets:
+            self._min = self._max = None
+            return
+        if ancien == self._min:
+            self._min = min(self._paquets)
+        if ancien == self._max:
+            self._max = max(self._paquets)
+
+    def __repr__(self):
+        ''' Retourne une représentation formelle du compteur indexé.
+
+        returns:
+        - str: Représentation sous forme `CompteurIndexe({...})`.
+        '''
+        return f"CompteurIndexe({self._occurrences})"
+
+    def __str__(self):
+        ''' Retourne une représentation informelle du compteur indexé.
+
+        returns:
+        - str: Chaîne contenant le dictionnaire des occurrences.
+        '''
+        return f"{self._occurrences}"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe CompteurOctets '''
+from array import array
+from collections import Counter
+from types import MappingProxyType
+
+from huffman.compteur import Compteur
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NB_VALEURS_OCTET = 256
+
+# En dessous de ce nombre de valeurs distinctes dans un bloc, compter chaque
+# valeur avec bytes.count (boucle C) est plus rapide que le comptage générique.
+SEUIL_VALEURS_DISTINCTES = 48
+
+class CompteurOctets(Compteur):
+    ''' Compteur spécialisé pour les octets (entiers de 0 à 255).
+
+    Les occurrences sont stockées dans un tableau fixe de 256 cases et peuvent
+    être remplies bloc par bloc avec `ajouter_octets`, sans appel par octet.
+    Comme dans Compteur, un octet est présent dès qu'il a été compté ou que son
+    nombre d'occurrences a été fixé, même à zéro.
+
+    arguments:
+    - _occurrences (array[int]): Tableau des occurrences indexé par la valeur de l'octet.
+    - _presents (set[int]): Octets présents dans le compteur.
+    '''
+    def __init__(self, val_init: dict[int, int] = None, utiliser_numpy: bool = True):
+        ''' Initialise un compteur d'octets.
+
+        params:
+        - val_init (dict[int, int], optionnel): Octets et leurs occurrences initiales.
+        - utiliser_numpy (bool, optionnel): Utilise `numpy.bincount` pour le
+        comptage par blocs si NumPy est disponible.
+
+        raises:
+        - OctetInvalideErreur: Levée si une clé n'est pas un octet.
+        '''
+        # pylint: disable=super-init-not-called
+        self._occurrences = array('q', bytes(8 * NB_VALEURS_OCTET))
+        self._presents = set()
+        self._numpy = utiliser_numpy and np is not None
+        if val_init:
+            for element, nb_occurrences in val_init.items():
+                self.fixer(element, nb_occurrences)
+
+    @property
+    def compteur(self) -> MappingProxyType:
+        ''' Retourne les occurrences des octets présents, en lecture seule : le
+        compteur se modifie par `incrementer`, `fixer` ou une nouvelle affectation.
+
+        returns:
+        - MappingProxyType[int, int]: Dictionnaire octet -> nombre d'occurrences.
+        '''
+        occurrences = self._occurrences
+        return MappingProxyType({octet: occurrences[octet] for octet in sorted(self._presents)})
+
+    @compteur.setter
+    def compteur(self, valeurs: dict[int, int]) -> None:
+        ''' Remplace toutes les occurrences par celles du dictionnaire.
+
+        params:
+        - valeurs (dict[int, int]): Nouvelles occurrences.
+        '''
+        self._occurrences = array('q', bytes(8 * NB_VALEURS_OCTET))
+        self._presents = set()
+        for element, nb_occurrences in valeurs.items():
+            self.fixer(element, nb_occurrences)
+
+    @property
+    def occurrences(self) -> array:
+        ''' Retourne le tableau des 256 occurrences (non copié).
+
+        returns:
+        - array[int]: Occurrences indexées par la valeur de l'octet.
+        '''
+        return self._occurrences
+
+    def incrementer(self, element: int) -> None:
+        ''' Incrémente l'occurrence d'un octet.
+
+        params:
+        - element (int): Octet à incrémenter.
+
+        raises:
+        - OctetInvalideErreur: Levée si l'élément n'est pas un octet.
+        '''
+        self._verifier_octet(element)
+        self._occurrences[element] += 1
+        self._presents.add(element)
+
+    def fixer(self, element: int, nb_occurrences: int) -> None:
+        ''' Fixe le nombre d'occurrences d'un octet.
+
+        params:
+        - element (int): Octet dont on veut fixer l'occurrence.
+        - nb_occurrences (int): Nombre d'occurrences à attribuer.
+
+        raises:
+        - OctetInvalideErreur: Levée si l'élément n'est pas un octet.
+        '''
+        self._verifier_octet(element)
+        self._occurrences[element] = nb_occurrences
+        self._presents.add(element)
+
+    def nb_occurrences(self, element: int) -> int:
+        ''' Retourne le nombre d'occurrences d'un octet.
+
+        params:
+        - element (int): Octet à rechercher.
+
+        returns:
+        - int: Nombre d'occurrences de l'octet (0 s'il est absent ou n'est pas un octet).
+        '''
+        if isinstance(element, int) and 0 <= element < NB_VALEURS_OCTET:
+            return self._occurrences[element]
+        return 0
+
+    @property
+    def elements(self) -> set[int]:
+        ''' Retourne tous les octets présents dans le compteur.
+
+        returns:
+        - set[int]: Ensemble des octets comptés ou fixés.
+        '''
+        return set(self._presents)
+
+    def ajouter_octets(self, donnees) -> None:
+        ''' Comptabilise en une fois tous les octets d'un bloc.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Bloc d'octets à compter.
+        '''
+        occurrences = self._occurrences
+        if self._numpy:
+            comptes = np.bincount(np.frombuffer(donnees, dtype=np.uint8),
+                                  minlength=NB_VALEURS_OCTET)
+            distincts = np.flatnonzero(comptes).tolist()
+            for octet in distincts:
+                occurrences[octet] += int(comptes[octet])
+            self._presents.update(distincts)
+            return
+        if not isinstance(donnees, (bytes, bytearray)):
+            donnees = bytes(donnees)
+        distincts = set(donnees)
+        if len(distincts) <= SEUIL_VALEURS_DISTINCTES:
+            compter = donnees.count
+            for octet in distincts:
+                occurrences[octet] += compter(octet)
+        else:
+            for octet, nb in Counter(donnees).items():
+                occurrences[octet] += nb
+        self._presents.update(distincts)
+
+    def ajouter(self, autre: Compteur) -> None:
+        ''' Ajoute les occurrences d'un autre compteur, case par case s'il
+        s'agit aussi d'un compteur d'octets.
+
+        params:
+        - autre (Compteur): Compteur dont les occurrences sont ajoutées.
+
+        raises:
+        - OctetInvalideErreur: Levée si un élément de l'autre compteur n'est pas un octet.
+        '''
+        if not isinstance(autre, CompteurOctets):
+            super().ajouter(autre)
+            return
+        occurrences = self._occurrences
+        for octet, nb in enumerate(autre.occurrences):
+            if nb:
+                occurrences[octet] += nb
+        self._presents |= autre._presents
+
+    def retirer(self, autre: Compteur) -> None:
+        ''' Retire les occurrences d'un autre compteur ; les octets dont le nombre
+        d'occurrences devient nul ou négatif sont supprimés.
+
+        params:
+        - autre (Compteur): Compteur dont les occurrences sont retirées.
+        '''
+        occurrences = self._occurrences
+        for octet, nb in autre.compteur.items():
+            if octet in self._presents:
+                reste = occurrences[octet] - nb
+                if reste > 0:
+                    occurrences[octet] = reste
+                else:
+                    occurrences[octet] = 0
+                    self._presents.discard(octet)
+
+    @staticmethod
+    def _verifier_octet(element):
+        ''' Vérifie que l'élément est un octet.
+
+        params:
+        - element: Élément à vérifier.
+
+        raises:
+        - OctetInvalideErreur: Levée si l'élément n'est pas un entier de 0 à 255.
+        '''
+        if not isinstance(element, int) or not 0 <= element < NB_VALEURS_OCTET:
+            raise OctetInvalideErreur(f"{element!r} n'est pas un octet")
+
+    def __repr__(self):
+        ''' Retourne une représentation formelle du compteur d'octets.
+
+        returns:
+        - str: Représentation sous forme `CompteurOctets({...})`.
+        '''
+        return f"CompteurOctets({dict(self.compteur)})"
+
+class OctetInvalideErreur(Exception):
+    ''' Exception levée lorsqu'on manipule un élément qui n'est pas un octet
+    dans un CompteurOctets. '''
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe DecodeurTable, un décodeur de Huffman par tables '''
+from typing import Dict
+
+from huffman.arbre_plat import ArbrePlat
+from huffman.code_binaire import CodeBinaire
+from huffman.flux_binaire import inverser_bits, FinDeFluxErreur
+
+NB_BITS_PRIMAIRE = 10
+# Nombre maximal de bits indexant une table secondaire : un code plus long est
+# résolu par plusieurs niveaux de tables, dont la taille reste bornée quelle
+# que soit la longueur des codes (plus de 64 bits pour des occurrences très inégales)
+NB_BITS_SOUS_TABLE = 10
+
+# Longueurs particulières stockées dans les entrées des tables
+SOUS_TABLE = 0
+INVALIDE = -1
+
+class DecodeurTable:
+    ''' Décodeur de Huffman qui décode un symbole complet par consultation de table.
+
+    La table primaire est indexée par les `nb_bits_primaire` prochains bits du
+    flux (premier bit en poids faible, comme écrit par un BitWriter). Chaque
+    entrée contient le couple (symbole, longueur du code). Les codes plus longs
+    que la table primaire sont résolus par des tables secondaires, désignées
+    par une entrée de longueur `SOUS_TABLE` dont le symbole est l'indice de la
+    sous-table. Une sous-table est indexée par au plus `NB_BITS_SOUS_TABLE`
+    bits et peut elle-même désigner des sous-tables, comme dans zlib.
+
+    arguments:
+    - _nb_bits_primaire (int): Nombre de bits indexant la table primaire.
+    - _primaire (list[tuple[int, int]]): Table primaire.
+    - _sous_tables (list[tuple[int, int, list[tuple[int, int]]]]): Tables
+    secondaires, avec le nombre de bits qui précèdent leur index et le masque
+    de leur index.
+    - _longueur_max (int): Longueur du plus long code.
+    - _longueur_min (int): Longueur du plus court code.
+    '''
+    def __init__(self, codes: Dict[int, CodeBinaire], nb_bits_primaire: int = NB_BITS_PRIMAIRE):
+        ''' Compile une table de codes en tables de décodage.
+
+        params:
+        - codes (dict[int, CodeBinaire]): Code binaire de chaque octet.
+        - nb_bits_primaire (int, optionnel): Nombre de bits maximal de la table primaire.
+
+        raises:
+        - CodeInvalideErreur: Levée si la table est vide ou n'est pas un code préfixe.
+        '''
+        if not codes:
+            raise CodeInvalideErreur("Aucun code à décoder")
+        self._longueur_max = max(len(code) for code in codes.values())
+        self._longueur_min = min(len(code) for code in codes.values())
+        self._nb_bits_primaire = min(nb_bits_primaire, self._longueur_max)
+        self._primaire = [(0, INVALIDE)] * (1 << self._nb_bits_primaire)
+        self._sous_tables = []
+
+        longs = {}
+        for symbole, code in codes.items():
+            longueur = len(code)
+            inverse = inverser_bits(code.valeur, longueur)
+            if longueur <= self._nb_bits_primaire:
+                self._remplir(self._primaire, inverse, longueur, symbole, longueur)
+            else:
+                prefixe = inverse & ((1 << self._nb_bits_primaire) - 1)
+                longs.setdefault(prefixe, []).append((symbole, inverse, longueur))
+
+        self._ajouter_sous_tables(self._primaire, longs, self._nb_bits_primaire)
+
+    def _ajouter_sous_tables(self, table, longs: dict, decalage: int) -> None:
+        ''' Construit les sous-tables des codes plus longs qu'une table et les
+        désigne depuis les entrées de cette table.
+
+        params:
+        - table (list): Table dont les entrées désignent les sous-tables.
+        - longs (dict[int, list[tuple[int, int, int]]]): Pour chaque index de la
+        table, les codes (symbole, bits inversés, longueur) qui le prolongent.
+        - decalage (int): Nombre de bits des codes qui précèdent l'index des sous-tables.
+
+        raises:
+        - CodeInvalideErreur: Levée si les codes ne forment pas un code préfixe.
+        '''
+        for prefixe, codes_longs in longs.items():
+            if table[prefixe][1] != INVALIDE:
+                raise CodeInvalideErreur("Les codes ne forment pas un code préfixe")
+            nb_bits = min(max(longueur for _, _, longueur in codes_longs) - decalage,
+                          NB_BITS_SOUS_TABLE)
+            sous_table = [(0, INVALIDE)] * (1 << nb_bits)
+            plus_longs = {}
+            for symbole, inverse, longueur in codes_longs:
+                if longueur - decalage <= nb_bits:
+                    self._remplir(sous_table, inverse >> decalage, longueur - decalage,
+                                  symbole, longueur)
+                else:
+                    index = (inverse >> decalage) & ((1 << nb_bits) - 1)
+                    plus_longs.setdefault(index, []).append((symbole, inverse, longueur))
+            table[prefixe] = (len(self._sous_tables), SOUS_TABLE)
+            self._sous_tables.append((decalage, (1 << nb_bits) - 1, sous_table))
+            self._ajouter_sous_tables(sous_table, plus_longs, decalage + nb_bits)
+
+    @classmethod
+    def depuis_arbre(cls, arbre, nb_bits_primaire: int = NB_BITS_PRIMAIRE):
+        ''' Compile un arbre de Huffman en tables de décodage.
+
+        params:
+        - arbre (ArbreHuffman): Arbre de Huffman dont les éléments sont des octets.
+        - nb_bits_primaire (int, optionnel): Nombre de bits maximal de la table primaire.
+
+        returns:
+        - DecodeurTable: Le décodeur correspondant.
+        '''
+        return cls(ArbrePlat.depuis_arbre(arbre).codes(), nb_bits_primaire)
+
+    @property
+    def nb_bits_primaire(self) -> int:
+        ''' Retourne le nombre de bits indexant la table primaire.
+
+        returns:
+        - int: Nombre de bits.
+        '''
+        return self._nb_bits_primaire
+
+    @property
+    def longueur_max(self) -> int:
+        ''' Retourne la longueur du plus long code.
+
+        returns:
+        - int: Nombre de bits.
+        '''
+        return self._longueur_max
+
+    @property
+    def longueur_min(self) -> int:
+        ''' Retourne la longueur du plus court code.
+
+        returns:
+        - int: Nombre de bits.
+        '''
+        return self._longueur_min
+
+    def decoder_octets(self, donnees, nb_symboles: int, sortie=None):
+        ''' Décode `nb_symboles` octets depuis un buffer compressé.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Bits compressés.
+        - nb_symboles (int): Nombre d'octets à décoder.
+        - sortie (bytearray | memoryview, optionnel): Tampon inscriptible d'au moins
+        `nb_symboles` octets recevant les octets décodés (par exemple une projection
+        en mémoire du fichier de destination) ; alloué si absent.
+
+        returns:
+        - bytearray | memoryview: Le tampon contenant les octets décodés.
+
+        raises:
+        - CodeInvalideErreur: Levée si les bits ne correspondent à aucun code.
+        - FinDeFluxErreur: Levée si les données sont trop courtes.
+        '''
+        return self.decoder_charge(donnees, nb_symboles, sortie)[0]
+
+    def decoder_charge(self, donnees, nb_symboles: int, sortie=None):
+        ''' Décode `nb_symboles` octets comme `decoder_octets` et retourne aussi le
+        nombre d'octets de la charge utile consommés (le dernier pouvant être
+        incomplet), afin de repositionner un flux juste après la charge.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Bits compressés.
+        - nb_symboles (int): Nombre d'octets à décoder.
+        - sortie (bytearray | memoryview, optionnel): Tampon recevant les octets décodés.
+
+        returns:
+        - (bytearray | memoryview, int): Le tampon contenant les octets décodés
+        et le nombre d'octets compressés consommés.
+
+        raises:
+        - CodeInvalideErreur: Levée si les bits ne correspondent à aucun code.
+        - FinDeFluxErreur: Levée si les données sont trop courtes.
+        '''
+        if sortie is None:
+            sortie = bytearray(nb_symboles)
+        elif len(sortie) < nb_symboles:
+            raise ValueError("Tampon de sortie trop petit")
+        with memoryview(donnees).cast("B") as donnees:
+            nb_bits_lus = self._decoder_dans(donnees, nb_symboles, sortie)
+        return sortie, -(-nb_bits_lus // 8)
+
+    def _decoder_dans(self, donnees: memoryview, nb_symboles: int, sortie) -> int:
+        ''' Décode `nb_symboles` octets dans un tampon préalloué.
+
+        params:
+        - donnees (memoryview): Bits compressés, au format d'octets.
+        - nb_symboles (int): Nombre d'octets à décoder.
+        - sortie (bytearray | memoryview): Tampon recevant les octets décodés.
+
+        returns:
+        - int: Nombre de bits consommés.
+
+        raises:
+        - CodeInvalideErreur: Levée si les bits ne correspondent à aucun code.
+        - FinDeFluxErreur: Levée si les données sont trop courtes.
+        '''
+        primaire = self._primaire
+        sous_tables = self._sous_tables
+        masque = (1 << self._nb_bits_primaire) - 1
+        besoin = self._longueur_max
+        from_bytes = int.from_bytes
+        acc = 0
+        nb_bits = 0
+        position = 0
+        for indice in range(nb_symboles):
+            while nb_bits < besoin:
+                # Au-delà de la fin des données, les bits manquants valent 0
+                acc |= from_bytes(donnees[position:position + 8], "little") << nb_bits
+                nb_bits += 64
+                position += 8
+            symbole, longueur = primaire[acc & masque]
+            if longueur <= 0:
+                while longueur == SOUS_TABLE:
+                    decalage, masque_sous_table, table = sous_tables[symbole]
+                    symbole, longueur = table[(acc >> decalage) & masque_sous_table]
+                if longueur == INVALIDE:
+                    raise CodeInvalideErreur("Séquence de bits ne correspondant à aucun code")
+            sortie[indice] = symbole
+            acc >>= longueur
+            nb_bits -= longueur
+        if 8 * position - nb_bits > 8 * len(donnees):
+            raise FinDeFluxErreur("Données compressées trop courtes")
+        return 8 * position - nb_bits
+
+    def decoder(self, lecteur, nb_symboles: int) -> bytearray:
+        ''' Décode `nb_symboles` octets depuis un BitReader.
+
+        params:
+        - lecteur (BitReader): Lecteur positionné sur les bits compressés.
+        - nb_symboles (int): Nombre d'octets à décoder.
+
+        returns:
+        - bytearray: Octets décodés.
+
+        raises:
+        - CodeInvalideErreur: Levée si les bits ne correspondent à aucun code.
+        - FinDeFluxErreur: Levée si le flux est trop court.
+        '''
+        sortie = bytearray()
+        for _ in range(nb_symboles):
+            bits = lecteur.voir(self._longueur_max)
+            symbole, longueur = self._primaire[bits & ((1 << self._nb_bits_primaire) - 1)]
+            while longueur == SOUS_TABLE:
+                decalage, masque, table = self._sous_tables[symbole]
+                symbole, longueur = table[(bits >> decalage) & masque]
+            if longueur == INVALIDE:
+                raise CodeInvalideErreur("Séquence de bits ne correspondant à aucun code")
+            lecteur.consommer(longueur)
+            sortie.append(symbole)
+        return sortie
+
+    @staticmethod
+    def _remplir(table, inverse, longueur, symbole, longueur_code):
+        ''' Remplit toutes les entrées d'une table dont les bits de poids faible
+        correspondent à un code.
+
+        params:
+        - table (list): Table à remplir.
+        - inverse (int): Bits du code à indexer (premier bit en poids faible).
+        - longueur (int): Nombre de bits du code indexés par la table.
+        - symbole (int): Symbole décodé.
+        - longueur_code (int): Longueur totale du code.
+
+        raises:
+        - CodeInvalideErreur: Levée si une entrée est déjà occupée.
+        '''
+        for indice in range(inverse, len(table), 1 << longueur):
+            if table[indice][1] != INVALIDE:
+                raise CodeInvalideErreur("Les codes ne forment pas un code préfixe")
+            table[indice] = (symbole, longueur_code)
+
+class CodeInvalideErreur(Exception):
+    ''' Exception levée lorsqu'une table de codes ou une séquence de bits
+    ne peut pas être décodée. '''
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+
+''' Module proposant la compression de petits messages avec une table de
+codes partagée (dictionnaire), entraînée à l'avance sur un corpus.
+
+Un message compressé ne contient ni arbre ni compteur : seulement
+l'identifiant et le mode `MODE_DICTIONNAIRE`, l'identifiant du dictionnaire
+(4 octets), le nombre d'octets d'origine (entier de longueur variable, 7 bits
+par octet) et la charge utile. Le dictionnaire attribue un code à chacun des
+256 octets, de sorte que tout message peut être compressé.
+
+Un fichier de dictionnaire contient `ENTETE_DICTIONNAIRE`, l'identifiant,
+la taille des longueurs encodées (2 octets) puis les longueurs des codes
+canoniques encodées par `encoder_longueurs`. Les dictionnaires chargés sont
+conservés en mémoire, avec leurs tables compilées, pour toute la durée du
+processus. '''
+import os
+import zlib
+from typing import Dict, Iterable
+
+from huffman.canonique import (codes_canoniques, encoder_longueurs, decoder_longueurs,
+                               longueurs_codes, LongueursInvalidesErreur, NB_SYMBOLES)
+from huffman.codage import codes_canoniques_compteur, table_de_codage
+from huffman.compteur_octets import CompteurOctets
+from huffman.decodeur import DecodeurTable, CodeInvalideErreur
+from huffman.flux_binaire import BitWriter, FinDeFluxErreur
+from huffman.format_fichier import (lire_exactement, FormatInvalideErreur, IDENTIFIANT,
+                                    MODE_DICTIONNAIRE, NB_OCTETS_CODAGE_INT,
+                                    NB_OCTETS_TAILLE_LONGUEURS)
+
+ENTETE_MESSAGE = IDENTIFIANT + bytes([MODE_DICTIONNAIRE])
+ENTETE_DICTIONNAIRE = IDENTIFIANT + b"D"
+# Longueur maximale des codes d'un dictionnaire (les octets absents du corpus
+# reçoivent malgré tout un code)
+MAX_BITS_DICTIONNAIRE = 16
+# Nombre maximal d'octets de la taille d'un message (56 bits utiles)
+NB_OCTETS_TAILLE_MAX = 8
+
+# Dictionnaires connus du processus, par identifiant
+_DICTIONNAIRES: Dict[int, "Dictionnaire"] = {}
+# Dictionnaires déjà chargés, par chemin absolu
+_FICHIERS_CHARGES: Dict[str, "Dictionnaire"] = {}
+
+class Dictionnaire:
+    ''' Table de codes canoniques partagée, identifiée par un entier.
+
+    arguments:
+    - _identifiant (int): Identifiant du dictionnaire (4 octets).
+    - _longueurs (dict[int, int]): Longueur du code de chaque octet.
+    - _table (list[tuple[int, int]]): Table de codage compilée (voir `table_de_codage`).
+    - _decodeur (DecodeurTable): Décodeur compilé.
+    '''
+    def __init__(self, longueurs: Dict[int, int], identifiant: int = None):
+        ''' Compile un dictionnaire à partir des longueurs des codes.
+
+        params:
+        - longueurs (dict[int, int]): Longueur du code de chacun des 256 octets.
+        - identifiant (int, optionnel): Identifiant ; par défaut, une somme de
+        contrôle des longueurs encodées.
+
+        raises:
+        - DictionnaireInvalideErreur: Levée si un octet n'a pas de code, si les
+        longueurs ne forment pas un code préfixe ou si l'identifiant est invalide.
+        '''
+        if any(not longueurs.get(octet) for octet in range(NB_SYMBOLES)):
+            raise DictionnaireInvalideErreur("Chacun des 256 octets doit avoir un code")
+        try:
+            codes = codes_canoniques(longueurs)
+            self._decodeur = DecodeurTable(codes)
+        except (LongueursInvalidesErreur, CodeInvalideErreur) as erreur:
+            raise DictionnaireInvalideErreur(str(erreur)) from erreur
+        if identifiant is None:
+            identifiant = zlib.crc32(encoder_longueurs(longueurs))
+        if not 0 <= identifiant < 1 << (8 * NB_OCTETS_CODAGE_INT):
+            raise DictionnaireInvalideErreur(f"Identifiant invalide : {identifiant}")
+        self._identifiant = identifiant
+        self._longueurs = dict(longueurs)
+        self._table = table_de_codage(codes)
+
+    @property
+    def identifiant(self) -> int:
+        ''' Retourne l'identifiant du dictionnaire.
+
+        returns:
+        - int: Identifiant.
+        '''
+        return self._identifiant
+
+    @property
+    def longueurs(self) -> Dict[int, int]:
+        ''' Retourne la longueur du code de chaque octet.
+
+        returns:
+        - dict[int, int]: Copie des longueurs.
+        '''
+        return dict(self._longueurs)
+
+    def compresser(self, message) -> bytes:
+        ''' Compresse un message.
+
+        params:
+        - message (bytes | bytearray | memoryview): Octets du message.
+
+        returns:
+        - bytes: Message compressé, entête comprise.
+        '''
+        ecrivain = BitWriter()
+        ecrivain.ecrire_octets(message, self._table)
+        ecrivain.vider()
+        return (ENTETE_MESSAGE + self._identifiant.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+                + _encoder_taille(len(message)) + ecrivain.valeur())
+
+    def decompresser(self, compresse) -> bytearray:
+        ''' Décompresse un message compressé avec ce dictionnaire.
+
+        params:
+        - compresse (bytes | bytearray | memoryview): Message compressé.
+
+        returns:
+        - bytearray: Octets du message.
+
+        raises:
+        - FormatInvalideErreur: Levée si le message n'a pas le format attendu
+        ou a été compressé avec un autre dictionnaire.
+        '''
+        identifiant, taille, debut = lire_entete_message(compresse)
+        if identifiant != self._identifiant:
+            raise FormatInvalideErreur(
+                f"Message compressé avec le dictionnaire {identifiant}, pas {self._identifiant}")
+        charge = memoryview(compresse)[debut:]
+        if taille * self._decodeur.longueur_min > 8 * len(charge):
+            # Vérifié avant de réserver les octets décodés
+            raise FormatInvalideErreur("Taille du message incohérente avec sa charge utile")
+        try:
+            return self._decodeur.decoder_octets(charge, taille)
+        except (CodeInvalideErreur, FinDeFluxErreur) as erreur:
+            raise FormatInvalideErreur(f"Message invalide : {erreur}") from erreur
+
+    def ecrire(self, destination) -> None:
+        ''' Écrit le dictionnaire dans un flux binaire.
+
+        params:
+        - destination: Flux binaire possédant une méthode `write`.
+        '''
+        longueurs_encodees = encoder_longueurs(self._longueurs)
+        destination.write(ENTETE_DICTIONNAIRE
+                          + self._identifiant.to_bytes(NB_OCTETS_CODAGE_INT, byteorder="big")
+                          + len(longueurs_encodees).to_bytes(NB_OCTETS_TAILLE_LONGUEURS,
+                                                             byteorder="big")
+                          + longueurs_encodees)
+
+    @classmethod
+    def lire(cls, source):
+        ''' Lit un dictionnaire écrit par `ecrire`.
+
+        params:
+        - source: Flux binaire possédant une méthode `read`.
+
+        returns:
+        - Dictionnaire: Le dictionnaire.
+
+        raises:
+        - FormatInvalideErreur: Levée si le flux n'est pas un dictionnaire valide.
+        '''
+        entete = lire_exactement(source, len(ENTETE_DICTIONNAIRE) + NB_OCTETS_CODAGE_INT
+                                 + NB_OCTETS_TAILLE_LONGUEURS)
+        if entete[:len(ENTETE_DICTIONNAIRE)] != ENTETE_DICTIONNAIRE:
+            raise FormatInvalideErreur("Entête de dictionnaire invalide")
+        debut = len(ENTETE_DICTIONNAIRE)
+        identifiant = int.from_bytes(entete[debut:debut + NB_OCTETS_CODAGE_INT], byteorder="big")
+        nb_octets = int.from_bytes(entete[debut + NB_OCTETS_CODAGE_INT:], byteorder="big")
+        try:
+            return cls(decoder_longueurs(lire_exactement(source, nb_octets)), identifiant)
+        except (LongueursInvalidesErreur, DictionnaireInvalideErreur) as erreur:
+            raise FormatInvalideErreur(f"Dictionnaire invalide : {erreur}") from erreur
+
+def entrainer(echantillons: Iterable[bytes], identifiant: int = None,
+              max_bits: int = MAX_BITS_DICTIONNAIRE) -> Dictionnaire:
+    ''' Entraîne un dictionnaire sur un corpus de messages.
+
+    Chaque octet reçoit une occurrence supplémentaire afin d'avoir un code,
+    même s'il est absent du corpus.
+
+    params:
+    - echantillons (Iterable[bytes]): Messages représentatifs.
+    - identifiant (int, optionnel): Identifiant du dictionnaire.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+
+    returns:
+    - Dictionnaire: Le dictionnaire entraîné.
+    '''
+    stat = CompteurOctets({octet: 1 for octet in range(NB_SYMBOLES)})
+    for echantillon in echantillons:
+        stat.ajouter_octets(echantillon)
+    codes = codes_canoniques_compteur(stat, max_bits)
+    return Dictionnaire(longueurs_codes(codes), identifiant)
+
+def enregistrer(dictionnaire: Dictionnaire) -> None:
+    ''' Rend un dictionnaire disponible pour `decompresser_message` dans tout le processus.
+
+    params:
+    - dictionnaire (Dictionnaire): Dictionnaire à enregistrer.
+    '''
+    _DICTIONNAIRES[dictionnaire.identifiant] = dictionnaire
+
+def dictionnaire(identifiant: int) -> Dictionnaire:
+    ''' Retourne un dictionnaire enregistré.
+
+    params:
+    - identifiant (int): Identifiant du dictionnaire.
+
+    returns:
+    - Dictionnaire: Le dictionnaire.
+
+    raises:
+    - DictionnaireInconnuErreur: Levée si aucun dictionnaire n'a cet identifiant.
+    '''
+    try:
+        return _DICTIONNAIRES[identifiant]
+    except KeyError as erreur:
+        raise DictionnaireInconnuErreur(f"Dictionnaire inconnu : {identifiant}") from erreur
+
+def sauvegarder(dictionnaire_a_ecrire: Dictionnaire, chemin: str) -> None:
+    ''' Écrit un dictionnaire dans un fichier.
+
+    params:
+    - dictionnaire_a_ecrire (Dictionnaire): Dictionnaire à écrire.
+    - chemin (str): Chemin du fichier.
+    '''
+    with open(chemin, "wb") as destination:
+        dictionnaire_a_ecrire.ecrire(destination)
+
+def charger(chemin: str) -> Dictionnaire:
+    ''' Charge et enregistre un dictionnaire ; un fichier n'est lu et compilé
+    qu'une seule fois par processus.
+
+    params:
+    - chemin (str): Chemin du fichier.
+
+    returns:
+    - Dictionnaire: Le dictionnaire.
+
+    raises:
+    - FormatInvalideErreur: Levée si le fichier n'est pas un dictionnaire valide.
+    '''
+    chemin = os.path.abspath(chemin)
+    if chemin not in _FICHIERS_CHARGES:
+        with open(chemin, "rb") as source:
+            _FICHIERS_CHARGES[chemin] = Dictionnaire.lire(source)
+    resultat = _FICHIERS_CHARGES[chemin]
+    enregistrer(resultat)
+    return resultat
+
+def compresser_message(message, dictionnaire_utilise: Dictionnaire) -> bytes:
+    ''' Compresse un message avec un dictionnaire.
+
+    params:
+    - message (bytes | bytearray | memoryview): Octets du message.
+    - dictionnaire_utilise (Dictionnaire): Dictionnaire.
+
+    returns:
+    - bytes: Message compressé.
+    '''
+    return dictionnaire_utilise.compresser(message)
+
+def decompresser_message(compresse, dictionnaire_utilise: Dictionnaire = None) -> bytearray:
+    ''' Décompresse un message, avec le dictionnaire enregistré désigné par son
+    entête si aucun dictionnaire n'est fourni.
+
+    params:
+    - compresse (bytes | bytearray | memoryview): Message compressé.
+    - dictionnaire_utilise (Dictionnaire, optionnel): Dictionnaire.
+
+    returns:
+    - bytearray: Octets du message.
+
+    raises:
+    - FormatInvalideErreur: Levée si le message n'a pas le format attendu.
+    - DictionnaireInconnuErreur: Levée si le dictionnaire n'est pas enregistré.
+    '''
+    if dictionnaire_utilise is None:
+        dictionnaire_utilise = dictionnaire(lire_entete_message(compresse)[0])
+    return dictionnaire_utilise.decompresser(compresse)
+
+def lire_entete_message(compresse) -> (int, int, int):
+    ''' Lit l'entête d'un message compressé avec un dictionnaire.
+
+    params:
+    - compresse (bytes | bytearray | memoryview): Message compressé.
+
+    returns:
+    - (int, int, int): Identifiant du dictionnaire, nombre d'octets d'origine et
+    position de la charge utile.
+
+    raises:
+    - FormatInvalideErreur: Levée si l'entête est invalide ou tronquée.
+    '''
+    if bytes(compresse[:len(ENTETE_MESSAGE)]) != ENTETE_MESSAGE:
+        raise FormatInvalideErreur("Entête de message compressé invalide")
+    debut = len(ENTETE_MESSAGE)
+    fin = debut + NB_OCTETS_CODAGE_INT
+    if len(compresse) < fin:
+        raise FormatInvalideErreur("Entête de message compressé tronquée")
+    identifiant = int.from_bytes(compresse[debut:fin], byteorder="big")
+    taille, debut = _decoder_taille(compresse, fin)
+    return identifiant, taille, debut
+
+def _encoder_taille(taille: int) -> bytes:
+    ''' Encode un entier positif par groupes de 7 bits, poids faibles en
+    premier, le bit de poids fort indiquant qu'un octet suit.
+
+    params:
+    - taille (int): Entier à encoder.
+
+    returns:
+    - bytes: Entier encodé (un octet en dessous de 128).
+
+    raises:
+    - ValueError: Levée si l'entier demande plus de `NB_OCTETS_TAILLE_MAX` octets.
+    '''
+    if taille >> (7 * NB_OCTETS_TAILLE_MAX):
+        raise ValueError(f"Taille trop grande : {taille}")
+    octets = bytearray()
+    while taille >= 0x80:
+        octets.append((taille & 0x7F) | 0x80)
+        taille >>= 7
+    octets.append(taille)
+    return bytes(octets)
+
+def _decoder_taille(donnees, position: int) -> (int, int):
+    ''' Décode un entier encodé par `_encoder_taille`.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Données contenant l'entier.
+    - position (int): Position de l'entier.
+
+    returns:
+    - (int, int): Entier et position qui suit.
+
+    raises:
+    - FormatInvalideErreur: Levée si l'entier est tronqué ou occupe plus de
+    `NB_OCTETS_TAILLE_MAX` octets.
+    '''
+    taille = decalage = 0
+    while True:
+        if position >= len(donnees):
+            raise FormatInvalideErreur("Taille du message tronquée")
+        if decalage >= 7 * NB_OCTETS_TAILLE_MAX:
+            raise FormatInvalideErreur("Taille du message trop longue")
+        octet = donnees[position]
+        position += 1
+        taille |= (octet & 0x7F) << decalage
+        decalage += 7
+        if not octet & 0x80:
+            return taille, position
+
+class DictionnaireInvalideErreur(Exception):
+    ''' Exception levée lorsque des longueurs ne forment pas un dictionnaire valide. '''
+
+class DictionnaireInconnuErreur(Exception):
+    ''' Exception levée lorsqu'un message désigne un dictionnaire non enregistré. '''
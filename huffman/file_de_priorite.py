@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 ''' Module proposant la classe FileDePriorite '''
+import heapq
+from itertools import count
 from typing import TypeVar
 
 T = TypeVar('T')
@@ -8,22 +10,52 @@ T = TypeVar('T')
 class FileDePriorite:
     ''' File qui gère la priorité des éléments à partir d'une fonction cle.
 
+    La file est un tas binaire dont chaque entrée est décorée une seule fois
+    par sa clé et un rang d'insertion : les éléments de même clé sortent dans
+    leur ordre d'arrivée et ne sont jamais comparés entre eux.
+
     arguments:
-    - _file (list[T]): Liste des éléments triés selon leur priorité.
-    - _cle (function): Fonction appliquée à chaque élément pour définir son ordre.
+    - _tas (list[tuple]): Tas binaire d'entrées `(cle(element), rang, element)`.
+    - _rangs (Iterator[int]): Générateur des rangs d'insertion.
+    - cle (function): Fonction appliquée à chaque élément pour définir son ordre.
     '''
     def __init__(self, elements: tuple = (), cle = lambda e:e):
         ''' Initialise la file avec des éléments et une fonction cle.
-        
+
+        Les éléments initiaux sont placés dans le tas en temps linéaire.
+
         params:
         - elements (tuple[T], optionnel): Éléments initiaux à insérer dans la file.
         - cle (function, optionnel): Fonction utilisée pour comparer les éléments 
         (par défaut `lambda e: e`).
+
+        raises:
+        - ElementNonComparableErreur : Levée si un élément ne peut pas être comparé.
         '''
         self.cle = cle
-        self.file = []
+        self._rangs = count()
+        self._tas = []
         for e in elements:
-            self.enfiler(e)
+            entree = self._decorer(e)
+            self._verifier_element_comparable(entree[0])
+            self._tas.append(entree)
+        try:
+            heapq.heapify(self._tas)
+        except TypeError:
+            raise ElementNonComparableErreur("Les éléments ne peuvent être comparés \
+                                             entre eux") from None
+
+    @property
+    def file(self) -> list[T]:
+        ''' Retourne les éléments de la file dans l'ordre du tas, sans les trier.
+
+        Seul le premier élément est garanti être le plus prioritaire ; l'ordre
+        complet est donné par l'itération, qui trie la file (O(n log n)).
+
+        returns:
+        - list[T]: Liste des éléments, le plus prioritaire en tête.
+        '''
+        return [entree[2] for entree in self._tas]
 
     @property
     def est_vide(self):
@@ -32,7 +64,7 @@ class FileDePriorite:
         returns:
         - bool: True si la file est vide, False sinon.
         '''
-        return len(self.file)==0
+        return len(self._tas)==0
 
     def enfiler(self, element: T):
         ''' Ajoute un élément dans la file en respectant l'ordre de priorité.
@@ -43,9 +75,7 @@ class FileDePriorite:
         raises:
         - ElementNonComparableErreur : Levée si l'élément ne peut pas être comparé.
         '''
-        self._verifier_element_comparable(self, element)
-        self.file.append(element)
-        self.file = sorted(self.file, key=self.cle)
+        self._modifier_tas(heapq.heappush, self._decorer(element))
 
     def defiler(self) -> T:
         ''' Retire et retourne l'élément le plus prioritaire de la file.
@@ -57,7 +87,39 @@ class FileDePriorite:
         - FileDePrioriteVideErreur : Levée si la file est vide.
         '''
         self._verifier_file_de_priorite_vide(self)
-        return self.file.pop(0)
+        return heapq.heappop(self._tas)[2]
+
+    def enfiler_defiler(self, element: T) -> T:
+        ''' Ajoute un élément puis retire et retourne l'élément le plus prioritaire,
+        en une seule opération sur le tas.
+
+        params:
+        - element (T): Élément à insérer.
+
+        returns:
+        - T: Élément le plus prioritaire (éventuellement `element` lui-même).
+
+        raises:
+        - ElementNonComparableErreur : Levée si l'élément ne peut pas être comparé.
+        '''
+        return self._modifier_tas(heapq.heappushpop, self._decorer(element))[2]
+
+    def remplacer(self, element: T) -> T:
+        ''' Retire et retourne l'élément le plus prioritaire puis ajoute un élément,
+        en une seule opération sur le tas.
+
+        params:
+        - element (T): Élément à insérer.
+
+        returns:
+        - T: Élément qui était en tête de file.
+
+        raises:
+        - FileDePrioriteVideErreur : Levée si la file est vide.
+        - ElementNonComparableErreur : Levée si l'élément ne peut pas être comparé.
+        '''
+        self._verifier_file_de_priorite_vide(self)
+        return self._modifier_tas(heapq.heapreplace, self._decorer(element))[2]
 
     @property
     def element(self):
@@ -70,7 +132,15 @@ class FileDePriorite:
         - FileDePrioriteVideErreur : Levée si la file est vide.
         '''
         self._verifier_file_de_priorite_vide(self)
-        return self.file[0]
+        return self._tas[0][2]
+
+    def __len__(self):
+        ''' Retourne le nombre d'éléments dans la file.
+
+        returns:
+        - int: Nombre d'éléments.
+        '''
+        return len(self._tas)
 
     def __repr__(self):
         ''' Retourne une représentation formelle de la file de priorité.
@@ -78,7 +148,7 @@ class FileDePriorite:
         returns:
         - str: Représentation sous forme `FileDePriorite([...])`.
         '''
-        return f"FileDePriorite({self.file})"
+        return f"FileDePriorite({list(self)})"
 
     def __str__(self):
         ''' Retourne une représentation informelle de la file de priorité.
@@ -86,7 +156,7 @@ class FileDePriorite:
         returns:
         - str: Chaîne contenant la liste des éléments triés.
         '''
-        return f"{self.file}"
+        return f"{list(self)}"
 
     def __iter__(self):
         ''' Permet d'itérer sur les éléments de la file de priorité.
@@ -94,7 +164,7 @@ class FileDePriorite:
         returns:
         - Iterator[T]: Itérateur sur les éléments triés.
         '''
-        return iter(self.file)
+        return (entree[2] for entree in sorted(self._tas))
 
     def __eq__(self, autre):
         ''' Vérifie si deux files de priorité sont équivalentes.
@@ -107,7 +177,47 @@ class FileDePriorite:
         '''
         if not isinstance(autre, self.__class__):
             return False
-        return self.file == autre.file and self.cle == autre.cle
+        return list(self) == list(autre) and self.cle == autre.cle
+
+    def _decorer(self, element: T) -> tuple:
+        ''' Construit l'entrée du tas associée à un élément.
+
+        params:
+        - element (T): Élément à décorer.
+
+        returns:
+        - tuple: `(cle(element), rang, element)`.
+        '''
+        return (self.cle(element), next(self._rangs), element)
+
+    def _modifier_tas(self, operation, entree: tuple):
+        ''' Applique une opération de `heapq` insérant une entrée dans le tas.
+
+        Si l'opération échoue sur une comparaison, le tas est rétabli avec
+        ses entrées d'origine avant de lever l'erreur.
+
+        params:
+        - operation (function): `heapq.heappush`, `heapq.heappushpop` ou `heapq.heapreplace`.
+        - entree (tuple): Entrée à insérer.
+
+        returns:
+        - tuple | None: Entrée retournée par l'opération.
+
+        raises:
+        - ElementNonComparableErreur : Levée si la clé de l'entrée ne peut être
+        comparée à celles de la file.
+        '''
+        self._verifier_element_comparable(entree[0])
+        tete = self._tas[0] if self._tas else None
+        try:
+            return operation(self._tas, entree)
+        except TypeError:
+            self._tas = [e for e in self._tas if e is not entree]
+            if tete is not None and all(e is not tete for e in self._tas):
+                self._tas.append(tete)
+            heapq.heapify(self._tas)
+            raise ElementNonComparableErreur(f"{entree[0]} ne peut être comparé aux \
+                                             éléments déjà présents dans la file") from None
 
     @staticmethod
     def _verifier_file_de_priorite_vide(file):
@@ -120,29 +230,25 @@ class FileDePriorite:
             raise FileDePrioriteVideErreur("La file de priorité est vide")
 
     @staticmethod
-    def _verifier_element_comparable(file, element):
-        ''' Vérifie que l'élément est comparable avec les autres éléments de la file.
+    def _verifier_element_comparable(cle):
+        ''' Vérifie que la clé d'un élément possède les opérateurs de comparaison.
+
+        La comparaison avec les clés de la file est vérifiée par les opérations
+        sur le tas elles-mêmes (voir `_modifier_tas`).
 
         params:
-        - element (T): Élément à vérifier.
+        - cle: Clé de l'élément à vérifier.
 
         raises:
-        - ElementNonComparableErreur : Levée si l'élément ne possède pas 
+        - ElementNonComparableErreur : Levée si la clé ne possède pas 
         les opérateurs de comparaison.
         '''
         try:
-            _ = element < element #pylint: disable=comparison-with-itself
+            _ = cle < cle #pylint: disable=comparison-with-itself
         except TypeError:
-            raise ElementNonComparableErreur(f"La classe de {element} ne possède \
+            raise ElementNonComparableErreur(f"La classe de {cle} ne possède \
                                              pas les méthodes de comparaison") from None
 
-        if not file.est_vide:
-            try:
-                _ = element < file.file[0]
-            except TypeError:
-                raise ElementNonComparableErreur(f"{element} ne peut être comparé aux \
-                                                 éléments déjà présents dans la file") from None
-
 class FileDePrioriteVideErreur(Exception):
     ''' Exception FileDePrioriteVideErreur qui est levée lorsqu'on essaye d'obtenir 
     ou défiler l'élément en tête d'une file vide
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+''' Module proposant une compression et une décompression incrémentales
+(à la manière de `zlib.compressobj` / `zlib.decompressobj`).
+
+Les données sont découpées en blocs indépendants (voir le module `blocs`) :
+la mémoire utilisée est bornée par la taille d'un bloc, quelle que soit la
+taille du flux, et la source n'a jamais besoin d'être relue. '''
+import io
+
+from huffman.blocs import (encoder_bloc, decoder_bloc, lire_entete_bloc, bloc_fin, encoder_index,
+                           table_du_bloc, verifier_nb_flux, ENTETE_FLUX, SEUIL_BRUT, TAILLE_BLOC,
+                           TAILLE_ENTETE_BLOC, TYPE_FIN, TYPE_INDEX)
+from huffman.format_fichier import FormatInvalideErreur
+
+TAILLE_LECTURE = 1 << 16
+
+class CompresseurFlux:
+    ''' Compresse un flux d'octets fourni morceau par morceau.
+
+    arguments:
+    - _taille_bloc (int): Nombre d'octets d'origine par bloc.
+    - _max_bits (int): Longueur maximale des codes (None pour aucune limite).
+    - _en_attente (bytearray): Octets pas encore compressés (moins d'un bloc).
+    - _entete_ecrite (bool): Indique si l'entête du flux a été produite.
+    - _termine (bool): Indique si `flush` a été appelée.
+    - _index (bool): Indique si un bloc d'index est écrit à la fin du flux.
+    - _positions (list[tuple[int, int]]): Positions compressée et d'origine de chaque bloc.
+    - _position (int): Nombre d'octets compressés produits.
+    - _taille_origine (int): Nombre d'octets d'origine compressés.
+    - _nb_flux (int): Nombre de sous-flux de la charge utile de chaque bloc.
+    - _seuil_brut (float): Économie estimée en dessous de laquelle un bloc n'est pas codé.
+    '''
+    def __init__(self, taille_bloc: int = TAILLE_BLOC, max_bits: int = None,
+                 index: bool = False, nb_flux: int = 1, seuil_brut: float = SEUIL_BRUT):
+        ''' Initialise le compresseur.
+
+        params:
+        - taille_bloc (int, optionnel): Nombre d'octets d'origine par bloc.
+        - max_bits (int, optionnel): Longueur maximale des codes.
+        - index (bool, optionnel): Écrit un bloc d'index permettant l'accès
+        aléatoire (voir `LecteurIndexe`).
+        - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile de
+        chaque bloc, décodables indépendamment.
+        - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle
+        un bloc est écrit sans codage (0 pour toujours coder).
+        '''
+        if taille_bloc <= 0:
+            raise ValueError("La taille d'un bloc doit être positive")
+        verifier_nb_flux(nb_flux)
+        self._taille_bloc = taille_bloc
+        self._max_bits = max_bits
+        self._en_attente = bytearray()
+        self._entete_ecrite = False
+        self._termine = False
+        self._index = index
+        self._positions = []
+        self._position = 0
+        self._taille_origine = 0
+        self._nb_flux = nb_flux
+        self._seuil_brut = seuil_brut
+
+    def compress(self, donnees) -> bytes:
+        ''' Ajoute des octets à compresser.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets à compresser.
+
+        returns:
+        - bytes: Blocs compressés complets produits par cet appel (éventuellement vide).
+
+        raises:
+        - FluxTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        self._verifier_non_termine()
+        sortie = [self._entete()]
+        self._en_attente += donnees
+        nb_blocs = len(self._en_attente) // self._taille_bloc
+        if nb_blocs:
+            vue = memoryview(self._en_attente)
+            for debut in range(0, nb_blocs * self._taille_bloc, self._taille_bloc):
+                sortie.append(self._encoder_bloc(vue[debut:debut + self._taille_bloc]))
+            vue.release()
+            del self._en_attente[:nb_blocs * self._taille_bloc]
+        return b"".join(sortie)
+
+    def flush(self) -> bytes:
+        ''' Compresse les octets restants et termine le flux.
+
+        returns:
+        - bytes: Derniers blocs compressés suivis du bloc d'index éventuel et du bloc de fin.
+
+        raises:
+        - FluxTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        self._verifier_non_termine()
+        sortie = [self._entete()]
+        if self._en_attente:
+            sortie.append(self._encoder_bloc(self._en_attente))
+            self._en_attente = bytearray()
+        if self._index:
+            bloc_index = encoder_index(self._positions, self._taille_origine)
+            sortie.append(bloc_index)
+            sortie.append(bloc_fin(len(bloc_index)))
+        else:
+            sortie.append(bloc_fin())
+        self._termine = True
+        return b"".join(sortie)
+
+    def _encoder_bloc(self, donnees) -> bytes:
+        ''' Compresse un bloc et enregistre sa position.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets du bloc.
+
+        returns:
+        - bytes: Bloc compressé.
+        '''
+        bloc = self._compresser_bloc(donnees)
+        self._positions.append((self._position, self._taille_origine))
+        self._position += len(bloc)
+        self._taille_origine += len(donnees)
+        return bloc
+
+    def _compresser_bloc(self, donnees) -> bytes:
+        ''' Compresse un bloc (méthode redéfinie par les compresseurs qui
+        choisissent autrement leurs codes).
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets du bloc.
+
+        returns:
+        - bytes: Bloc compressé.
+        '''
+        return encoder_bloc(donnees, self._max_bits, self._nb_flux, self._seuil_brut)
+
+    def _entete(self) -> bytes:
+        ''' Retourne l'entête du flux si elle n'a pas encore été produite.
+
+        returns:
+        - bytes: Identifiant et mode, ou rien.
+        '''
+        if self._entete_ecrite:
+            return b""
+        self._entete_ecrite = True
+        self._position += len(ENTETE_FLUX)
+        return ENTETE_FLUX
+
+    def _verifier_non_termine(self) -> None:
+        ''' Vérifie que le flux n'a pas été terminé.
+
+        raises:
+        - FluxTermineErreur: Levée si `flush` a déjà été appelée.
+        '''
+        if self._termine:
+            raise FluxTermineErreur("Le flux compressé est déjà terminé")
+
+class DecompresseurFlux:
+    ''' Décompresse un flux produit par CompresseurFlux, fourni morceau par morceau.
+
+    Un bloc n'est décodé que lorsqu'il est complet et que les octets déjà
+    décodés ne suffisent pas à satisfaire la demande.
+
+    arguments:
+    - _entree (bytearray): Octets compressés reçus mais pas encore décodés.
+    - _sortie (bytearray): Octets décodés pas encore retournés.
+    - _entete_lue (bool): Indique si l'entête du flux a été lue.
+    - _table (bytes): Table du dernier bloc qui en contient une.
+    - _executeur (Executor): Exécuteur des sous-flux des blocs multi-flux, ou None.
+    - eof (bool): Indique si le bloc de fin a été atteint.
+    - unused_data (bytes): Octets reçus après le bloc de fin.
+    '''
+    def __init__(self, entete_lue: bool = False, executeur=None):
+        ''' Initialise le décompresseur.
+
+        params:
+        - entete_lue (bool, optionnel): Indique que l'identifiant et le mode ont
+        déjà été lus (les données fournies commencent par le premier bloc).
+        - executeur (Executor, optionnel): Exécuteur auquel confier les sous-flux
+        des blocs `TYPE_HUFFMAN_MULTIFLUX` (décodés à la suite sinon).
+        '''
+        self._entree = bytearray()
+        self._sortie = bytearray()
+        self._entete_lue = entete_lue
+        self._table = None
+        self._executeur = executeur
+        self.eof = False
+        self.unused_data = b""
+
+    def decompress(self, donnees, max_length: int = 0) -> bytes:
+        ''' Ajoute des octets compressés et retourne les octets décodés disponibles.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets compressés.
+        - max_length (int, optionnel): Nombre maximal d'octets retournés
+        (0 pour aucune limite) ; le reste est retourné par les appels suivants.
+
+        returns:
+        - bytes: Octets décodés.
+
+        raises:
+        - FormatInvalideErreur: Levée si le flux n'a pas le format attendu.
+        '''
+        if self.eof:
+            self.unused_data += bytes(donnees)
+        else:
+            self._entree += donnees
+        while not self.eof and (not max_length or len(self._sortie) < max_length):
+            if not self._decoder_bloc_suivant():
+                break
+        if max_length and len(self._sortie) > max_length:
+            resultat = bytes(self._sortie[:max_length])
+            del self._sortie[:max_length]
+        else:
+            resultat = bytes(self._sortie)
+            self._sortie.clear()
+        return resultat
+
+    @property
+    def needs_input(self) -> bool:
+        ''' Indique si de nouveaux octets compressés sont nécessaires pour progresser.
+
+        returns:
+        - bool: True si aucun octet décodé n'est en attente et que le flux n'est pas terminé.
+        '''
+        return not self.eof and not self._sortie
+
+    def _decoder_bloc_suivant(self) -> bool:
+        ''' Décode le prochain bloc s'il est complet.
+
+        returns:
+        - bool: True si un bloc (ou l'entête) a été traité, False s'il manque des octets.
+
+        raises:
+        - FormatInvalideErreur: Levée si le flux n'a pas le format attendu.
+        '''
+        if not self._entete_lue:
+            if len(self._entree) < len(ENTETE_FLUX):
+                return False
+            if bytes(self._entree[:len(ENTETE_FLUX)]) != ENTETE_FLUX:
+                raise FormatInvalideErreur("Entête de flux compressé invalide")
+            del self._entree[:len(ENTETE_FLUX)]
+            self._entete_lue = True
+            return True
+        if len(self._entree) < TAILLE_ENTETE_BLOC:
+            return False
+        type_bloc, taille, taille_corps = lire_entete_bloc(self._entree)
+        if type_bloc == TYPE_FIN:
+            self.eof = True
+            self.unused_data = bytes(self._entree[TAILLE_ENTETE_BLOC:])
+            self._entree = bytearray()
+            return True
+        fin = TAILLE_ENTETE_BLOC + taille_corps
+        if len(self._entree) < fin:
+            return False
+        if type_bloc == TYPE_INDEX:
+            del self._entree[:fin]
+            return True
+        vue = memoryview(self._entree)
+        corps = vue[TAILLE_ENTETE_BLOC:fin]
+        self._sortie += decoder_bloc(type_bloc, taille, corps, executeur=self._executeur,
+                                     table_precedente=self._table)
+        self._table = table_du_bloc(type_bloc, corps) or self._table
+        corps.release()
+        vue.release()
+        del self._entree[:fin]
+        return True
+
+def compressobj(taille_bloc: int = TAILLE_BLOC, max_bits: int = None,
+                index: bool = False, nb_flux: int = 1,
+                seuil_brut: float = SEUIL_BRUT) -> CompresseurFlux:
+    ''' Retourne un compresseur incrémental.
+
+    params:
+    - taille_bloc (int, optionnel): Nombre d'octets d'origine par bloc.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+    - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile de chaque bloc.
+    - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle un
+    bloc est écrit sans codage (0 pour toujours coder).
+
+    returns:
+    - CompresseurFlux: Le compresseur.
+    '''
+    return CompresseurFlux(taille_bloc, max_bits, index, nb_flux, seuil_brut)
+
+def decompressobj(entete_lue: bool = False, executeur=None) -> DecompresseurFlux:
+    ''' Retourne un décompresseur incrémental.
+
+    params:
+    - entete_lue (bool, optionnel): Indique que l'identifiant et le mode ont déjà été lus.
+    - executeur (Executor, optionnel): Exécuteur des sous-flux des blocs multi-flux.
+
+    returns:
+    - DecompresseurFlux: Le décompresseur.
+    '''
+    return DecompresseurFlux(entete_lue, executeur)
+
+def compresser_flux(source: io.RawIOBase, destination: io.RawIOBase,
+                    taille_bloc: int = TAILLE_BLOC, max_bits: int = None,
+                    index: bool = False, nb_flux: int = 1,
+                    seuil_brut: float = SEUIL_BRUT) -> None:
+    ''' Compresse une source lue séquentiellement (tube, socket...) sans jamais la relire.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - taille_bloc (int, optionnel): Nombre d'octets d'origine par bloc.
+    - max_bits (int, optionnel): Longueur maximale des codes.
+    - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile de chaque bloc.
+    - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle un
+    bloc est écrit sans codage (0 pour toujours coder).
+    '''
+    compresseur = compressobj(taille_bloc, max_bits, index, nb_flux, seuil_brut)
+    while (chunk := source.read(TAILLE_LECTURE)):
+        destination.write(compresseur.compress(chunk))
+    destination.write(compresseur.flush())
+
+def decompresser_flux(source: io.RawIOBase, destination: io.RawIOBase,
+                      entete_lue: bool = False, executeur=None) -> None:
+    ''' Décompresse une source lue séquentiellement (tube, socket...).
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - entete_lue (bool, optionnel): Indique que l'identifiant et le mode ont déjà été lus.
+    - executeur (Executor, optionnel): Exécuteur des sous-flux des blocs multi-flux.
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux est tronqué ou n'a pas le format attendu.
+    '''
+    decompresseur = decompressobj(entete_lue, executeur)
+    while not decompresseur.eof and (chunk := source.read(TAILLE_LECTURE)):
+        destination.write(decompresseur.decompress(chunk))
+    if not decompresseur.eof:
+        raise FormatInvalideErreur("Flux compressé tronqué")
+
+class FluxTermineErreur(Exception):
+    ''' Exception levée lorsqu'on utilise un CompresseurFlux déjà terminé. '''
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+
+''' Module proposant les classes BitWriter et BitReader pour lire et écrire
+des codes de longueur variable dans des flux d'octets.
+
+Les bits sont rangés du bit de poids faible au bit de poids fort de chaque
+octet : le premier bit d'un code occupe le bit 0 du premier octet libre. Un
+CodeBinaire (premier bit en poids fort) doit donc être inversé avec
+`inverser_bits` avant d'être écrit. '''
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Nombre de bits accumulés avant de transférer les octets complets dans le tampon
+TAILLE_MOT = 64
+TAILLE_TAMPON = 1 << 16
+
+# En dessous de ce nombre d'octets, l'encodage vectorisé ne compense pas le
+# coût de la création des tableaux NumPy.
+SEUIL_NUMPY = 4096
+# Longueur maximale d'un code pour l'encodage vectorisé (un code occupe au plus deux mots)
+LONGUEUR_MAX_NUMPY = 64
+
+def inverser_bits(valeur: int, longueur: int) -> int:
+    ''' Inverse l'ordre des `longueur` bits de poids faible d'une valeur.
+
+    params:
+    - valeur (int): Valeur à inverser.
+    - longueur (int): Nombre de bits concernés.
+
+    returns:
+    - int: Valeur dont le bit 0 est l'ancien bit `longueur - 1`.
+    '''
+    if not longueur:
+        return 0
+    return int(format(valeur, f"0{longueur}b")[::-1], 2)
+
+class BitWriter:
+    ''' Écrit des codes de longueur variable dans un flux binaire.
+
+    Les bits sont accumulés dans un entier de la taille d'un mot machine puis
+    transférés par octets complets dans un `bytearray` réutilisé, lui-même
+    écrit dans la destination par grandes écritures. Si NumPy est disponible,
+    les grands blocs d'octets sont encodés par opérations vectorisées, avec un
+    résultat identique octet pour octet.
+
+    arguments:
+    - _destination: Flux binaire possédant une méthode `write` (ou None).
+    - _tampon (bytearray): Octets complets en attente d'écriture.
+    - _taille_tampon (int): Taille à partir de laquelle le tampon est écrit.
+    - _acc (int): Bits en attente (moins de `TAILLE_MOT`).
+    - _nb_bits (int): Nombre de bits dans `_acc`.
+    - _nb_octets_ecrits (int): Nombre d'octets déjà écrits dans la destination.
+    - _numpy (bool): Indique si l'encodage vectorisé est utilisé.
+    - _tables_numpy (tuple): Dernière table de codes et ses tableaux NumPy
+    (valeurs, longueurs), ou None pour les valeurs si la table ne s'y prête pas.
+    '''
+    def __init__(self, destination=None, taille_tampon: int = TAILLE_TAMPON,
+                 utiliser_numpy: bool = True):
+        ''' Initialise l'écrivain de bits.
+
+        params:
+        - destination (optionnel): Flux binaire de sortie. Sans destination, les
+        octets sont conservés et récupérables avec `valeur`.
+        - taille_tampon (int, optionnel): Taille des écritures dans la destination.
+        - utiliser_numpy (bool, optionnel): Encode les grands blocs avec NumPy s'il
+        est disponible.
+        '''
+        self._destination = destination
+        self._tampon = bytearray()
+        self._taille_tampon = taille_tampon
+        self._acc = 0
+        self._nb_bits = 0
+        self._nb_octets_ecrits = 0
+        self._numpy = utiliser_numpy and np is not None
+        self._tables_numpy = None
+
+    @property
+    def nb_bits_ecrits(self) -> int:
+        ''' Retourne le nombre total de bits écrits (remplissage final exclu).
+
+        returns:
+        - int: Nombre de bits.
+        '''
+        return 8 * (self._nb_octets_ecrits + len(self._tampon)) + self._nb_bits
+
+    def ecrire(self, valeur: int, longueur: int) -> None:
+        ''' Écrit les `longueur` bits de poids faible de `valeur`.
+
+        params:
+        - valeur (int): Bits à écrire, le premier bit écrit étant le poids faible.
+        - longueur (int): Nombre de bits à écrire.
+        '''
+        self._acc |= valeur << self._nb_bits
+        self._nb_bits += longueur
+        if self._nb_bits >= TAILLE_MOT:
+            self._transferer()
+
+    def ecrire_code(self, code) -> None:
+        ''' Écrit un CodeBinaire.
+
+        params:
+        - code (CodeBinaire): Code à écrire.
+        '''
+        self.ecrire(inverser_bits(code.valeur, len(code)), len(code))
+
+    def ecrire_octets(self, donnees, table) -> None:
+        ''' Encode un bloc d'octets à l'aide d'une table de codes.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets à encoder.
+        - table (list[tuple[int, int]]): Pour chaque octet, le couple
+        (valeur du code inversée avec `inverser_bits`, longueur du code).
+        '''
+        if (self._numpy and len(donnees) >= SEUIL_NUMPY
+                and self._ecrire_octets_numpy(donnees, table)):
+            return
+        acc = self._acc
+        nb_bits = self._nb_bits
+        tampon = self._tampon
+        for octet in donnees:
+            valeur, longueur = table[octet]
+            acc |= valeur << nb_bits
+            nb_bits += longueur
+            if nb_bits >= TAILLE_MOT:
+                nb_octets = nb_bits >> 3
+                tampon += (acc & ((1 << (nb_octets << 3)) - 1)).to_bytes(nb_octets, "little")
+                acc >>= nb_octets << 3
+                nb_bits &= 7
+        self._acc = acc
+        self._nb_bits = nb_bits
+        if len(tampon) >= self._taille_tampon:
+            self._ecrire_tampon()
+
+    def _ecrire_octets_numpy(self, donnees, table) -> bool:
+        ''' Encode un bloc d'octets par opérations vectorisées.
+
+        Chaque octet est remplacé par son code et sa longueur, la position de
+        chaque code est obtenue par somme cumulée des longueurs, puis les codes
+        sont combinés par OU dans des mots de 64 bits : la partie basse dans le
+        mot de début du code, la partie qui déborde dans le mot suivant.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets à encoder.
+        - table (list[tuple[int, int]]): Table de codes (voir `ecrire_octets`).
+
+        returns:
+        - bool: False si un code est trop long pour l'encodage vectorisé (rien
+        n'a alors été écrit).
+        '''
+        if self._tables_numpy is None or self._tables_numpy[0] is not table:
+            longueurs = np.array([longueur for _, longueur in table], dtype=np.uint64)
+            valeurs = None
+            if int(longueurs.max()) <= LONGUEUR_MAX_NUMPY:
+                valeurs = np.array([valeur for valeur, _ in table], dtype=np.uint64)
+            self._tables_numpy = (table, valeurs, longueurs)
+        _, valeurs, longueurs = self._tables_numpy
+        if valeurs is None:
+            return False
+
+        self._transferer()  # Il reste moins de 8 bits dans l'accumulateur
+        symboles = np.frombuffer(donnees, dtype=np.uint8)
+        codes = valeurs[symboles]
+        longueurs_codes = longueurs[symboles]
+        fins = np.cumsum(longueurs_codes) + np.uint64(self._nb_bits)
+        debuts = fins - longueurs_codes
+        nb_bits = int(fins[-1])
+        del symboles, fins
+
+        mots = np.zeros((nb_bits >> 6) + 2, dtype=np.uint64)
+        indices = debuts >> np.uint64(6)
+        decalages = debuts & np.uint64(63)
+        _ou_par_mot(mots, indices, codes << decalages)
+        debordements = np.flatnonzero(decalages + longueurs_codes > LONGUEUR_MAX_NUMPY)
+        if debordements.size:
+            _ou_par_mot(mots, indices[debordements] + np.uint64(1),
+                        codes[debordements] >> (np.uint64(64) - decalages[debordements]))
+        mots[0] |= np.uint64(self._acc)
+
+        octets = mots.astype("<u8", copy=False).tobytes()
+        nb_octets = nb_bits >> 3
+        self._tampon += octets[:nb_octets]
+        self._nb_bits = nb_bits & 7
+        self._acc = octets[nb_octets] & ((1 << self._nb_bits) - 1)
+        if self._destination is not None and len(self._tampon) >= self._taille_tampon:
+            self._ecrire_tampon()
+        return True
+
+    def aligner(self) -> int:
+        ''' Complète le dernier octet avec des bits à 0.
+
+        returns:
+        - int: Nombre de bits de remplissage ajoutés.
+        '''
+        remplissage = -self._nb_bits & 7
+        if remplissage:
+            self.ecrire(0, remplissage)
+        return remplissage
+
+    def vider(self) -> int:
+        ''' Aligne sur un octet puis écrit tous les octets en attente dans la destination.
+
+        returns:
+        - int: Nombre de bits de remplissage ajoutés.
+        '''
+        remplissage = self.aligner()
+        self._transferer()
+        if self._destination is not None:
+            self._ecrire_tampon()
+        return remplissage
+
+    def valeur(self) -> bytes:
+        ''' Retourne les octets complets produits sans destination.
+
+        returns:
+        - bytes: Octets écrits depuis la création (ou le dernier appel à `valeur`).
+        '''
+        self._transferer()
+        resultat = bytes(self._tampon)
+        self._nb_octets_ecrits += len(self._tampon)
+        self._tampon.clear()
+        return resultat
+
+    def _transferer(self) -> None:
+        ''' Transfère les octets complets de l'accumulateur dans le tampon. '''
+        nb_octets = self._nb_bits >> 3
+        if nb_octets:
+            self._tampon += (self._acc & ((1 << (nb_octets << 3)) - 1)).to_bytes(nb_octets,
+                                                                                "little")
+            self._acc >>= nb_octets << 3
+            self._nb_bits &= 7
+        if self._destination is not None and len(self._tampon) >= self._taille_tampon:
+            self._ecrire_tampon()
+
+    def _ecrire_tampon(self) -> None:
+        ''' Écrit le tampon dans la destination puis le vide. '''
+        if self._destination is not None and self._tampon:
+            self._destination.write(self._tampon)
+            self._nb_octets_ecrits += len(self._tampon)
+            self._tampon.clear()
+
+def _ou_par_mot(mots, indices, valeurs) -> None:
+    ''' Combine par OU des valeurs dans des mots, plusieurs valeurs pouvant
+    viser le même mot.
+
+    params:
+    - mots (numpy.ndarray): Mots de 64 bits à compléter.
+    - indices (numpy.ndarray): Indice du mot visé par chaque valeur, croissant.
+    - valeurs (numpy.ndarray): Valeurs à combiner.
+    '''
+    debuts = np.flatnonzero(np.concatenate(([True], indices[1:] != indices[:-1])))
+    mots[indices[debuts]] |= np.bitwise_or.reduceat(valeurs, debuts)
+
+class BitReader:
+    ''' Lit des codes de longueur variable depuis des octets (bit de poids faible en premier).
+
+    La source est soit un objet compatible avec le protocole buffer (lu sans
+    copie au travers d'une `memoryview`), soit un flux binaire rechargé par
+    grands blocs dans un tampon réutilisé.
+
+    arguments:
+    - _flux: Flux binaire source (None si la source est un buffer).
+    - _tampon (bytearray): Tampon de rechargement du flux.
+    - _donnees (memoryview): Octets disponibles en cours de lecture.
+    - _position (int): Position du prochain octet à charger dans `_donnees`.
+    - _acc (int): Bits chargés mais non consommés.
+    - _nb_bits (int): Nombre de bits dans `_acc`.
+    '''
+    def __init__(self, source, taille_tampon: int = TAILLE_TAMPON):
+        ''' Initialise le lecteur de bits.
+
+        params:
+        - source (bytes | bytearray | memoryview | flux binaire): Source des octets.
+        - taille_tampon (int, optionnel): Taille des lectures dans un flux.
+        '''
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._flux = None
+            self._tampon = None
+            self._donnees = memoryview(source).cast("B")
+        else:
+            self._flux = source
+            self._tampon = bytearray(taille_tampon)
+            self._donnees = memoryview(b"")
+        self._position = 0
+        self._acc = 0
+        self._nb_bits = 0
+
+    @property
+    def est_epuise(self) -> bool:
+        ''' Vérifie s'il ne reste plus aucun bit à lire.
+
+        returns:
+        - bool: True si tous les bits ont été consommés, False sinon.
+        '''
+        return not self._remplir(1)
+
+    def voir(self, longueur: int) -> int:
+        ''' Retourne les `longueur` prochains bits sans les consommer.
+
+        Si le flux contient moins de bits, les bits manquants valent 0.
+
+        params:
+        - longueur (int): Nombre de bits à observer.
+
+        returns:
+        - int: Valeur des bits, le premier bit étant le poids faible.
+        '''
+        self._remplir(longueur)
+        return self._acc & ((1 << longueur) - 1)
+
+    def consommer(self, longueur: int) -> None:
+        ''' Consomme des bits déjà observés avec `voir`.
+
+        params:
+        - longueur (int): Nombre de bits à consommer.
+
+        raises:
+        - FinDeFluxErreur: Levée si le flux contient moins de `longueur` bits.
+        '''
+        if not self._remplir(longueur):
+            raise FinDeFluxErreur("Fin du flux de bits atteinte")
+        self._nb_bits -= longueur
+        self._acc >>= longueur
+
+    def lire(self, longueur: int) -> int:
+        ''' Lit et consomme `longueur` bits.
+
+        params:
+        - longueur (int): Nombre de bits à lire.
+
+        returns:
+        - int: Valeur des bits, le premier bit lu étant le poids faible.
+
+        raises:
+        - FinDeFluxErreur: Levée si le flux contient moins de `longueur` bits.
+        '''
+        valeur = self.voir(longueur)
+        self.consommer(longueur)
+        return valeur
+
+    def aligner(self) -> None:
+        ''' Ignore les bits restants de l'octet en cours. '''
+        self.consommer(self._nb_bits & 7)
+
+    def lire_octets(self, nb_octets: int) -> bytes:
+        ''' Lit des octets bruts après alignement sur un octet.
+
+        params:
+        - nb_octets (int): Nombre d'octets à lire.
+
+        returns:
+        - bytes: Octets lus.
+
+        raises:
+        - FinDeFluxErreur: Levée si le flux contient moins de `nb_octets` octets.
+        '''
+        self.aligner()
+        morceaux = []
+        nb_deja_charges = min(nb_octets, self._nb_bits >> 3)
+        if nb_deja_charges:
+            morceaux.append(self.lire(8 * nb_deja_charges).to_bytes(nb_deja_charges, "little"))
+        manquant = nb_octets - nb_deja_charges
+        while manquant:
+            if self._position >= len(self._donnees) and not self._recharger():
+                raise FinDeFluxErreur("Fin du flux de bits atteinte")
+            fin = min(self._position + manquant, len(self._donnees))
+            morceaux.append(bytes(self._donnees[self._position:fin]))
+            manquant -= fin - self._position
+            self._position = fin
+        return b"".join(morceaux)
+
+    def _remplir(self, longueur: int) -> bool:
+        ''' Charge des octets dans l'accumulateur jusqu'à disposer de `longueur` bits.
+
+        params:
+        - longueur (int): Nombre de bits souhaités.
+
+        returns:
+        - bool: True si `longueur` bits sont disponibles, False si la source est épuisée.
+        '''
+        while self._nb_bits < longueur:
+            if self._position >= len(self._donnees) and not self._recharger():
+                return False
+            fin = min(self._position + TAILLE_MOT // 8, len(self._donnees))
+            self._acc |= (int.from_bytes(self._donnees[self._position:fin], "little")
+                          << self._nb_bits)
+            self._nb_bits += 8 * (fin - self._position)
+            self._position = fin
+        return True
+
+    def _recharger(self) -> bool:
+        ''' Recharge le tampon depuis le flux source.
+
+        returns:
+        - bool: True si de nouveaux octets sont disponibles, False sinon.
+        '''
+        if self._flux is None:
+            return False
+        if hasattr(self._flux, "readinto"):
+            nb_lus = self._flux.readinto(self._tampon)
+            self._donnees = memoryview(self._tampon)[:nb_lus or 0]
+        else:
+            self._donnees = memoryview(self._flux.read(len(self._tampon)) or b"")
+        self._position = 0
+        return len(self._donnees) > 0
+
+class FinDeFluxErreur(Exception):
+    ''' Exception levée lorsqu'on lit au-delà de la fin d'un flux de bits. '''
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+''' Module décrivant le format commun des données compressées : identifiant,
+modes, taille des champs de l'entête, lecture exacte d'un nombre d'octets et
+exceptions partagées par les modules de compression.
+
+Il n'importe aucun autre module du paquet : chaque mode de compression peut
+l'importer sans dépendre du module principal `compresseur`, qui peut à son
+tour importer tous les modes. '''
+import io
+
+IDENTIFIANT = b"42"
+MODE_OCCURRENCES = 2
+MODE_CANONIQUE = 3
+MODE_BLOCS = 4
+MODE_ADAPTATIF = 5
+MODE_DICTIONNAIRE = 6
+NB_OCTETS_CODAGE_INT = 4
+NB_OCTETS_TAILLE_LONGUEURS = 2
+# Nombre d'octets lus à la fois dans un flux à compresser
+TAILLE_BLOC_LECTURE = 1 << 16
+
+def lire_exactement(source: io.BufferedReader, nb_octets: int) -> bytes:
+    ''' Lit exactement un nombre d'octets d'un flux compressé, en plusieurs
+    lectures si le flux retourne moins d'octets que demandé.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - nb_octets (int): Nombre d'octets à lire.
+
+    returns:
+    - bytes: Les octets lus.
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux se termine avant.
+    '''
+    donnees = source.read(nb_octets)
+    if len(donnees) != nb_octets:
+        morceaux = [donnees]
+        manquant = nb_octets - len(donnees)
+        while manquant and (morceau := source.read(manquant)):
+            morceaux.append(morceau)
+            manquant -= len(morceau)
+        if manquant:
+            raise FormatInvalideErreur("Flux compressé tronqué")
+        donnees = b"".join(morceaux)
+    return donnees
+
+class FormatInvalideErreur(Exception):
+    """ Exception levée lorsqu'un flux à décompresser n'a pas le format attendu. """
+
+class CompteurVideErreur(Exception):
+    """ Exception levée lorsqu'on construit un arbre de Huffman à partir d'un compteur vide. """
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+''' Module proposant la classe LecteurIndexe, qui lit un intervalle quelconque
+d'un fichier compressé par blocs en ne décodant que les blocs concernés '''
+import io
+from bisect import bisect_right
+
+from huffman.blocs import (decoder_bloc, decoder_index, lire_entete_bloc, table_du_bloc,
+                           ENTETE_FLUX, TAILLE_ENTETE_BLOC, TYPE_FIN, TYPE_INDEX, TYPE_HUFFMAN,
+                           TYPE_HUFFMAN_MULTIFLUX, TYPE_HUFFMAN_TABLE_PRECEDENTE)
+from huffman.format_fichier import lire_exactement, FormatInvalideErreur, NB_OCTETS_TAILLE_LONGUEURS
+
+class LecteurIndexe(io.RawIOBase):
+    ''' Fichier en lecture seule donnant accès aux octets d'origine d'un fichier
+    compressé par blocs, avec `seek`, `read` et `readinto`.
+
+    Les positions des blocs sont lues dans le bloc d'index s'il existe, sinon
+    retrouvées en parcourant les seules entêtes des blocs. Seuls les blocs
+    contenant les octets lus sont décodés ; le dernier bloc décodé est conservé.
+    Pour des lectures aléatoires courtes, des blocs plus petits que `TAILLE_BLOC`
+    (64 Kio par exemple) réduisent le travail de décodage par lecture.
+
+    arguments:
+    - _fichier: Fichier compressé (binaire, positionnable).
+    - _positions_compressees (list[int]): Position de chaque bloc dans le fichier compressé.
+    - _positions_origine (list[int]): Position du premier octet de chaque bloc
+    dans les données d'origine.
+    - _taille (int): Nombre total d'octets d'origine.
+    - _position (int): Position de lecture dans les données d'origine.
+    - _bloc_courant (tuple[int, bytearray]): Numéro et contenu du dernier bloc décodé.
+    - _executeur (Executor): Exécuteur des sous-flux des blocs multi-flux, ou None.
+    - _tables (dict[int, bytes]): Pour chaque bloc déjà parcouru, la table du
+    dernier bloc qui en contient une jusqu'à lui (None si aucun).
+    '''
+    def __init__(self, fichier, executeur=None):
+        ''' Ouvre un fichier compressé par blocs.
+
+        params:
+        - fichier: Fichier compressé ouvert en lecture binaire et positionnable.
+        - executeur (Executor, optionnel): Exécuteur auquel confier les sous-flux
+        des blocs `TYPE_HUFFMAN_MULTIFLUX` (décodés à la suite sinon).
+
+        raises:
+        - FormatInvalideErreur: Levée si le fichier n'a pas le format attendu.
+        '''
+        super().__init__()
+        self._fichier = fichier
+        self._position = 0
+        self._bloc_courant = None
+        self._tables = {}
+        self._executeur = executeur
+        positions, self._taille = self._lire_index()
+        self._positions_compressees = [position for position, _ in positions]
+        self._positions_origine = [position for _, position in positions]
+        self._verifier_index()
+
+    @property
+    def taille(self) -> int:
+        ''' Retourne le nombre total d'octets d'origine.
+
+        returns:
+        - int: Nombre d'octets.
+        '''
+        return self._taille
+
+    def readable(self) -> bool:
+        ''' Indique que le fichier est lisible. '''
+        return True
+
+    def seekable(self) -> bool:
+        ''' Indique que le fichier est positionnable. '''
+        return True
+
+    def tell(self) -> int:
+        ''' Retourne la position de lecture dans les données d'origine.
+
+        returns:
+        - int: Position courante.
+        '''
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        ''' Déplace la position de lecture dans les données d'origine.
+
+        params:
+        - offset (int): Déplacement.
+        - whence (int, optionnel): `io.SEEK_SET`, `io.SEEK_CUR` ou `io.SEEK_END`.
+
+        returns:
+        - int: Nouvelle position.
+
+        raises:
+        - ValueError: Levée si la position obtenue est négative ou `whence` invalide.
+        '''
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._taille + offset
+        else:
+            raise ValueError(f"whence invalide : {whence}")
+        if position < 0:
+            raise ValueError(f"Position négative : {position}")
+        self._position = position
+        return position
+
+    def readinto(self, tampon) -> int:
+        ''' Lit des octets d'origine dans un tampon, sans dépasser la fin du bloc courant.
+
+        params:
+        - tampon (bytearray | memoryview): Tampon à remplir.
+
+        returns:
+        - int: Nombre d'octets lus (0 à la fin des données).
+        '''
+        if self._position >= self._taille:
+            return 0
+        numero = bisect_right(self._positions_origine, self._position) - 1
+        bloc = self._bloc(numero)
+        debut = self._position - self._positions_origine[numero]
+        vue = memoryview(tampon).cast("B")
+        nb_octets = min(len(vue), len(bloc) - debut)
+        vue[:nb_octets] = bloc[debut:debut + nb_octets]
+        self._position += nb_octets
+        return nb_octets
+
+    def read(self, size: int = -1) -> bytes:
+        ''' Lit jusqu'à `size` octets d'origine (tous les octets restants si `size` < 0).
+
+        params:
+        - size (int, optionnel): Nombre maximal d'octets à lire.
+
+        returns:
+        - bytes: Octets lus (moins de `size` uniquement à la fin des données).
+
+        raises:
+        - FormatInvalideErreur: Levée si les blocs contiennent moins d'octets que
+        le total annoncé.
+        '''
+        restant = max(self._taille - self._position, 0)
+        if size is None or size < 0 or size > restant:
+            size = restant
+        resultat = bytearray(size)
+        vue = memoryview(resultat)
+        lus = 0
+        while lus < size:
+            nb_octets = self.readinto(vue[lus:])
+            if not nb_octets:
+                raise FormatInvalideErreur("Données d'origine plus courtes que le total annoncé")
+            lus += nb_octets
+        return bytes(resultat)
+
+    def _taille_bloc(self, numero: int) -> int:
+        ''' Retourne le nombre d'octets d'origine d'un bloc d'après l'index.
+
+        params:
+        - numero (int): Numéro du bloc.
+
+        returns:
+        - int: Nombre d'octets.
+        '''
+        if numero + 1 < len(self._positions_origine):
+            return self._positions_origine[numero + 1] - self._positions_origine[numero]
+        return self._taille - self._positions_origine[numero]
+
+    def _bloc(self, numero: int) -> bytearray:
+        ''' Retourne le contenu d'origine d'un bloc, en le décodant si nécessaire.
+
+        params:
+        - numero (int): Numéro du bloc.
+
+        returns:
+        - bytearray: Octets d'origine du bloc.
+
+        raises:
+        - FormatInvalideErreur: Levée si le bloc est invalide.
+        '''
+        if self._bloc_courant is None or self._bloc_courant[0] != numero:
+            self._fichier.seek(self._positions_compressees[numero])
+            type_bloc, taille, taille_corps = lire_entete_bloc(
+                lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+            if taille != self._taille_bloc(numero):
+                raise FormatInvalideErreur(f"Taille du bloc {numero} incohérente avec l'index")
+            corps = lire_exactement(self._fichier, taille_corps)
+            table = None
+            if type_bloc == TYPE_HUFFMAN_TABLE_PRECEDENTE:
+                table = self._table_precedente(numero)
+            self._bloc_courant = (numero, decoder_bloc(type_bloc, taille, corps,
+                                                       executeur=self._executeur,
+                                                       table_precedente=table))
+        return self._bloc_courant[1]
+
+    def _table_precedente(self, numero: int) -> bytes:
+        ''' Retrouve la table du dernier bloc qui en contient une avant un bloc,
+        en ne lisant que le début de chaque bloc parcouru. La table trouvée est
+        retenue pour tous les blocs parcourus : une longue suite de blocs sans
+        table n'est parcourue qu'une fois, quel que soit l'ordre des lectures.
+
+        params:
+        - numero (int): Numéro du bloc sans table.
+
+        returns:
+        - bytes: Longueurs des codes encodées, ou None si aucun bloc n'en contient.
+
+        raises:
+        - FormatInvalideErreur: Levée si un bloc est tronqué.
+        '''
+        parcourus = []
+        table = None
+        for precedent in range(numero - 1, -1, -1):
+            if precedent in self._tables:
+                table = self._tables[precedent]
+                break
+            parcourus.append(precedent)
+            self._fichier.seek(self._positions_compressees[precedent])
+            type_bloc, _, _ = lire_entete_bloc(lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+            if type_bloc not in (TYPE_HUFFMAN, TYPE_HUFFMAN_MULTIFLUX):
+                continue
+            debut = lire_exactement(self._fichier, NB_OCTETS_TAILLE_LONGUEURS)
+            nb_octets = int.from_bytes(debut, byteorder="big")
+            table = table_du_bloc(type_bloc, debut + lire_exactement(self._fichier, nb_octets))
+            break
+        for precedent in parcourus:
+            self._tables[precedent] = table
+        return table
+
+    def _verifier_index(self) -> None:
+        ''' Vérifie que les positions lues dans le bloc d'index sont croissantes,
+        que le premier bloc suit l'entête du flux et que le total annoncé est
+        celui du dernier bloc.
+
+        raises:
+        - FormatInvalideErreur: Levée si l'index est incohérent.
+        '''
+        compressees, origine = self._positions_compressees, self._positions_origine
+        if not compressees:
+            if self._taille:
+                raise FormatInvalideErreur("Index sans bloc pour des données non vides")
+            return
+        if compressees[0] != len(ENTETE_FLUX) or origine[0] != 0:
+            raise FormatInvalideErreur("Le premier bloc de l'index ne suit pas l'entête")
+        for numero in range(1, len(compressees)):
+            if (compressees[numero] <= compressees[numero - 1]
+                    or origine[numero] < origine[numero - 1]):
+                raise FormatInvalideErreur("Positions de l'index non croissantes")
+        dernier = len(compressees) - 1
+        if self._taille < origine[dernier]:
+            raise FormatInvalideErreur("Total de l'index inférieur à la position du dernier bloc")
+        self._fichier.seek(compressees[dernier])
+        type_bloc, taille, _ = lire_entete_bloc(lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+        if type_bloc in (TYPE_FIN, TYPE_INDEX) or taille != self._taille_bloc(dernier):
+            raise FormatInvalideErreur("Total de l'index incohérent avec le dernier bloc")
+
+    def _lire_index(self) -> (list, int):
+        ''' Retrouve la position de chaque bloc, depuis le bloc d'index ou à défaut
+        en parcourant les entêtes des blocs.
+
+        returns:
+        - (list[tuple[int, int]], int): Positions compressée et d'origine de chaque
+        bloc, et nombre total d'octets d'origine.
+
+        raises:
+        - FormatInvalideErreur: Levée si le fichier n'a pas le format attendu.
+        '''
+        fin = self._fichier.seek(0, io.SEEK_END)
+        if fin < len(ENTETE_FLUX) + TAILLE_ENTETE_BLOC:
+            raise FormatInvalideErreur("Fichier compressé tronqué")
+        self._fichier.seek(fin - TAILLE_ENTETE_BLOC)
+        type_bloc, taille_index, _ = lire_entete_bloc(
+            lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+        if type_bloc != TYPE_FIN:
+            raise FormatInvalideErreur("Bloc de fin absent")
+        if taille_index:
+            self._fichier.seek(fin - TAILLE_ENTETE_BLOC - taille_index)
+            type_bloc, _, taille_corps = lire_entete_bloc(
+                lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+            if type_bloc != TYPE_INDEX:
+                raise FormatInvalideErreur("Bloc d'index absent")
+            return decoder_index(lire_exactement(self._fichier, taille_corps))
+
+        self._fichier.seek(0)
+        if lire_exactement(self._fichier, len(ENTETE_FLUX)) != ENTETE_FLUX:
+            raise FormatInvalideErreur("Entête de flux compressé invalide")
+        positions = []
+        position, taille_origine = len(ENTETE_FLUX), 0
+        while True:
+            type_bloc, taille, taille_corps = lire_entete_bloc(
+                lire_exactement(self._fichier, TAILLE_ENTETE_BLOC))
+            if type_bloc == TYPE_FIN:
+                return positions, taille_origine
+            if type_bloc != TYPE_INDEX:
+                positions.append((position, taille_origine))
+                taille_origine += taille
+            position = self._fichier.seek(taille_corps, io.SEEK_CUR)
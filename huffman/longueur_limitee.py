@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+''' Module proposant la construction de codes de Huffman de longueur limitée
+(algorithme package-merge) '''
+from typing import Dict, TypeVar
+
+from huffman.arbre_huffman import ArbreHuffman
+from huffman.canonique import codes_canoniques
+
+T = TypeVar('T')
+
+def longueurs_package_merge(poids: Dict[T, int], max_bits: int) -> Dict[T, int]:
+    ''' Calcule des longueurs de codes optimales sous la contrainte `max_bits`.
+
+    Chaque élément est une « pièce » de largeur 2^-l pour chaque l de 1 à
+    `max_bits`. À chaque niveau, les pièces les plus légères sont regroupées
+    par paires (package) puis fusionnées avec les pièces d'origine (merge).
+    Les 2n - 2 pièces les plus légères du dernier niveau forment la solution :
+    la longueur du code d'un élément est le nombre de pièces qui le contiennent.
+
+    params:
+    - poids (dict[T, int]): Nombre d'occurrences de chaque élément.
+    - max_bits (int): Longueur maximale d'un code.
+
+    returns:
+    - dict[T, int]: Longueur du code de chaque élément.
+
+    raises:
+    - LongueurMaxInsuffisanteErreur: Levée si `max_bits` bits ne suffisent
+    pas à coder tous les éléments.
+    '''
+    elements = sorted(poids, key=lambda element: poids[element])
+    nb_elements = len(elements)
+    if nb_elements == 0:
+        return {}
+    if nb_elements == 1:
+        return {elements[0]: 1}
+    if max_bits < 1 or 1 << max_bits < nb_elements:
+        raise LongueurMaxInsuffisanteErreur(
+            f"{nb_elements} éléments ne peuvent pas être codés sur {max_bits} bits")
+
+    # Une pièce est un couple (poids, indices des éléments qu'elle contient)
+    pieces_origine = [(poids[element], (indice,)) for indice, element in enumerate(elements)]
+    pieces = pieces_origine
+    for _ in range(max_bits - 1):
+        paquets = [(pieces[i][0] + pieces[i + 1][0], pieces[i][1] + pieces[i + 1][1])
+                   for i in range(0, len(pieces) - 1, 2)]
+        pieces = _fusionner(pieces_origine, paquets)
+
+    longueurs = [0] * nb_elements
+    for _, indices in pieces[:2 * nb_elements - 2]:
+        for indice in indices:
+            longueurs[indice] += 1
+    return {element: longueurs[indice] for indice, element in enumerate(elements)}
+
+def arbre_depuis_longueurs(poids: Dict[T, int], longueurs: Dict[T, int]) -> ArbreHuffman:
+    ''' Construit l'arbre du code canonique correspondant à des longueurs de codes.
+
+    params:
+    - poids (dict[T, int]): Nombre d'occurrences de chaque élément.
+    - longueurs (dict[T, int]): Longueur du code de chaque élément.
+
+    returns:
+    - ArbreHuffman: Arbre dont chaque feuille est à la profondeur de son code.
+
+    raises:
+    - LongueursIncompletesErreur: Levée si les longueurs ne forment pas un code complet.
+    '''
+    codes = codes_canoniques(longueurs)
+    if len(codes) == 1:
+        element = next(iter(codes))
+        return ArbreHuffman(element, poids[element])
+
+    # Noeuds de la profondeur courante, indexés par la valeur de leur code
+    profondeur = max(longueurs.values())
+    noeuds = {}
+    while profondeur > 0:
+        for element, code in codes.items():
+            if len(code) == profondeur:
+                noeuds[code.valeur] = ArbreHuffman(element, poids[element])
+        parents = {}
+        for valeur, noeud in noeuds.items():
+            if valeur & 1:
+                continue
+            if valeur + 1 not in noeuds:
+                raise LongueursIncompletesErreur("Les longueurs ne forment pas un code complet")
+            parents[valeur >> 1] = noeud + noeuds[valeur + 1]
+        if len(parents) * 2 != len(noeuds):
+            raise LongueursIncompletesErreur("Les longueurs ne forment pas un code complet")
+        noeuds = parents
+        profondeur -= 1
+    return noeuds[0]
+
+def cout(poids: Dict[T, int], longueurs: Dict[T, int]) -> int:
+    ''' Retourne le nombre de bits nécessaires pour coder les occurrences.
+
+    params:
+    - poids (dict[T, int]): Nombre d'occurrences de chaque élément.
+    - longueurs (dict[T, int]): Longueur du code de chaque élément.
+
+    returns:
+    - int: Somme des occurrences multipliées par la longueur de leur code.
+    '''
+    return sum(nb * longueurs[element] for element, nb in poids.items())
+
+def _fusionner(pieces_origine, paquets):
+    ''' Fusionne deux listes de pièces triées par poids ; à poids égal, les
+    pièces d'origine sont placées en premier.
+
+    params:
+    - pieces_origine (list[tuple]): Pièces d'origine triées.
+    - paquets (list[tuple]): Paquets triés.
+
+    returns:
+    - list[tuple]: Pièces triées par poids.
+    '''
+    resultat = []
+    i = j = 0
+    while i < len(pieces_origine) and j < len(paquets):
+        if paquets[j][0] < pieces_origine[i][0]:
+            resultat.append(paquets[j])
+            j += 1
+        else:
+            resultat.append(pieces_origine[i])
+            i += 1
+    resultat.extend(pieces_origine[i:])
+    resultat.extend(paquets[j:])
+    return resultat
+
+class LongueurMaxInsuffisanteErreur(Exception):
+    ''' Exception levée lorsque la longueur maximale demandée ne permet pas
+    de coder tous les éléments. '''
+
+class LongueursIncompletesErreur(Exception):
+    ''' Exception levée lorsque des longueurs de codes ne forment pas un code complet. '''
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+''' Module proposant la compression et la décompression d'un lot de tampons
+indépendants en un seul appel.
+
+Chaque tampon compressé est un fichier compressé complet, identique à celui
+produit par `compresseur.compresser` (avec une table commune, à celui produit
+avec le compteur de tout le lot) et lisible par `compresseur.decompresser`.
+Les tampons sont traités en mémoire, sans flux intermédiaire, et répartis
+sur un ensemble de fils d'exécution (utile avec NumPy, qui libère le verrou
+global de l'interpréteur) ou de processus (en Python pur) ; les résultats
+sont retournés dans l'ordre des tampons. '''
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from huffman.codec import Codec, codec_pour
+from huffman.compresseur import decompresser, ecrire_entete, ecrire_entete_canonique
+from huffman.compteur_octets import CompteurOctets
+from huffman.flux_binaire import BitWriter
+
+# Nombre de paquets de tampons confiés à chaque travailleur : des paquets plus
+# petits équilibrent mieux la charge, des paquets plus grands amortissent
+# mieux les échanges entre processus.
+PAQUETS_PAR_TRAVAILLEUR = 4
+
+def compresser_plusieurs(tampons: Iterable[bytes], nb_travailleurs: int = None,
+                         processus: bool = None, executeur: Executor = None,
+                         table_commune: bool = False, canonique: bool = None,
+                         max_bits: int = None) -> List[bytes]:
+    ''' Compresse un lot de tampons indépendants.
+
+    params:
+    - tampons (Iterable[bytes]): Tampons à compresser.
+    - nb_travailleurs (int, optionnel): Nombre de fils ou de processus (par défaut,
+    le nombre de cœurs) ; avec 1, les tampons sont compressés dans l'appelant.
+    - processus (bool, optionnel): Utilise des processus plutôt que des fils
+    d'exécution (par défaut, seulement si NumPy est absent).
+    - executeur (Executor, optionnel): Exécuteur à utiliser à la place d'un
+    exécuteur créé pour l'appel.
+    - table_commune (bool, optionnel): Compresse tous les tampons avec une seule
+    table, construite à partir du compteur de tout le lot.
+    - canonique (bool, optionnel): Écrit seulement les longueurs des codes dans l'entête
+    (par défaut, seulement avec une table commune). Chaque tampon restant un fichier
+    complet, la table est répétée dans chacun : les 1 024 octets d'occurrences du mode
+    non canonique pèsent alors sur chaque tampon, contre quelques dizaines d'octets
+    de longueurs en mode canonique.
+    - max_bits (int, optionnel): Longueur maximale des codes (mode canonique).
+
+    returns:
+    - list[bytes]: Tampons compressés, dans l'ordre des tampons.
+
+    raises:
+    - ValueError: Levée si `max_bits` est donné hors du mode canonique.
+    '''
+    if canonique is None:
+        canonique = table_commune
+    if max_bits is not None and not canonique:
+        raise ValueError("La longueur des codes ne peut être limitée qu'en mode canonique")
+    tampons = list(tampons)
+    codec = None
+    if table_commune:
+        stat = CompteurOctets()
+        for tampon in tampons:
+            stat.ajouter_octets(tampon)
+        if stat.elements:
+            codec = codec_pour(stat, canonique, max_bits)
+    fonction = partial(compresser_tampon, codec=codec, canonique=canonique, max_bits=max_bits)
+    return _appliquer(fonction, tampons, nb_travailleurs, processus, executeur)
+
+def decompresser_plusieurs(tampons: Iterable[bytes], nb_travailleurs: int = None,
+                           processus: bool = None, executeur: Executor = None) -> List[bytes]:
+    ''' Décompresse un lot de tampons compressés.
+
+    params:
+    - tampons (Iterable[bytes]): Tampons compressés.
+    - nb_travailleurs (int, optionnel): Nombre de fils ou de processus.
+    - processus (bool, optionnel): Utilise des processus plutôt que des fils d'exécution.
+    - executeur (Executor, optionnel): Exécuteur à utiliser.
+
+    returns:
+    - list[bytes]: Tampons décompressés, dans l'ordre des tampons.
+
+    raises:
+    - FormatInvalideErreur: Levée si un tampon n'a pas le format attendu.
+    '''
+    return _appliquer(decompresser_tampon, list(tampons), nb_travailleurs, processus,
+                      executeur)
+
+def compresser_tampon(donnees, codec: Codec = None, canonique: bool = False,
+                      max_bits: int = None) -> bytes:
+    ''' Compresse un tampon en mémoire, comme `compresseur.compresser`.
+
+    params:
+    - donnees (bytes | bytearray | memoryview): Octets à compresser.
+    - codec (Codec, optionnel): Codec à utiliser, dont la table doit contenir un
+    code pour chaque octet des données ; par défaut, celui du compteur des données.
+    - canonique (bool, optionnel): Écrit seulement les longueurs des codes dans l'entête.
+    - max_bits (int, optionnel): Longueur maximale des codes (mode canonique).
+
+    returns:
+    - bytes: Tampon compressé.
+
+    raises:
+    - ValueError: Levée si le codec n'a pas de code pour un octet des données.
+    '''
+    taille = len(donnees)
+    if codec is None:
+        stat = CompteurOctets()
+        stat.ajouter_octets(donnees)
+        if not taille:
+            entete = io.BytesIO()
+            if canonique:
+                ecrire_entete_canonique(entete, {}, taille)
+            else:
+                ecrire_entete(entete, stat, taille)
+            return entete.getvalue()
+        codec = codec_pour(stat, canonique, max_bits)
+    else:
+        sans_code = bytes(octet for octet, (_, longueur) in enumerate(codec.table)
+                          if not longueur)
+        if sans_code and len(bytes(donnees).translate(None, sans_code)) != taille:
+            raise ValueError("Le codec n'a pas de code pour un octet des données")
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(donnees, codec.table)
+    ecrivain.vider()
+    return codec.entete(taille) + ecrivain.valeur()
+
+def decompresser_tampon(compresse) -> bytes:
+    ''' Décompresse en mémoire un tampon produit par `compresser_tampon`.
+
+    params:
+    - compresse (bytes | bytearray | memoryview): Tampon compressé.
+
+    returns:
+    - bytes: Octets d'origine.
+
+    raises:
+    - FormatInvalideErreur: Levée si le tampon n'a pas le format attendu.
+    '''
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(compresse), destination)
+    return destination.getvalue()
+
+def _appliquer(fonction, tampons: list, nb_travailleurs: int = None, processus: bool = None,
+               executeur: Executor = None) -> list:
+    ''' Applique une fonction à chaque tampon, dans l'appelant ou dans un exécuteur.
+
+    params:
+    - fonction (function): Fonction à appliquer (sérialisable pour des processus).
+    - tampons (list): Tampons.
+    - nb_travailleurs (int, optionnel): Nombre de fils ou de processus.
+    - processus (bool, optionnel): Utilise des processus plutôt que des fils d'exécution.
+    - executeur (Executor, optionnel): Exécuteur à utiliser.
+
+    returns:
+    - list: Résultats, dans l'ordre des tampons.
+    '''
+    nb_travailleurs = nb_travailleurs or os.cpu_count() or 1
+    taille_paquet = max(1, len(tampons) // (PAQUETS_PAR_TRAVAILLEUR * nb_travailleurs))
+    if executeur is not None:
+        return list(executeur.map(fonction, tampons, chunksize=taille_paquet))
+    if nb_travailleurs == 1 or len(tampons) <= 1:
+        return [fonction(tampon) for tampon in tampons]
+    if processus is None:
+        processus = np is None
+    if processus:
+        with ProcessPoolExecutor(max_workers=nb_travailleurs) as executeur_cree:
+            return list(executeur_cree.map(fonction, tampons, chunksize=taille_paquet))
+    with ThreadPoolExecutor(max_workers=nb_travailleurs) as executeur_cree:
+        return list(executeur_cree.map(fonction, tampons))
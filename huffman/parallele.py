@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+''' Module proposant la compression et la décompression parallèles d'un flux
+découpé en blocs indépendants (voir le module `blocs`).
+
+Chaque bloc ayant son propre compteur, sa propre table de codes et sa propre
+charge utile, les blocs sont traités par un ensemble de processus puis écrits
+dans leur ordre d'origine : le résultat est identique à celui de
+`flux.compresser_flux` avec la même taille de blocs.
+
+`statistiques_parallele` compte de même les octets d'un fichier sur disque
+par plages lues en parallèle, puis additionne les compteurs obtenus. '''
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from huffman.blocs import (encoder_bloc, decoder_bloc, lire_blocs, bloc_fin, encoder_index,
+                           table_du_bloc, verifier_nb_flux, ENTETE_FLUX, SEUIL_BRUT, TAILLE_BLOC,
+                           TYPE_HUFFMAN_TABLE_PRECEDENTE)
+from huffman.compteur_octets import CompteurOctets
+from huffman.format_fichier import TAILLE_BLOC_LECTURE
+
+# Nombre de blocs en cours de traitement par processus
+BLOCS_EN_VOL_PAR_PROCESSUS = 2
+# Nombre de plages comptées par processus : plusieurs plages par processus
+# équilibrent la charge si certains disques ou cœurs sont plus lents
+PLAGES_PAR_PROCESSUS = 4
+
+def compresser_parallele(source: io.RawIOBase, destination: io.RawIOBase,
+                         taille_bloc: int = TAILLE_BLOC, nb_processus: int = None,
+                         max_bits: int = None, index: bool = False,
+                         nb_flux: int = 1, seuil_brut: float = SEUIL_BRUT) -> None:
+    ''' Compresse une source en répartissant ses blocs sur plusieurs processus.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - taille_bloc (int, optionnel): Nombre d'octets d'origine par bloc.
+    - nb_processus (int, optionnel): Nombre de processus (par défaut, le nombre de cœurs).
+    - max_bits (int, optionnel): Longueur maximale des codes.
+    - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+    - nb_flux (int, optionnel): Nombre de sous-flux de la charge utile de chaque bloc.
+    - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle un
+    bloc est écrit sans codage (0 pour toujours coder).
+    '''
+    verifier_nb_flux(nb_flux)
+    tailles = []
+    def blocs():
+        while (bloc := _lire_bloc(source, taille_bloc)):
+            tailles.append(len(bloc))
+            yield (bloc, max_bits, nb_flux, seuil_brut)
+
+    destination.write(ENTETE_FLUX)
+    positions = []
+    position, taille_origine = len(ENTETE_FLUX), 0
+    for numero, bloc_compresse in enumerate(_traiter_dans_l_ordre(encoder_bloc, blocs(),
+                                                                  nb_processus)):
+        destination.write(bloc_compresse)
+        positions.append((position, taille_origine))
+        position += len(bloc_compresse)
+        taille_origine += tailles[numero]
+    if index:
+        bloc_index = encoder_index(positions, taille_origine)
+        destination.write(bloc_index)
+        destination.write(bloc_fin(len(bloc_index)))
+    else:
+        destination.write(bloc_fin())
+
+def decompresser_parallele(source: io.RawIOBase, destination: io.RawIOBase,
+                           nb_processus: int = None) -> None:
+    ''' Décompresse un flux découpé en blocs en répartissant les blocs sur plusieurs processus.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - nb_processus (int, optionnel): Nombre de processus (par défaut, le nombre de cœurs).
+
+    raises:
+    - FormatInvalideErreur: Levée si le flux est tronqué ou n'a pas le format attendu.
+    '''
+    def blocs():
+        # Un bloc sans table est envoyé avec la table du dernier bloc qui en contient une
+        table = None
+        for type_bloc, taille, corps in lire_blocs(source):
+            if type_bloc == TYPE_HUFFMAN_TABLE_PRECEDENTE:
+                yield (type_bloc, taille, corps, None, table)
+            else:
+                yield (type_bloc, taille, corps)
+                table = table_du_bloc(type_bloc, corps) or table
+
+    for bloc in _traiter_dans_l_ordre(decoder_bloc, blocs(), nb_processus):
+        destination.write(bloc)
+
+def statistiques_parallele(chemin: str, nb_processus: int = None,
+                           taille_plage: int = None) -> (CompteurOctets, int):
+    ''' Compte les octets d'un fichier en répartissant des plages du fichier
+    sur plusieurs processus, puis additionne les compteurs des plages.
+
+    params:
+    - chemin (str): Chemin du fichier.
+    - nb_processus (int, optionnel): Nombre de processus (par défaut, le nombre de cœurs).
+    - taille_plage (int, optionnel): Nombre d'octets par plage (par défaut,
+    `PLAGES_PAR_PROCESSUS` plages par processus).
+
+    returns:
+    - (CompteurOctets, int): Occurrences des octets et taille du fichier.
+    '''
+    nb_processus = nb_processus or os.cpu_count() or 1
+    taille = os.path.getsize(chemin)
+    if taille_plage is None:
+        taille_plage = max(TAILLE_BLOC_LECTURE,
+                           -(-taille // (PLAGES_PAR_PROCESSUS * nb_processus)))
+    if taille_plage <= 0:
+        raise ValueError("La taille d'une plage doit être positive")
+    plages = ((chemin, debut, min(debut + taille_plage, taille))
+              for debut in range(0, taille, taille_plage))
+    return CompteurOctets.fusionner(_traiter_dans_l_ordre(_compter_plage, plages,
+                                                          nb_processus)), taille
+
+def _lire_bloc(source: io.RawIOBase, taille_bloc: int) -> bytes:
+    ''' Lit un bloc complet, en plusieurs lectures si la source (tube, socket...)
+    retourne moins d'octets que demandé, ou les derniers octets de la source.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - taille_bloc (int): Nombre d'octets d'un bloc.
+
+    returns:
+    - bytes: Octets lus (moins de `taille_bloc` uniquement à la fin de la source).
+    '''
+    bloc = source.read(taille_bloc)
+    if bloc and len(bloc) < taille_bloc:
+        morceaux = [bloc]
+        manquant = taille_bloc - len(bloc)
+        while manquant and (morceau := source.read(manquant)):
+            morceaux.append(morceau)
+            manquant -= len(morceau)
+        bloc = b"".join(morceaux)
+    return bloc
+
+def _compter_plage(chemin: str, debut: int, fin: int) -> CompteurOctets:
+    ''' Compte les octets d'une plage d'un fichier.
+
+    params:
+    - chemin (str): Chemin du fichier.
+    - debut (int): Position du premier octet de la plage.
+    - fin (int): Position qui suit le dernier octet de la plage.
+
+    returns:
+    - CompteurOctets: Occurrences des octets de la plage.
+    '''
+    compteur = CompteurOctets()
+    tampon = bytearray(min(TAILLE_BLOC_LECTURE, fin - debut))
+    with open(chemin, "rb", buffering=0) as fichier, memoryview(tampon) as vue:
+        fichier.seek(debut)
+        restant = fin - debut
+        while restant and (nb_octets := fichier.readinto(vue[:min(restant, len(vue))])):
+            with vue[:nb_octets] as bloc:
+                compteur.ajouter_octets(bloc)
+            restant -= nb_octets
+    return compteur
+
+def _traiter_dans_l_ordre(fonction, arguments, nb_processus: int = None):
+    ''' Applique une fonction à une suite d'arguments dans un ensemble de processus
+    et retourne les résultats dans l'ordre des arguments.
+
+    Le nombre de tâches soumises et non consommées est borné, ce qui borne la
+    mémoire utilisée quelle que soit la longueur de la suite.
+
+    params:
+    - fonction (function): Fonction à appliquer (définie au niveau d'un module).
+    - arguments (Iterable[tuple]): Arguments de chaque appel.
+    - nb_processus (int, optionnel): Nombre de processus.
+
+    returns:
+    - Iterator: Résultats dans l'ordre des arguments.
+    '''
+    nb_processus = nb_processus or os.cpu_count() or 1
+    en_vol = deque()
+    with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+        for args in arguments:
+            en_vol.append(executeur.submit(fonction, *args))
+            if len(en_vol) >= BLOCS_EN_VOL_PAR_PROCESSUS * nb_processus:
+                yield en_vol.popleft().result()
+        while en_vol:
+            yield en_vol.popleft().result()
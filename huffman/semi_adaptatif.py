@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+''' Module proposant une compression semi-adaptative : la table de codes est
+conservée d'un bloc à l'autre et reconstruite seulement lorsque les
+statistiques des données ont dérivé.
+
+Pour chaque fenêtre (bloc) de données, le coût du codage avec la table
+courante est comparé à l'entropie de la fenêtre. L'écart, en bits par
+octet, est comparé à celui mesuré lors de la construction de la table (la
+redondance propre du code de Huffman) : au-delà du seuil, ou si un octet n'a
+pas de code, une nouvelle table est construite et écrite dans un bloc
+`TYPE_HUFFMAN` qui marque le changement de table. Sinon, le bloc est un bloc
+`TYPE_HUFFMAN_TABLE_PRECEDENTE` sans table. Une fenêtre dont l'économie
+estimée est trop faible est écrite dans un bloc `TYPE_BRUT`, sans changer
+la table courante. Le flux produit se décompresse avec
+`flux.decompresser_flux`. '''
+import io
+
+from huffman.blocs import (codes_du_bloc, economie_estimee, encoder_bloc_brut, encoder_bloc_codes,
+                           SEUIL_BRUT)
+from huffman.canonique import longueurs_codes
+from huffman.codage import entropie
+from huffman.compteur_octets import CompteurOctets
+from huffman.flux import CompresseurFlux, TAILLE_LECTURE
+
+TAILLE_FENETRE = 1 << 16
+# Écart toléré, en bits par octet, avant de reconstruire la table
+SEUIL_DERIVE = 0.05
+
+class CompresseurSemiAdaptatif(CompresseurFlux):
+    ''' Compresse un flux d'octets fourni morceau par morceau en ne changeant
+    de table que lorsque les statistiques dérivent.
+
+    arguments:
+    - _seuil (float): Écart toléré en bits par octet.
+    - _codes (dict[int, CodeBinaire]): Codes de la table courante.
+    - _longueurs (dict[int, int]): Longueur du code de chaque octet de la table courante.
+    - _redondance (float): Écart en bits par octet mesuré à la construction de la table.
+    - _nb_tables (int): Nombre de tables construites.
+    '''
+    def __init__(self, taille_fenetre: int = TAILLE_FENETRE, seuil: float = SEUIL_DERIVE,
+                 index: bool = False, seuil_brut: float = SEUIL_BRUT):
+        ''' Initialise le compresseur.
+
+        params:
+        - taille_fenetre (int, optionnel): Nombre d'octets d'origine par bloc,
+        sur lesquels la dérive est mesurée.
+        - seuil (float, optionnel): Écart toléré, en bits par octet.
+        - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+        - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle
+        une fenêtre est écrite sans codage (0 pour toujours coder).
+        '''
+        super().__init__(taille_fenetre, index=index, seuil_brut=seuil_brut)
+        self._seuil = seuil
+        self._codes = None
+        self._longueurs = None
+        self._redondance = 0.0
+        self._nb_tables = 0
+
+    @property
+    def nb_tables(self) -> int:
+        ''' Retourne le nombre de tables construites depuis le début du flux.
+
+        returns:
+        - int: Nombre de tables.
+        '''
+        return self._nb_tables
+
+    def _compresser_bloc(self, donnees) -> bytes:
+        ''' Compresse un bloc avec la table courante, ou avec une nouvelle table
+        si les statistiques de la fenêtre ont dérivé.
+
+        params:
+        - donnees (bytes | bytearray | memoryview): Octets du bloc.
+
+        returns:
+        - bytes: Bloc compressé.
+        '''
+        stat = CompteurOctets()
+        stat.ajouter_octets(donnees)
+        nb_octets = len(donnees)
+        if economie_estimee(stat, nb_octets) < self._seuil_brut:
+            return encoder_bloc_brut(donnees)
+        minimum = entropie(stat)
+        if self._codes is not None:
+            longueurs = self._longueurs
+            if all(octet in longueurs for octet in stat.elements):
+                cout = sum(stat.nb_occurrences(octet) * longueurs[octet]
+                           for octet in stat.elements)
+                if (cout - minimum) / nb_octets - self._redondance <= self._seuil:
+                    return encoder_bloc_codes(donnees, self._codes, table_precedente=True)
+
+        self._codes = codes_du_bloc(stat)
+        self._longueurs = longueurs_codes(self._codes)
+        cout = sum(stat.nb_occurrences(octet) * self._longueurs[octet]
+                   for octet in stat.elements)
+        self._redondance = (cout - minimum) / nb_octets
+        self._nb_tables += 1
+        return encoder_bloc_codes(donnees, self._codes)
+
+def compresser_semi_adaptatif(source: io.RawIOBase, destination: io.RawIOBase,
+                              taille_fenetre: int = TAILLE_FENETRE,
+                              seuil: float = SEUIL_DERIVE, index: bool = False,
+                              seuil_brut: float = SEUIL_BRUT) -> int:
+    ''' Compresse une source lue séquentiellement en ne changeant de table que
+    lorsque les statistiques dérivent.
+
+    params:
+    - source: Flux binaire possédant une méthode `read`.
+    - destination: Flux binaire possédant une méthode `write`.
+    - taille_fenetre (int, optionnel): Nombre d'octets d'origine par bloc.
+    - seuil (float, optionnel): Écart toléré, en bits par octet.
+    - index (bool, optionnel): Écrit un bloc d'index à la fin du flux.
+    - seuil_brut (float, optionnel): Économie estimée en dessous de laquelle une
+    fenêtre est écrite sans codage (0 pour toujours coder).
+
+    returns:
+    - int: Nombre de tables écrites.
+    '''
+    compresseur = CompresseurSemiAdaptatif(taille_fenetre, seuil, index, seuil_brut)
+    while (chunk := source.read(TAILLE_LECTURE)):
+        destination.write(compresseur.compress(chunk))
+    destination.write(compresseur.flush())
+    return compresseur.nb_tables
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from huffman.adaptatif import (ArbreAdaptatif, CompresseurAdaptatif, DecompresseurAdaptatif,
+                               compresser_adaptatif, decompresser_adaptatif, ENTETE_ADAPTATIF,
+                               ArbreAdaptatifVideErreur, FluxAdaptatifTermineErreur)
+from huffman.compresseur import decompresser, FormatInvalideErreur
+from huffman.compteur import Compteur
+
+@pytest.fixture(scope="module")
+def octets():
+    generateur = random.Random(4)
+    mots = [bytes(generateur.choices(b"abcdefgh ", k=generateur.randint(1, 8))) for _ in range(50)]
+    return b"".join(generateur.choices(mots, k=5000))
+
+def verifier_fratrie(arbre):
+    ''' Vérifie la propriété de fratrie : poids croissants, parents numérotés après leurs fils. '''
+    noeuds = range(arbre.nyt, arbre.racine + 1)
+    poids = [arbre._poids[noeud] for noeud in noeuds]
+    assert poids == sorted(poids)
+    for noeud in noeuds:
+        if not arbre.est_une_feuille(noeud):
+            gauche, droit = arbre.fils(noeud, 0), arbre.fils(noeud, 1)
+            assert abs(gauche - droit) == 1 and max(gauche, droit) < noeud
+            assert arbre._poids[noeud] == arbre._poids[gauche] + arbre._poids[droit]
+
+def test_mise_a_jour():
+    arbre = ArbreAdaptatif()
+    assert arbre.code(ord("a")) == (0, 0)
+    with pytest.raises(ArbreAdaptatifVideErreur):
+        arbre.arbre_huffman()
+    for octet in b"abracadabra":
+        arbre.mettre_a_jour(octet)
+        verifier_fratrie(arbre)
+    stat = Compteur({ord(lettre): nb for lettre, nb in zip("abrcd", [5, 2, 2, 1, 1])})
+    arbre_huffman = arbre.arbre_huffman()
+    assert arbre_huffman.nb_occurrences == 11
+    assert arbre.contient(ord("a")) and not arbre.contient(ord("z"))
+    # Le symbole le plus fréquent a le code le plus court
+    assert arbre.code(ord("a"))[1] == min(arbre.code(octet)[1] for octet in stat.elements)
+
+def test_fratrie_aleatoire():
+    arbre = ArbreAdaptatif()
+    generateur = random.Random(1)
+    for octet in generateur.choices(range(256), weights=range(1, 257), k=3000):
+        arbre.mettre_a_jour(octet)
+    verifier_fratrie(arbre)
+
+@pytest.mark.parametrize("donnees", [b"", b"a", b"abracadabra", bytes(range(256)) * 3])
+def test_aller_retour(donnees):
+    compresseur = CompresseurAdaptatif()
+    compresse = compresseur.compress(donnees) + compresseur.flush()
+    assert compresse.startswith(ENTETE_ADAPTATIF)
+    decompresseur = DecompresseurAdaptatif()
+    assert decompresseur.decompress(compresse) == donnees
+    assert decompresseur.eof
+
+@pytest.mark.parametrize("taille_morceau", [1, 7, 1000])
+def test_aller_retour_par_morceaux(octets, taille_morceau):
+    compresseur = CompresseurAdaptatif()
+    compresse = b"".join(compresseur.compress(octets[i:i + taille_morceau])
+                         for i in range(0, len(octets), taille_morceau)) + compresseur.flush()
+    decompresseur = DecompresseurAdaptatif()
+    resultat = b"".join(decompresseur.decompress(compresse[i:i + taille_morceau])
+                        for i in range(0, len(compresse), taille_morceau))
+    assert resultat == octets
+    assert len(compresse) < len(octets) / 2
+
+def test_sortie_immediate(octets):
+    compresseur = CompresseurAdaptatif()
+    premiers = compresseur.compress(octets[:100])
+    assert premiers.startswith(ENTETE_ADAPTATIF) and len(premiers) > len(ENTETE_ADAPTATIF) + 10
+    decompresseur = DecompresseurAdaptatif()
+    assert octets[:100].startswith(decompresseur.decompress(premiers))
+
+def test_fonctions_flux(octets):
+    compresse = io.BytesIO()
+    compresser_adaptatif(io.BytesIO(octets), compresse, taille_lecture=1000)
+    destination = io.BytesIO()
+    decompresser_adaptatif(io.BytesIO(compresse.getvalue() + b"suite"), destination)
+    assert destination.getvalue() == octets
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(compresse.getvalue()), destination)
+    assert destination.getvalue() == octets
+
+def test_donnees_inutilisees():
+    compresseur = CompresseurAdaptatif()
+    compresse = compresseur.compress(b"abc") + compresseur.flush()
+    decompresseur = DecompresseurAdaptatif()
+    assert decompresseur.decompress(compresse + b"xy") == b"abc"
+    assert decompresseur.unused_data == b"xy"
+    assert decompresseur.decompress(b"z") == b""
+    assert decompresseur.unused_data == b"xyz"
+
+def test_flux_termine():
+    compresseur = CompresseurAdaptatif()
+    compresseur.flush()
+    with pytest.raises(FluxAdaptatifTermineErreur):
+        compresseur.compress(b"a")
+
+@pytest.mark.parametrize("compresse", [b"43\x05\x00\x00", ENTETE_ADAPTATIF + b"\xff\xff"])
+def test_format_invalide(compresse):
+    with pytest.raises(FormatInvalideErreur):
+        DecompresseurAdaptatif().decompress(compresse)
+
+def test_flux_tronque(octets):
+    compresse = io.BytesIO()
+    compresser_adaptatif(io.BytesIO(octets), compresse)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_adaptatif(io.BytesIO(compresse.getvalue()[:-5]), io.BytesIO())
@@ -114,3 +114,9 @@ def test_plus_grand(ab1, ab2, resultat):
                         ])      
 def test_plus_grand_ou_egal(ab1, ab2, resultat):
     assert (ab1 >= ab2) == resultat 
+
+def test_feuille_element_nul():
+    feuille_nulle = ArbreHuffman(0, 3)
+    assert feuille_nulle.est_une_feuille
+    assert feuille_nulle.element == 0
+    assert (feuille_nulle + ArbreHuffman(1, 1)).nb_occurrences == 4
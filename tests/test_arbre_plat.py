@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+
+import pytest
+import random
+import sys
+from huffman.arbre_huffman import (ArbreHuffman, ArbreHuffmanIncoherentErreur,
+                                   DoitEtreUneFeuilleErreur, NeDoitPasEtreUneFeuilleErreur)
+from huffman.arbre_plat import ArbrePlat, VueArbrePlat, AUCUN
+from huffman.code_binaire import CodeBinaire, Bit
+from huffman.compresseur import arbre_de_huffman, codes_binaire, CompteurVideErreur
+from huffman.compteur import Compteur
+
+@pytest.fixture(scope="function")
+def arbre():
+    return ArbreHuffman(fils_gauche=ArbreHuffman('a', 1),
+                        fils_droit=ArbreHuffman(fils_gauche=ArbreHuffman('b', 2),
+                                                fils_droit=ArbreHuffman('c', 3)))
+
+def peigne(profondeur):
+    ''' Arbre dont chaque nœud interne a une feuille pour fils gauche. '''
+    arbre = ArbrePlat()
+    noeud = arbre.ajouter_feuille(profondeur, 1)
+    for element in range(profondeur - 1, -1, -1):
+        noeud = arbre.ajouter_noeud(arbre.ajouter_feuille(element, 1), noeud)
+    return arbre
+
+def test_construction():
+    arbre = ArbrePlat()
+    gauche = arbre.ajouter_feuille('a', 1)
+    droit = arbre.ajouter_feuille('b', 2)
+    racine = arbre.ajouter_noeud(gauche, droit)
+    assert (arbre.racine, len(arbre)) == (racine, 3)
+    assert arbre.nb_occurrences(racine) == 3
+    assert (arbre.fils_gauche(racine), arbre.fils_droit(racine)) == (gauche, droit)
+    assert arbre.est_une_feuille(gauche) and not arbre.est_une_feuille(racine)
+    assert arbre.fils_gauche(gauche) == AUCUN
+    assert arbre.element(racine) is None
+
+def test_construction_incoherente():
+    arbre = ArbrePlat()
+    feuille = arbre.ajouter_feuille('a', 1)
+    with pytest.raises(ArbreHuffmanIncoherentErreur):
+        arbre.ajouter_feuille(None, 1)
+    with pytest.raises(ArbreHuffmanIncoherentErreur):
+        arbre.ajouter_noeud(feuille, feuille)
+    with pytest.raises(ArbreHuffmanIncoherentErreur):
+        arbre.ajouter_noeud(feuille, 5)
+    autre = arbre.ajouter_feuille('b', 1)
+    arbre.ajouter_noeud(feuille, autre)
+    with pytest.raises(ArbreHuffmanIncoherentErreur):
+        arbre.ajouter_noeud(feuille, arbre.ajouter_feuille('c', 1))
+
+@pytest.mark.parametrize("graine", range(10))
+def test_identique_a_arbre_de_huffman(graine):
+    generateur = random.Random(graine)
+    stat = Compteur({element: generateur.choice([1, 1, 2, 3, 50, 1000])
+                     for element in range(generateur.randint(1, 256))})
+    plat = ArbrePlat.de_huffman(stat)
+    assert plat.vue().equivalent(arbre_de_huffman(stat))
+    assert plat.codes() == codes_binaire(arbre_de_huffman(stat))
+
+def test_compteur_vide():
+    with pytest.raises(CompteurVideErreur):
+        ArbrePlat.de_huffman(Compteur())
+
+def test_une_feuille():
+    arbre = ArbrePlat.de_huffman(Compteur({'a': 4}))
+    assert arbre.codes() == {'a': CodeBinaire(Bit.BIT_0)}
+    assert codes_binaire(arbre.vue()) == {'a': CodeBinaire(Bit.BIT_0)}
+
+def test_depuis_arbre(arbre):
+    plat = ArbrePlat.depuis_arbre(arbre)
+    assert len(plat) == 5
+    assert plat.vue().equivalent(arbre)
+    assert plat.codes() == codes_binaire(arbre)
+    assert ArbrePlat.depuis_arbre(plat.vue()).equivalent(plat)
+
+def test_vue(arbre):
+    vue = ArbrePlat.depuis_arbre(arbre).vue()
+    assert not vue.est_une_feuille
+    assert vue.nb_occurrences == 6
+    assert vue.fils_gauche.element == 'a'
+    assert vue.fils_droit.fils_droit.nb_occurrences == 3
+    assert vue.fils_gauche < vue.fils_droit
+    assert vue.fils_droit >= vue.fils_droit.fils_droit
+    with pytest.raises(DoitEtreUneFeuilleErreur):
+        vue.element
+    with pytest.raises(NeDoitPasEtreUneFeuilleErreur):
+        vue.fils_gauche.fils_droit
+    assert repr(vue.fils_droit) == ("ArbreHuffman(fils_gauche=ArbreHuffman(element=b, nb_occurrences=2), "
+                                    "fils_droit=ArbreHuffman(element=c, nb_occurrences=3))")
+    assert repr(vue.fils_gauche) == repr(arbre.fils_gauche)
+
+@pytest.mark.parametrize("autre, resultat",
+                         [(ArbreHuffman(fils_gauche=ArbreHuffman('a', 1),
+                                        fils_droit=ArbreHuffman(fils_gauche=ArbreHuffman('b', 2),
+                                                                fils_droit=ArbreHuffman('c', 3))),
+                           True),
+                          (ArbreHuffman(fils_gauche=ArbreHuffman('a', 1),
+                                        fils_droit=ArbreHuffman(fils_gauche=ArbreHuffman('c', 2),
+                                                                fils_droit=ArbreHuffman('b', 3))),
+                           False),
+                          (ArbreHuffman(fils_gauche=ArbreHuffman(fils_gauche=ArbreHuffman('a', 1),
+                                                                 fils_droit=ArbreHuffman('b', 2)),
+                                        fils_droit=ArbreHuffman('c', 3)), False),
+                          (ArbreHuffman(fils_gauche=ArbreHuffman('a', 1),
+                                        fils_droit=ArbreHuffman('b', 5)), False),
+                          (ArbreHuffman('a', 6), False),
+                          ("arbre", False)])
+def test_equivalent(arbre, autre, resultat):
+    assert ArbrePlat.depuis_arbre(arbre).vue().equivalent(autre) == resultat
+
+def test_equivalent_sous_arbre(arbre):
+    plat = ArbrePlat.depuis_arbre(arbre)
+    sous_arbre = ArbrePlat.depuis_arbre(arbre.fils_droit)
+    assert plat.vue().fils_droit.equivalent(sous_arbre.vue())
+    assert not plat.equivalent(sous_arbre)
+    assert not plat.equivalent(arbre)
+
+def test_arbre_profond_sans_recursion():
+    profondeur = 3 * sys.getrecursionlimit()
+    arbre = peigne(profondeur)
+    codes = arbre.codes()
+    assert len(codes) == profondeur + 1
+    assert len(codes[profondeur]) == profondeur
+    assert codes[0] == CodeBinaire(Bit.BIT_0)
+    assert codes[3] == CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_1, Bit.BIT_0)
+    assert arbre.equivalent(peigne(profondeur))
+    assert not arbre.equivalent(peigne(profondeur - 1))
+    assert repr(arbre.vue()).count("ArbreHuffman(") == 2 * profondeur + 1
+    assert ArbrePlat.depuis_arbre(arbre.vue()).equivalent(arbre)
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+import pytest
+import asyncio
+import io
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from huffman.asynchrone import compresser_asynchrone, decompresser_asynchrone
+from huffman.compresseur import FormatInvalideErreur
+from huffman.flux import compresser_flux, decompresser_flux
+from huffman.semi_adaptatif import compresser_semi_adaptatif
+
+TAILLE_BLOC = 4096
+
+class EcrivainMemoire:
+    ''' Remplace un StreamWriter : accumule les octets écrits. '''
+    def __init__(self):
+        self.octets = bytearray()
+        self.nb_drain = 0
+
+    def write(self, donnees):
+        self.octets += donnees
+
+    async def drain(self):
+        self.nb_drain += 1
+
+class ExecuteurCompte(ThreadPoolExecutor):
+    ''' Exécuteur qui mesure le nombre maximal de tâches soumises et non terminées. '''
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self._verrou = threading.Lock()
+        self.en_cours = 0
+        self.maximum = 0
+
+    def submit(self, *args, **kwargs):
+        with self._verrou:
+            self.en_cours += 1
+            self.maximum = max(self.maximum, self.en_cours)
+        futur = super().submit(*args, **kwargs)
+        futur.add_done_callback(self._terminer)
+        return futur
+
+    def _terminer(self, _):
+        with self._verrou:
+            self.en_cours -= 1
+
+@pytest.fixture(scope="module")
+def octets():
+    generateur = random.Random(5)
+    return bytes(generateur.choices(b"abcdefghij  \n", k=10 * TAILLE_BLOC + 123))
+
+def executer(fonction, entree, **options):
+    async def principal():
+        lecteur = asyncio.StreamReader()
+        lecteur.feed_data(entree)
+        lecteur.feed_eof()
+        ecrivain = EcrivainMemoire()
+        await fonction(lecteur, ecrivain, **options)
+        return bytes(ecrivain.octets)
+    return asyncio.run(principal())
+
+def compresse_sequentiel(octets, **options):
+    destination = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), destination, TAILLE_BLOC, **options)
+    return destination.getvalue()
+
+@pytest.mark.parametrize("options", [{}, {"index": True}, {"nb_flux": 3}, {"max_bits": 9}])
+def test_identique_au_flux_sequentiel(octets, options):
+    assert (executer(compresser_asynchrone, octets, taille_bloc=TAILLE_BLOC, **options)
+            == compresse_sequentiel(octets, **options))
+
+@pytest.mark.parametrize("taille", [0, 1, TAILLE_BLOC, 3 * TAILLE_BLOC])
+def test_aller_retour(octets, taille):
+    compresse = executer(compresser_asynchrone, octets[:taille], taille_bloc=TAILLE_BLOC)
+    assert executer(decompresser_asynchrone, compresse) == octets[:taille]
+
+def test_decompresser_flux_sequentiel(octets):
+    assert executer(decompresser_asynchrone, compresse_sequentiel(octets, index=True)) == octets
+
+def test_blocs_table_precedente(octets):
+    compresse = io.BytesIO()
+    compresser_semi_adaptatif(io.BytesIO(octets), compresse, TAILLE_BLOC)
+    assert executer(decompresser_asynchrone, compresse.getvalue()) == octets
+
+def test_asynchrone_lisible_par_flux(octets):
+    compresse = executer(compresser_asynchrone, octets, taille_bloc=TAILLE_BLOC, nb_flux=2)
+    destination = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse), destination)
+    assert destination.getvalue() == octets
+
+@pytest.mark.parametrize("blocs_en_vol", [1, 3])
+def test_blocs_en_vol_bornes(octets, blocs_en_vol):
+    with ExecuteurCompte() as executeur:
+        compresse = executer(compresser_asynchrone, octets, taille_bloc=TAILLE_BLOC,
+                             executeur=executeur, blocs_en_vol=blocs_en_vol)
+        assert executeur.maximum <= blocs_en_vol
+        executeur.maximum = 0
+        assert executer(decompresser_asynchrone, compresse, executeur=executeur,
+                        blocs_en_vol=blocs_en_vol) == octets
+        assert executeur.maximum <= blocs_en_vol
+
+@pytest.mark.parametrize("options", [{"blocs_en_vol": 0}, {"taille_bloc": 0}, {"nb_flux": 0}])
+def test_options_invalides(options):
+    with pytest.raises(ValueError):
+        executer(compresser_asynchrone, b"abc", **options)
+
+def test_flux_tronque(octets):
+    compresse = compresse_sequentiel(octets)
+    for fin in [0, 2, 10, len(compresse) // 2, len(compresse) - 1]:
+        with pytest.raises(FormatInvalideErreur):
+            executer(decompresser_asynchrone, compresse[:fin])
+
+def test_entete_invalide():
+    with pytest.raises(FormatInvalideErreur):
+        executer(decompresser_asynchrone, b"43\x04" + bytes(9))
+
+def test_connexion_tcp(octets):
+    async def principal():
+        async def servir(lecteur, ecrivain):
+            await compresser_asynchrone(lecteur, ecrivain, taille_bloc=TAILLE_BLOC)
+            ecrivain.close()
+            await ecrivain.wait_closed()
+
+        serveur = await asyncio.start_server(servir, "127.0.0.1", 0)
+        port = serveur.sockets[0].getsockname()[1]
+        async with serveur:
+            lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+            ecrivain.write(octets)
+            await ecrivain.drain()
+            ecrivain.write_eof()
+            resultat = EcrivainMemoire()
+            await decompresser_asynchrone(lecteur, resultat)
+            ecrivain.close()
+            await ecrivain.wait_closed()
+        return bytes(resultat.octets)
+    assert asyncio.run(principal()) == octets
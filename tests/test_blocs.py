@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from huffman.blocs import (encoder_bloc, decoder_bloc, economie_estimee, lire_blocs, lire_entete_bloc,
+                           TAILLE_ENTETE_BLOC, TYPE_BRUT, TYPE_HUFFMAN, TYPE_HUFFMAN_MULTIFLUX,
+                           TYPE_HUFFMAN_TABLE_PRECEDENTE, NB_FLUX_MAX)
+from huffman.compteur_octets import CompteurOctets
+from huffman.parallele import compresser_parallele
+from huffman.semi_adaptatif import compresser_semi_adaptatif
+from huffman.compresseur import FormatInvalideErreur
+from huffman.flux import compresser_flux, decompresser_flux
+from huffman.lecteur_indexe import LecteurIndexe
+
+@pytest.fixture(scope="module")
+def octets():
+    generateur = random.Random(7)
+    return bytes(generateur.choices(b"abcdefghij", weights=range(1, 11), k=30000))
+
+def decouper(bloc):
+    type_bloc, taille, taille_corps = lire_entete_bloc(bloc)
+    assert len(bloc) == TAILLE_ENTETE_BLOC + taille_corps
+    return type_bloc, taille, bloc[TAILLE_ENTETE_BLOC:]
+
+@pytest.mark.parametrize("nb_flux", [1, 2, 4, 7])
+def test_aller_retour(octets, nb_flux):
+    type_bloc, taille, corps = decouper(encoder_bloc(octets, nb_flux=nb_flux))
+    assert type_bloc == (TYPE_HUFFMAN if nb_flux == 1 else TYPE_HUFFMAN_MULTIFLUX)
+    assert taille == len(octets)
+    assert decoder_bloc(type_bloc, taille, corps) == octets
+
+@pytest.mark.parametrize("donnees", [b"a", b"abc", bytes(range(256))])
+@pytest.mark.parametrize("nb_flux", [4, NB_FLUX_MAX])
+def test_aller_retour_petits_blocs(donnees, nb_flux):
+    assert decoder_bloc(*decouper(encoder_bloc(donnees, nb_flux=nb_flux))) == donnees
+
+def test_decodage_executeur(octets):
+    type_bloc, taille, corps = decouper(encoder_bloc(octets, 10, nb_flux=4))
+    with ThreadPoolExecutor(4) as executeur:
+        assert decoder_bloc(type_bloc, taille, corps, executeur) == octets
+
+def test_sous_flux_independants(octets):
+    # Même table de codes : la charge multi-flux a à peu près la taille de la charge simple
+    simple = encoder_bloc(octets)
+    multiple = encoder_bloc(octets, nb_flux=4)
+    assert len(simple) < len(multiple) <= len(simple) + 4 * 4
+
+@pytest.mark.parametrize("nb_flux", [0, NB_FLUX_MAX + 1])
+def test_nb_flux_invalide(octets, nb_flux):
+    with pytest.raises(ValueError):
+        encoder_bloc(octets, nb_flux=nb_flux)
+
+def test_table_de_sauts_invalide(octets):
+    type_bloc, taille, corps = decouper(encoder_bloc(octets, nb_flux=4))
+    debut_charge = 2 + int.from_bytes(corps[:2], byteorder="big")
+    corps = bytearray(corps)
+    corps[debut_charge + 1:debut_charge + 5] = (1 << 31).to_bytes(4, byteorder="big")
+    with pytest.raises(FormatInvalideErreur):
+        decoder_bloc(type_bloc, taille, corps)
+    with pytest.raises(FormatInvalideErreur):
+        decoder_bloc(type_bloc, taille, corps[:debut_charge + 3])
+
+def test_flux_multiflux(octets):
+    compresse = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), compresse, 4096, index=True, nb_flux=4)
+    resultat = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse.getvalue()), resultat)
+    assert resultat.getvalue() == octets
+    lecteur = LecteurIndexe(io.BytesIO(compresse.getvalue()))
+    lecteur.seek(10000)
+    assert lecteur.read(5000) == octets[10000:15000]
+
+def test_economie_estimee(octets):
+    uniforme = CompteurOctets({octet: 10 for octet in range(256)})
+    assert economie_estimee(uniforme, 2560) == pytest.approx(0)
+    assert economie_estimee(CompteurOctets({0: 8}), 8) == 1
+    assert economie_estimee(CompteurOctets(), 0) == 0
+    stat = CompteurOctets()
+    stat.ajouter_octets(octets)
+    assert 0.5 < economie_estimee(stat, len(octets)) < 0.7
+
+@pytest.mark.parametrize("nb_flux", [1, 4])
+def test_bloc_brut(nb_flux):
+    aleatoire = os.urandom(20000)
+    bloc = encoder_bloc(aleatoire, nb_flux=nb_flux)
+    assert len(bloc) == TAILLE_ENTETE_BLOC + len(aleatoire)
+    type_bloc, taille, corps = decouper(bloc)
+    assert (type_bloc, taille, corps) == (TYPE_BRUT, len(aleatoire), aleatoire)
+    assert decoder_bloc(type_bloc, taille, corps) == aleatoire
+
+def test_bloc_brut_seuil(octets):
+    # 128 octets équiprobables : 7 bits par octet, soit 12,5 % d'économie
+    sept_bits = bytes(random.Random(3).choices(range(128), k=20000))
+    assert decouper(encoder_bloc(sept_bits))[0] == TYPE_HUFFMAN
+    assert decouper(encoder_bloc(sept_bits, seuil_brut=0.2))[0] == TYPE_BRUT
+    assert decouper(encoder_bloc(octets, seuil_brut=0.9))[0] == TYPE_BRUT
+    # Un seuil nul ne retient que les blocs que le codage agrandirait
+    assert decouper(encoder_bloc(os.urandom(20000), seuil_brut=0))[0] == TYPE_BRUT
+
+def test_bloc_brut_plus_petit_que_le_codage():
+    # Bloc minuscule : la table coûte plus que l'économie sur la charge utile
+    type_bloc, _, corps = decouper(encoder_bloc(b"aab", seuil_brut=0))
+    assert (type_bloc, corps) == (TYPE_BRUT, b"aab")
+
+def test_bloc_brut_taille_incoherente():
+    with pytest.raises(FormatInvalideErreur):
+        decoder_bloc(TYPE_BRUT, 5, b"abcd")
+
+@pytest.fixture(scope="module")
+def melange(octets):
+    return octets[:20000] + os.urandom(20000) + octets[20000:] + os.urandom(5000)
+
+def test_flux_avec_blocs_bruts(melange):
+    compresse = io.BytesIO()
+    compresser_flux(io.BytesIO(melange), compresse, taille_bloc=10000, index=True)
+    types = [type_bloc for type_bloc, _, _ in lire_blocs(io.BytesIO(compresse.getvalue()))]
+    assert types.count(TYPE_BRUT) == 3
+    assert TYPE_HUFFMAN in types
+    sortie = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse.getvalue()), sortie)
+    assert sortie.getvalue() == melange
+    paralleles = io.BytesIO()
+    compresser_parallele(io.BytesIO(melange), paralleles, taille_bloc=10000, nb_processus=2,
+                         index=True)
+    assert paralleles.getvalue() == compresse.getvalue()
+    with LecteurIndexe(io.BytesIO(compresse.getvalue())) as lecteur:
+        lecteur.seek(25000)
+        assert lecteur.read(10000) == melange[25000:35000]
+
+def test_semi_adaptatif_avec_blocs_bruts(melange):
+    compresse = io.BytesIO()
+    nb_tables = compresser_semi_adaptatif(io.BytesIO(melange), compresse, taille_fenetre=10000,
+                                          index=True)
+    assert nb_tables == 1
+    types = [type_bloc for type_bloc, _, _ in lire_blocs(io.BytesIO(compresse.getvalue()))]
+    assert types.count(TYPE_BRUT) == 3
+    assert TYPE_HUFFMAN_TABLE_PRECEDENTE in types[types.index(TYPE_BRUT):]
+    sortie = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse.getvalue()), sortie)
+    assert sortie.getvalue() == melange
+    with LecteurIndexe(io.BytesIO(compresse.getvalue())) as lecteur:
+        lecteur.seek(40000)
+        assert lecteur.read(15000) == melange[40000:55000]
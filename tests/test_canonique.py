@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+
+import pytest
+from huffman.canonique import (codes_canoniques, longueurs_codes, encoder_longueurs,
+                               decoder_longueurs, LongueursInvalidesErreur)
+from huffman.code_binaire import CodeBinaire, Bit
+from huffman.compresseur import arbre_de_huffman, codes_binaire
+from huffman.compteur import Compteur
+
+def test_codes_canoniques():
+    codes = codes_canoniques({65: 2, 66: 3, 67: 2, 68: 3, 69: 4, 70: 4, 71: 3})
+    assert codes == {65: CodeBinaire(Bit.BIT_0, Bit.BIT_0),
+                     67: CodeBinaire(Bit.BIT_0, Bit.BIT_1),
+                     66: CodeBinaire(Bit.BIT_1, Bit.BIT_0, Bit.BIT_0),
+                     68: CodeBinaire(Bit.BIT_1, Bit.BIT_0, Bit.BIT_1),
+                     71: CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_0),
+                     69: CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_1, Bit.BIT_0),
+                     70: CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_1, Bit.BIT_1)}
+
+def test_longueurs_conservees():
+    codes = codes_binaire(arbre_de_huffman(Compteur({65:4, 66:2, 67:3, 68:2, 69:1, 70:1, 71:2})))
+    assert longueurs_codes(codes_canoniques(longueurs_codes(codes))) == longueurs_codes(codes)
+
+def test_codes_canoniques_vide():
+    assert codes_canoniques({}) == {}
+
+def test_kraft_erreur():
+    with pytest.raises(LongueursInvalidesErreur):
+        codes_canoniques({1: 1, 2: 1, 3: 1})
+
+@pytest.mark.parametrize("longueurs",
+                         [{},
+                          {0: 1},
+                          {255: 1},
+                          {65: 2, 66: 3, 67: 2, 68: 3, 69: 4, 70: 4, 71: 3},
+                          {octet: 8 for octet in range(256)},
+                          {0: 1, 1: 2, 100: 30, 255: 200},
+                        ])
+def test_encoder_decoder_longueurs(longueurs):
+    assert decoder_longueurs(encoder_longueurs(longueurs)) == longueurs
+
+def test_encoder_longueurs_compact():
+    assert len(encoder_longueurs({65: 2, 66: 3, 67: 2, 68: 3, 69: 4, 70: 4, 71: 3})) <= 10
+
+def test_decoder_longueurs_tronquees():
+    with pytest.raises(LongueursInvalidesErreur):
+        decoder_longueurs(encoder_longueurs({65: 2, 66: 2})[:2])
@@ -96,3 +96,33 @@ def test_type_erreur():
 
 def test_add():
     assert CodeBinaire(Bit.BIT_0) + CodeBinaire(Bit.BIT_1) == CodeBinaire(Bit.BIT_0,Bit.BIT_1)        
+
+def test_non_hachable():
+    # Un code modifiable dont l'égalité compare la valeur ne doit pas servir de clé
+    with pytest.raises(TypeError):
+        hash(CodeBinaire(Bit.BIT_1, Bit.BIT_0))
+
+@pytest.mark.parametrize("valeur, longueur, code_binaire",
+                         [(0, 1, CodeBinaire(Bit.BIT_0)),
+                          (2, 2, CodeBinaire(Bit.BIT_1, Bit.BIT_0)),
+                          (1, 3, CodeBinaire(Bit.BIT_0, Bit.BIT_0, Bit.BIT_1)),
+                        ])
+def test_depuis_entier(valeur, longueur, code_binaire):
+    code = CodeBinaire.depuis_entier(valeur, longueur)
+    assert code == code_binaire
+    assert code.valeur == valeur and len(code) == longueur
+
+def test_depuis_entier_trop_long():
+    with pytest.raises(ValueError):
+        CodeBinaire.depuis_entier(4, 2)
+
+def test_iteration_bits():
+    assert list(CodeBinaire(Bit.BIT_1, Bit.BIT_0, Bit.BIT_0)) == [Bit.BIT_1, Bit.BIT_0, Bit.BIT_0]
+
+def test_get_hors_code():
+    with pytest.raises(IndexError):
+        CodeBinaire(Bit.BIT_0)[1]
+
+def test_pas_de_dict():
+    with pytest.raises(AttributeError):
+        CodeBinaire(Bit.BIT_0).autre = 1
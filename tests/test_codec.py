@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import pickle
+import random
+from huffman import codec as module_codec
+from huffman.codec import Codec, codec_pour, empreinte, vider_cache, NB_CODECS_EN_CACHE
+from huffman.compresseur import (compresser, decompresser, ecrire_entete, ecrire_entete_canonique,
+                                 codes_binaire, arbre_de_huffman, CompteurVideErreur)
+from huffman.canonique import longueurs_codes, codes_canoniques
+from huffman.compteur import Compteur
+from huffman.compteur_octets import CompteurOctets
+from huffman.flux_binaire import BitWriter
+
+def compteur(octets):
+    stat = CompteurOctets()
+    stat.ajouter_octets(octets)
+    return stat
+
+@pytest.fixture
+def octets():
+    generateur = random.Random(0)
+    return bytes(generateur.choices(b"abcdefghij \n", weights=range(12, 0, -1), k=5000))
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    vider_cache()
+    yield
+    vider_cache()
+
+def test_empreinte_independante_du_type():
+    octets = b"abracadabra"
+    generique = Compteur()
+    for octet in octets:
+        generique.incrementer(octet)
+    assert empreinte(generique) == empreinte(compteur(octets))
+    assert len(empreinte(generique)) == 256
+
+@pytest.mark.parametrize("canonique", [False, True])
+def test_entete_identique(octets, canonique):
+    stat = compteur(octets)
+    attendu = io.BytesIO()
+    if canonique:
+        longueurs = longueurs_codes(codes_binaire(arbre_de_huffman(stat)))
+        ecrire_entete_canonique(attendu, longueurs, len(octets))
+    else:
+        ecrire_entete(attendu, stat, len(octets))
+    assert Codec(stat, canonique).entete(len(octets)) == attendu.getvalue()
+
+def test_codes(octets):
+    stat = compteur(octets)
+    codes = codes_binaire(arbre_de_huffman(stat))
+    assert Codec(stat).codes == codes
+    assert Codec(stat, canonique=True).codes == codes_canoniques(longueurs_codes(codes))
+    assert max(longueurs_codes(Codec(stat, True, 4).codes).values()) <= 4
+
+@pytest.mark.parametrize("canonique, max_bits", [(False, None), (True, None), (True, 5)])
+def test_aller_retour(octets, canonique, max_bits):
+    codec = Codec(compteur(octets), canonique, max_bits)
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(octets, codec.table)
+    ecrivain.vider()
+    assert codec.decodeur.decoder_octets(ecrivain.valeur(), len(octets)) == octets
+
+def test_pickle(octets):
+    codec = Codec(compteur(octets), canonique=True)
+    copie = pickle.loads(pickle.dumps(codec))
+    assert copie.entete(10) == codec.entete(10)
+    assert copie.table == codec.table
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(octets, copie.table)
+    ecrivain.vider()
+    assert copie.decodeur.decoder_octets(ecrivain.valeur(), len(octets)) == octets
+
+def test_max_bits_hors_canonique(octets):
+    with pytest.raises(ValueError):
+        Codec(compteur(octets), max_bits=8)
+    with pytest.raises(ValueError):
+        codec_pour(compteur(octets), max_bits=8)
+
+def test_compteur_vide():
+    with pytest.raises(CompteurVideErreur):
+        codec_pour(CompteurOctets())
+
+def test_cache(octets):
+    codec = codec_pour(compteur(octets))
+    assert codec_pour(compteur(octets)) is codec
+    assert codec_pour(compteur(octets), canonique=True) is not codec
+    assert codec_pour(compteur(octets[:100])) is not codec
+
+def test_cache_borne(octets):
+    premier = codec_pour(compteur(octets))
+    for taille in range(1, NB_CODECS_EN_CACHE + 1):
+        codec_pour(compteur(octets[:taille * 10]))
+    assert module_codec._codec_en_cache.cache_info().currsize == NB_CODECS_EN_CACHE
+    assert codec_pour(compteur(octets)) is not premier
+
+def test_compresser_sans_reconstruction(monkeypatch, octets):
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse)
+    monkeypatch.setattr(module_codec.ArbrePlat, "de_huffman",
+                        classmethod(lambda cls, stat: pytest.fail("arbre reconstruit")))
+    deuxieme = io.BytesIO()
+    compresser(io.BytesIO(octets), deuxieme)
+    assert deuxieme.getvalue() == compresse.getvalue()
+    resultat = io.BytesIO()
+    decompresser(io.BytesIO(compresse.getvalue()), resultat)
+    assert resultat.getvalue() == octets
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 import pytest
 import io
-from huffman.compresseur import statistiques, arbre_de_huffman, codes_binaire
+from huffman.compresseur import statistiques, arbre_de_huffman, codes_binaire, compresser, decompresser, lire_par_blocs, CompteurVideErreur, FormatInvalideErreur
+from huffman.compresseur import ecrire_entete, table_de_codage
+from huffman.flux_binaire import BitWriter, FinDeFluxErreur
 from huffman.compteur import Compteur
 from huffman.arbre_huffman import ArbreHuffman
 from huffman.code_binaire import Bit, CodeBinaire
@@ -61,3 +63,185 @@ def test_codes_binaire(flux_donnees):
                                71 : CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_0)
     }
     assert codes_binaires_calcules == codes_binaires_attendus
+
+def test_arbre_huffman_compteur_vide():
+    with pytest.raises(CompteurVideErreur):
+        arbre_de_huffman(Compteur())
+
+def test_arbre_huffman_un_seul_element():
+    assert arbre_de_huffman(Compteur({0: 5})).equivalent(ArbreHuffman(0, 5))
+
+def test_codes_binaire_un_seul_element():
+    assert codes_binaire(ArbreHuffman(0, 5)) == {0: CodeBinaire(Bit.BIT_0)}
+
+def test_compresser(flux_donnees):
+    destination = io.BytesIO()
+    compresser(flux_donnees, destination)
+    assert destination.getvalue() == donnees_compressees
+
+def test_decompresser():
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(donnees_compressees), destination)
+    assert destination.getvalue() == octets_a_compresser
+
+@pytest.mark.parametrize("octets",
+                         [b"",
+                          b"a",
+                          b"aaaaaaaa",
+                          bytes(range(256)) * 4,
+                          bytes([0] * 1000 + [1] * 10 + [2]),
+                          bytes(i % 7 * 31 for i in range(5000))
+                        ])
+@pytest.mark.parametrize("canonique", [False, True])
+def test_compresser_decompresser(octets, canonique):
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse, canonique)
+    compresse.seek(0)
+    destination = io.BytesIO()
+    decompresser(compresse, destination)
+    assert destination.getvalue() == octets
+
+def test_decompresser_format_invalide():
+    with pytest.raises(FormatInvalideErreur):
+        decompresser(io.BytesIO(b"43" + donnees_compressees[2:]), io.BytesIO())
+
+def test_compresser_canonique_entete_compacte(flux_donnees):
+    destination = io.BytesIO()
+    compresser(flux_donnees, destination, canonique=True)
+    assert len(destination.getvalue()) < 32
+    assert destination.getvalue()[:3] == b"42\x03"
+
+def test_statistiques_texte():
+    stat, nb = statistiques(io.StringIO("abracadabra"))
+    assert nb == 11
+    assert stat == Compteur({"a": 5, "b": 2, "r": 2, "c": 1, "d": 1})
+
+def test_lire_par_blocs_fichier_projete(tmp_path):
+    chemin = tmp_path / "source"
+    chemin.write_bytes(bytes(range(256)) * 1000)
+    with open(chemin, "rb") as source:
+        source.read(10)
+        blocs = [bytes(bloc) for bloc in lire_par_blocs(source)]
+        assert source.tell() == 256000
+    assert b"".join(blocs) == (bytes(range(256)) * 1000)[10:]
+
+@pytest.mark.parametrize("mode_destination", ["wb", "w+b"])
+@pytest.mark.parametrize("canonique", [False, True])
+def test_compresser_decompresser_fichiers(tmp_path, mode_destination, canonique):
+    octets = bytes(i * i % 251 for i in range(200000))
+    (tmp_path / "source").write_bytes(octets)
+    with open(tmp_path / "source", "rb") as source, \
+         open(tmp_path / "compresse", mode_destination) as destination:
+        compresser(source, destination, canonique)
+    compresse = (tmp_path / "compresse").read_bytes()
+    destination = io.BytesIO()
+    compresser(io.BytesIO(octets), destination, canonique)
+    assert compresse == destination.getvalue()
+
+    with open(tmp_path / "compresse", "rb") as source, \
+         open(tmp_path / "resultat", mode_destination) as destination:
+        destination.write(b"entete")
+        decompresser(source, destination)
+        assert destination.tell() == len(octets) + 6
+    assert (tmp_path / "resultat").read_bytes() == b"entete" + octets
+
+@pytest.mark.parametrize("canonique", [False, True])
+def test_compresser_source_deja_entamee(tmp_path, canonique):
+    octets = b"".join(b"h%d " % i for i in range(2000))
+    attendu = io.BytesIO()
+    compresser(io.BytesIO(octets), attendu, canonique)
+
+    source = io.BytesIO(b"hhh" + octets)
+    source.seek(3)
+    compresse = io.BytesIO()
+    compresser(source, compresse, canonique)
+    assert compresse.getvalue() == attendu.getvalue()
+
+    (tmp_path / "source").write_bytes(b"hhh" + octets)
+    with open(tmp_path / "source", "rb") as source:
+        source.seek(3)
+        compresse = io.BytesIO()
+        compresser(source, compresse, canonique)
+    assert compresse.getvalue() == attendu.getvalue()
+
+def test_decompresser_codes_de_plus_de_32_bits():
+    # Occurrences de Fibonacci tenant dans l'entête : le plus long code dépasse 32 bits
+    poids = [1, 1]
+    while poids[-1] + poids[-2] < 1 << 32:
+        poids.append(poids[-1] + poids[-2])
+    stat = Compteur(dict(enumerate(poids)))
+    codes = codes_binaire(arbre_de_huffman(stat))
+    assert max(len(code) for code in codes.values()) > 32
+    octets = bytes(range(len(poids))) * 2
+    compresse = io.BytesIO()
+    ecrire_entete(compresse, stat, len(octets))
+    ecrivain = BitWriter(compresse)
+    ecrivain.ecrire_octets(octets, table_de_codage(codes))
+    ecrivain.vider()
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(compresse.getvalue()), destination)
+    assert destination.getvalue() == octets
+
+@pytest.mark.parametrize("canonique", [False, True])
+def test_decompresser_donnees_suivantes(tmp_path, canonique):
+    octets = bytes(i % 7 * 31 for i in range(5000))
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse, canonique)
+    source = io.BytesIO(compresse.getvalue() + b"suite")
+    destination = io.BytesIO()
+    decompresser(source, destination)
+    assert destination.getvalue() == octets
+    assert source.read() == b"suite"
+
+    (tmp_path / "compresse").write_bytes(compresse.getvalue() + b"suite")
+    with open(tmp_path / "compresse", "rb") as source, \
+         open(tmp_path / "resultat", "w+b") as destination:
+        decompresser(source, destination)
+        assert source.read() == b"suite"
+    assert (tmp_path / "resultat").read_bytes() == octets
+
+def test_decompresser_destination_conservee(tmp_path):
+    octets = bytes(i % 7 * 31 for i in range(5000))
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse)
+    (tmp_path / "resultat").write_bytes(b"entete" + bytes(10000))
+    with open(tmp_path / "resultat", "r+b") as destination:
+        destination.seek(6)
+        decompresser(io.BytesIO(compresse.getvalue()), destination)
+        assert destination.tell() == 6 + len(octets)
+    # Les octets qui suivent la zone décodée ne sont pas tronqués
+    assert (tmp_path / "resultat").read_bytes() == b"entete" + octets + bytes(10000 - len(octets))
+
+@pytest.mark.parametrize("coupure, erreur", [(10, FinDeFluxErreur), (1100, FormatInvalideErreur)])
+def test_decompresser_charge_corrompue(tmp_path, coupure, erreur):
+    octets = bytes(i % 7 * 31 for i in range(5000))
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse, canonique=True)
+    (tmp_path / "compresse").write_bytes(compresse.getvalue()[:-coupure])
+    with open(tmp_path / "compresse", "rb") as source, \
+         open(tmp_path / "resultat", "w+b") as destination:
+        destination.write(b"entete")
+        with pytest.raises(erreur):
+            decompresser(source, destination)
+    assert (tmp_path / "resultat").read_bytes() == b"entete"
+
+def test_compresser_flux_non_projetable():
+    class Tube(io.RawIOBase):
+        def __init__(self, donnees):
+            self._donnees = io.BytesIO(donnees)
+
+        def readable(self):
+            return True
+
+        def readinto(self, tampon):
+            return self._donnees.readinto(memoryview(tampon)[:1000])
+
+        def seek(self, position, whence=io.SEEK_SET):
+            return self._donnees.seek(position, whence)
+
+    octets = bytes(i % 7 * 31 for i in range(5000))
+    destination = io.BytesIO()
+    compresser(Tube(octets), destination)
+    attendu = io.BytesIO()
+    compresser(io.BytesIO(octets), attendu)
+    assert destination.getvalue() == attendu.getvalue()
@@ -56,3 +56,38 @@ def test_elements_plus_frequents(compteur, elements):
 
 def test_elements_par_nb_occurences(compteur_non_vide):
     assert compteur_non_vide.elements_par_nb_occurrences() == {1: {'b','d'}, 2:{'a'}, 3:{'c'}}
+
+def test_ajouter(compteur_non_vide):
+    compteur_non_vide.ajouter(Compteur({'a': 1, 'z': 4}))
+    assert compteur_non_vide == Compteur({'a': 3, 'b': 1, 'c': 3, 'd': 1, 'z': 4})
+
+def test_addition(compteur_non_vide, compteur_vide):
+    somme = compteur_non_vide + Compteur({'b': 2, 'e': 1})
+    assert somme == Compteur({'a': 2, 'b': 3, 'c': 3, 'd': 1, 'e': 1})
+    assert compteur_non_vide == Compteur({'a': 2, 'b': 1, 'c': 3, 'd': 1})
+    assert compteur_vide + compteur_non_vide == compteur_non_vide
+    assert sum([compteur_non_vide, compteur_non_vide]) == Compteur({'a': 4, 'b': 2, 'c': 6, 'd': 2})
+
+def test_addition_en_place(compteur_non_vide):
+    compteur = compteur_non_vide
+    compteur += Compteur({'a': 1})
+    assert compteur is compteur_non_vide
+    assert compteur.nb_occurrences('a') == 3
+
+def test_soustraction(compteur_non_vide):
+    difference = compteur_non_vide - Compteur({'a': 1, 'b': 1, 'c': 5, 'z': 2})
+    assert difference == Compteur({'a': 1, 'd': 1})
+    assert difference.elements == {'a', 'd'}
+    compteur_non_vide -= Compteur({'d': 1})
+    assert compteur_non_vide == Compteur({'a': 2, 'b': 1, 'c': 3})
+
+def test_operation_invalide(compteur_non_vide):
+    with pytest.raises(TypeError):
+        compteur_non_vide + 1
+    with pytest.raises(TypeError):
+        compteur_non_vide - {'a': 1}
+
+def test_fusionner():
+    compteurs = [Compteur({'a': 1}), Compteur({'a': 2, 'b': 1}), Compteur()]
+    assert Compteur.fusionner(compteurs) == Compteur({'a': 3, 'b': 1})
+    assert Compteur.fusionner(iter([])) == Compteur()
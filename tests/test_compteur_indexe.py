@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+
+import pytest
+import random
+from huffman.compteur import Compteur
+from huffman.compteur_indexe import CompteurIndexe
+
+@pytest.fixture(scope="function")
+def compteur_vide():
+    return CompteurIndexe()
+
+@pytest.fixture(scope="function")
+def compteur_non_vide():
+    return CompteurIndexe({'a':2,'b':1,'c':3,'d':1})
+
+def verifier_identique(indexe, reference):
+    assert indexe == reference
+    assert indexe.elements == reference.elements
+    assert indexe.elements_moins_frequents() == reference.elements_moins_frequents()
+    assert indexe.elements_plus_frequents() == reference.elements_plus_frequents()
+    assert indexe.elements_par_nb_occurrences() == reference.elements_par_nb_occurrences()
+    for nb_occurrences in range(-1, 8):
+        assert indexe.elements_nb_occurrences(nb_occurrences) == \
+            reference.elements_nb_occurrences(nb_occurrences)
+        assert sorted(indexe.obtenir_cle(nb_occurrences)) == \
+            sorted(reference.obtenir_cle(nb_occurrences))
+
+def test_compteur_vide(compteur_vide):
+    verifier_identique(compteur_vide, Compteur())
+    assert compteur_vide.elements_moins_frequents() == set()
+    assert compteur_vide.elements_plus_frequents() == set()
+
+def test_requetes(compteur_non_vide):
+    assert compteur_non_vide.elements_moins_frequents() == {'b', 'd'}
+    assert compteur_non_vide.elements_plus_frequents() == {'c'}
+    assert compteur_non_vide.elements_par_nb_occurrences() == {1: {'b', 'd'}, 2: {'a'}, 3: {'c'}}
+    assert sorted(compteur_non_vide.obtenir_cle(1)) == ['b', 'd']
+
+def test_incrementer_met_a_jour_min_max(compteur_non_vide):
+    compteur_non_vide.incrementer('b')
+    compteur_non_vide.incrementer('d')
+    assert compteur_non_vide.elements_moins_frequents() == {'a', 'b', 'd'}
+    for _ in range(2):
+        compteur_non_vide.incrementer('a')
+    assert compteur_non_vide.elements_plus_frequents() == {'a'}
+    compteur_non_vide.incrementer('z')
+    assert compteur_non_vide.elements_moins_frequents() == {'z'}
+
+def test_fixer_met_a_jour_min_max(compteur_non_vide):
+    compteur_non_vide.fixer('c', 1)
+    assert compteur_non_vide.elements_plus_frequents() == {'a'}
+    compteur_non_vide.fixer('b', 2)
+    compteur_non_vide.fixer('d', 2)
+    compteur_non_vide.fixer('c', 2)
+    assert compteur_non_vide.elements_moins_frequents() == {'a', 'b', 'c', 'd'}
+
+def test_resultats_copies(compteur_non_vide):
+    compteur_non_vide.elements_moins_frequents().add('z')
+    with pytest.raises(TypeError):
+        compteur_non_vide.compteur['z'] = 4
+    assert compteur_non_vide.elements_moins_frequents() == {'b', 'd'}
+    assert compteur_non_vide.nb_occurrences('z') == 0
+
+def test_remplacer_compteur(compteur_non_vide):
+    compteur_non_vide.compteur = {'x': 5}
+    verifier_identique(compteur_non_vide, Compteur({'x': 5}))
+
+def test_operations(compteur_non_vide):
+    somme = compteur_non_vide + Compteur({'a': 2, 'e': 1})
+    assert isinstance(somme, CompteurIndexe)
+    verifier_identique(somme, Compteur({'a': 4, 'b': 1, 'c': 3, 'd': 1, 'e': 1}))
+    difference = somme - Compteur({'a': 1, 'c': 3, 'z': 1})
+    verifier_identique(difference, Compteur({'a': 3, 'b': 1, 'd': 1, 'e': 1}))
+    verifier_identique(difference - difference, Compteur())
+
+@pytest.mark.parametrize("graine", range(5))
+def test_equivalent_au_compteur(graine):
+    generateur = random.Random(graine)
+    indexe, reference = CompteurIndexe(), Compteur()
+    for _ in range(300):
+        element = generateur.choice("abcdefgh")
+        if generateur.random() < 0.8:
+            indexe.incrementer(element)
+            reference.incrementer(element)
+        else:
+            nb_occurrences = generateur.randint(0, 6)
+            indexe.fixer(element, nb_occurrences)
+            reference.fixer(element, nb_occurrences)
+        verifier_identique(indexe, reference)
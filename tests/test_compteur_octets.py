@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import os
+from collections import Counter
+from huffman.compteur import Compteur
+from huffman.compteur_indexe import CompteurIndexe
+from huffman.compteur_octets import CompteurOctets, OctetInvalideErreur
+from huffman.compresseur import statistiques
+
+@pytest.fixture(scope="function")
+def compteur_vide():
+    return CompteurOctets()
+
+@pytest.fixture(scope="function")
+def compteur_non_vide():
+    return CompteurOctets({65:2, 66:1, 67:3, 68:1})
+
+def test_nb_occurrences_present(compteur_non_vide):
+    assert compteur_non_vide.nb_occurrences(65) == 2
+
+@pytest.mark.parametrize("element", [0, 255, 'a', 300])
+def test_nb_occurrences_non_present(compteur_non_vide, element):
+    assert compteur_non_vide.nb_occurrences(element) == 0
+
+def test_incrementer(compteur_non_vide):
+    compteur_non_vide.incrementer(0)
+    compteur_non_vide.incrementer(65)
+    assert compteur_non_vide.nb_occurrences(0) == 1
+    assert compteur_non_vide.nb_occurrences(65) == 3
+
+def test_fixer(compteur_non_vide):
+    compteur_non_vide.fixer(255, 5)
+    assert compteur_non_vide.nb_occurrences(255) == 5
+
+@pytest.mark.parametrize("element", [-1, 256, 'a', None])
+def test_octet_invalide_erreur(compteur_vide, element):
+    with pytest.raises(OctetInvalideErreur):
+        compteur_vide.incrementer(element)
+
+def test_elements(compteur_vide, compteur_non_vide):
+    assert compteur_vide.elements == set()
+    assert compteur_non_vide.elements == {65, 66, 67, 68}
+
+def test_api_compteur(compteur_non_vide):
+    assert compteur_non_vide.elements_moins_frequents() == {66, 68}
+    assert compteur_non_vide.elements_plus_frequents() == {67}
+    assert compteur_non_vide.elements_par_nb_occurrences() == {1: {66, 68}, 2: {65}, 3: {67}}
+
+def test_egalite_avec_compteur(compteur_non_vide):
+    assert compteur_non_vide == Compteur({65:2, 66:1, 67:3, 68:1})
+    assert Compteur({65:2, 66:1, 67:3, 68:1}) == compteur_non_vide
+
+def test_compteur_lecture_seule(compteur_non_vide):
+    with pytest.raises(TypeError):
+        compteur_non_vide.compteur[69] = 4
+    assert compteur_non_vide.nb_occurrences(69) == 0
+    compteur_non_vide.compteur = {69: 4}
+    assert compteur_non_vide == Compteur({69: 4})
+
+@pytest.mark.parametrize("classe", [Compteur, CompteurOctets, CompteurIndexe])
+def test_occurrences_nulles(classe):
+    compteur = classe({65: 0, 66: 2})
+    assert compteur == Compteur({65: 0, 66: 2})
+    assert compteur == CompteurOctets({65: 0, 66: 2})
+    assert compteur != Compteur({66: 2})
+    assert compteur.elements == {65, 66}
+    compteur.fixer(66, 0)
+    assert compteur.elements == {65, 66}
+    assert compteur.elements_moins_frequents() == {65, 66}
+    compteur -= Compteur({65: 0})
+    assert compteur.elements == {66}
+
+@pytest.mark.parametrize("donnees",
+                         [b"",
+                          b"BACFGABDDACEACG",
+                          bytes(range(256)) * 3,
+                          os.urandom(10000)
+                        ])
+@pytest.mark.parametrize("utiliser_numpy", [True, False])
+def test_ajouter_octets(donnees, utiliser_numpy):
+    compteur = CompteurOctets(utiliser_numpy=utiliser_numpy)
+    compteur.ajouter_octets(donnees)
+    compteur.ajouter_octets(memoryview(donnees))
+    assert compteur.compteur == {k: 2 * v for k, v in Counter(donnees).items()}
+
+def test_statistiques_flux_texte():
+    stat, nb = statistiques(io.StringIO("abca"))
+    assert nb == 4
+    assert stat == Compteur({'a':2, 'b':1, 'c':1})
+
+def test_statistiques_flux_vide():
+    stat, nb = statistiques(io.BytesIO(b""))
+    assert nb == 0
+    assert stat.elements == set()
+
+@pytest.mark.parametrize("utiliser_numpy", [True, False])
+def test_operations(utiliser_numpy):
+    premier = CompteurOctets(utiliser_numpy=utiliser_numpy)
+    premier.ajouter_octets(b"abracadabra")
+    second = CompteurOctets()
+    second.ajouter_octets(b"cab")
+    somme = premier + second
+    assert isinstance(somme, CompteurOctets)
+    assert somme.compteur == dict(Counter(b"abracadabracab"))
+    assert (somme - second) == premier
+    assert (second - premier).elements == set()
+    assert premier + Compteur({ord("z"): 2}) == Compteur({**Counter(b"abracadabra"), ord("z"): 2})
+    assert CompteurOctets.fusionner([premier, second, second]).nb_occurrences(ord("c")) == 3
+
+def test_ajouter_element_invalide(compteur_non_vide):
+    with pytest.raises(OctetInvalideErreur):
+        compteur_non_vide.ajouter(Compteur({'a': 1}))
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+import pytest
+import random
+from huffman.code_binaire import CodeBinaire, Bit
+from huffman.compresseur import arbre_de_huffman, codes_binaire, table_de_codage
+from huffman.compteur import Compteur
+from huffman.decodeur import DecodeurTable, CodeInvalideErreur
+from huffman.flux_binaire import BitWriter, BitReader, FinDeFluxErreur
+
+def encoder(octets, codes):
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(octets, table_de_codage(codes))
+    ecrivain.vider()
+    return ecrivain.valeur()
+
+@pytest.fixture(scope="function")
+def octets_biaises():
+    generateur = random.Random(1)
+    # Occurrences de type Fibonacci : codes très longs
+    poids = [1, 1]
+    while len(poids) < 30:
+        poids.append(poids[-1] + poids[-2])
+    return bytes(generateur.choices(range(30), weights=poids, k=20000)) + bytes(range(30))
+
+@pytest.mark.parametrize("nb_bits_primaire", [1, 4, 10, 12])
+def test_decoder_octets(octets_biaises, nb_bits_primaire):
+    stat = Compteur()
+    for octet in octets_biaises:
+        stat.incrementer(octet)
+    codes = codes_binaire(arbre_de_huffman(stat))
+    decodeur = DecodeurTable(codes, nb_bits_primaire)
+    assert decodeur.longueur_max > nb_bits_primaire
+    donnees = encoder(octets_biaises, codes)
+    assert decodeur.decoder_octets(donnees, len(octets_biaises)) == octets_biaises
+    assert decodeur.decoder(BitReader(donnees), len(octets_biaises)) == octets_biaises
+
+def test_depuis_arbre():
+    arbre = arbre_de_huffman(Compteur({65:4, 66:2, 67:3, 68:2, 69:1, 70:1, 71:2}))
+    decodeur = DecodeurTable.depuis_arbre(arbre)
+    assert decodeur.nb_bits_primaire == 4
+    assert decodeur.decoder_octets(bytes([145,159,105,229,100]), 15) == b"BACFGABDDACEACG"
+
+def test_code_non_prefixe():
+    with pytest.raises(CodeInvalideErreur):
+        DecodeurTable({1: CodeBinaire(Bit.BIT_0), 2: CodeBinaire(Bit.BIT_0, Bit.BIT_1)})
+
+def test_sequence_invalide():
+    decodeur = DecodeurTable({1: CodeBinaire(Bit.BIT_0)})
+    with pytest.raises(CodeInvalideErreur):
+        decodeur.decoder_octets(b"\x01", 1)
+
+def test_donnees_trop_courtes():
+    decodeur = DecodeurTable({1: CodeBinaire(Bit.BIT_0)})
+    with pytest.raises(FinDeFluxErreur):
+        decodeur.decoder_octets(b"\x00", 9)
+
+def poids_fibonacci(nb_symboles):
+    poids = [1, 1]
+    while len(poids) < nb_symboles:
+        poids.append(poids[-1] + poids[-2])
+    return poids
+
+@pytest.mark.parametrize("nb_bits_primaire", [4, 10])
+def test_codes_de_plus_de_64_bits(nb_bits_primaire):
+    # 70 symboles d'occurrences de Fibonacci : le plus long code fait 69 bits
+    codes = codes_binaire(arbre_de_huffman(Compteur(dict(enumerate(poids_fibonacci(70))))))
+    decodeur = DecodeurTable(codes, nb_bits_primaire)
+    assert decodeur.longueur_max == 69
+    octets = bytes(range(70)) * 3 + bytes(reversed(range(70)))
+    donnees = encoder(octets, codes)
+    assert decodeur.decoder_octets(donnees, len(octets)) == octets
+    assert decodeur.decoder(BitReader(donnees), len(octets)) == octets
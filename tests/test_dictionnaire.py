@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import json
+import random
+from huffman import dictionnaire as module_dictionnaire
+from huffman.compresseur import compresser, decompresser, FormatInvalideErreur
+from huffman.dictionnaire import (Dictionnaire, entrainer, enregistrer, sauvegarder, charger,
+                                  compresser_message, decompresser_message, lire_entete_message,
+                                  _encoder_taille, _decoder_taille, DictionnaireInconnuErreur,
+                                  DictionnaireInvalideErreur, ENTETE_MESSAGE)
+
+def message(generateur):
+    return json.dumps({"utilisateur": generateur.randint(0, 10**6),
+                       "action": generateur.choice(["connexion", "achat", "deconnexion"]),
+                       "montant": round(generateur.random() * 100, 2)}).encode()
+
+@pytest.fixture(scope="module")
+def corpus():
+    generateur = random.Random(0)
+    return [message(generateur) for _ in range(500)]
+
+@pytest.fixture(scope="module")
+def dico(corpus):
+    return entrainer(corpus)
+
+@pytest.mark.parametrize("taille", [0, 1, 127, 128, 300, 16383, 16384, 1 << 40])
+def test_taille(taille):
+    encodee = _encoder_taille(taille)
+    assert _decoder_taille(b"x" + encodee, 1) == (taille, 1 + len(encodee))
+    assert len(encodee) == max(1, (taille.bit_length() + 6) // 7)
+
+def test_taille_tronquee():
+    with pytest.raises(FormatInvalideErreur):
+        _decoder_taille(b"\x80\x80", 0)
+
+def test_taille_trop_longue():
+    with pytest.raises(FormatInvalideErreur):
+        _decoder_taille(b"\xff" * 20 + b"\x01", 0)
+    with pytest.raises(ValueError):
+        _encoder_taille(1 << 56)
+
+def test_taille_incoherente_avec_la_charge(dico):
+    compresse = dico.compresser(b"abc")
+    identifiant, _, debut = lire_entete_message(compresse)
+    # Entête demandant des gigaoctets pour une charge de quelques octets
+    falsifie = compresse[:debut - 1] + _encoder_taille(1 << 34) + compresse[debut:]
+    with pytest.raises(FormatInvalideErreur):
+        dico.decompresser(falsifie)
+
+def test_tous_les_octets_ont_un_code(dico):
+    assert sorted(dico.longueurs) == list(range(256))
+    assert max(dico.longueurs.values()) <= 16
+
+@pytest.mark.parametrize("octets", [b"", b"a", bytes(range(256)), bytes([0xFF]) * 1000])
+def test_aller_retour_octets_quelconques(dico, octets):
+    compresse = compresser_message(octets, dico)
+    assert decompresser_message(compresse, dico) == octets
+
+def test_petits_messages(dico):
+    generateur = random.Random(1)
+    for _ in range(50):
+        octets = message(generateur)
+        compresse = compresser_message(octets, dico)
+        identifiant, taille, debut = lire_entete_message(compresse)
+        assert (identifiant, taille) == (dico.identifiant, len(octets))
+        assert debut == len(ENTETE_MESSAGE) + 4 + 1
+        assert len(compresse) < len(octets)
+        assert decompresser_message(compresse, dico) == octets
+
+def test_identifiant(corpus):
+    assert entrainer(corpus).identifiant == entrainer(corpus).identifiant
+    assert entrainer(corpus, identifiant=7).identifiant == 7
+    assert entrainer(corpus[:10]).identifiant != entrainer(corpus).identifiant
+
+@pytest.mark.parametrize("identifiant", [-1, 1 << 32])
+def test_identifiant_invalide(corpus, identifiant):
+    with pytest.raises(DictionnaireInvalideErreur):
+        entrainer(corpus, identifiant)
+
+def test_longueurs_incompletes():
+    with pytest.raises(DictionnaireInvalideErreur):
+        Dictionnaire({octet: 8 for octet in range(255)})
+
+def test_longueurs_invalides():
+    with pytest.raises(DictionnaireInvalideErreur):
+        Dictionnaire({octet: 1 for octet in range(256)})
+
+def test_mauvais_dictionnaire(corpus, dico):
+    autre = entrainer(corpus, identifiant=dico.identifiant + 1)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_message(compresser_message(b"abc", dico), autre)
+
+@pytest.mark.parametrize("compresse", [b"", b"42\x03", b"42\x06\x00\x00", b"42\x06\x00\x00\x00\x01"])
+def test_entete_invalide(dico, compresse):
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_message(compresse, dico)
+
+def test_charge_tronquee(dico):
+    compresse = compresser_message(b"x" * 100, dico)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_message(compresse[:-5], dico)
+
+def test_dictionnaire_inconnu(monkeypatch, dico):
+    monkeypatch.setattr(module_dictionnaire, "_DICTIONNAIRES", {})
+    with pytest.raises(DictionnaireInconnuErreur):
+        decompresser_message(compresser_message(b"abc", dico))
+    enregistrer(dico)
+    assert decompresser_message(compresser_message(b"abc", dico)) == b"abc"
+
+def test_ecrire_lire(dico):
+    tampon = io.BytesIO()
+    dico.ecrire(tampon)
+    relu = Dictionnaire.lire(io.BytesIO(tampon.getvalue()))
+    assert relu.identifiant == dico.identifiant
+    assert relu.longueurs == dico.longueurs
+    assert relu.compresser(b"message") == dico.compresser(b"message")
+
+@pytest.mark.parametrize("contenu", [b"", b"42D", b"XYD\x00\x00\x00\x01\x00\x00",
+                                     b"42D\x00\x00\x00\x01\x00\x05abc"])
+def test_lire_invalide(contenu):
+    with pytest.raises(FormatInvalideErreur):
+        Dictionnaire.lire(io.BytesIO(contenu))
+
+def test_charger_une_fois(monkeypatch, tmp_path, dico):
+    monkeypatch.setattr(module_dictionnaire, "_DICTIONNAIRES", {})
+    monkeypatch.setattr(module_dictionnaire, "_FICHIERS_CHARGES", {})
+    chemin = tmp_path / "messages.dico"
+    sauvegarder(dico, str(chemin))
+    charge = charger(str(chemin))
+    chemin.write_bytes(b"")
+    assert charger(str(chemin)) is charge
+    compresse = compresser_message(b"bonjour", dico)
+    assert decompresser_message(compresse) == b"bonjour"
+
+def test_decompresser_fichier(monkeypatch, dico):
+    monkeypatch.setattr(module_dictionnaire, "_DICTIONNAIRES", {})
+    enregistrer(dico)
+    octets = message(random.Random(2))
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(compresser_message(octets, dico)), destination)
+    assert destination.getvalue() == octets
+
+def test_plus_court_que_le_mode_canonique(corpus, dico):
+    octets = message(random.Random(3))
+    destination = io.BytesIO()
+    compresser(io.BytesIO(octets), destination)
+    assert len(compresser_message(octets, dico)) < len(destination.getvalue())
@@ -59,3 +59,55 @@ def test_vide_erreur(file_vide):
 def test_non_comparable_erreur(file_non_vide):
     with pytest.raises(ElementNonComparableErreur):
         file_non_vide.enfiler("a")
+
+def test_defiler_ordre_croissant():
+    file = FileDePriorite((5,3,8,1,9,2,7))
+    assert [file.defiler() for _ in range(7)] == [1,2,3,5,7,8,9]
+    assert file.est_vide
+
+def test_iteration_triee(file_non_vide):
+    assert list(file_non_vide) == [1,2,3,4,5]
+    assert len(file_non_vide) == 5
+
+def test_egalite_cle_identique_ordre_arrivee():
+    file = FileDePriorite((("b",1),("a",1),("c",0)), cle=lambda e: e[1])
+    assert [file.defiler() for _ in range(3)] == [("c",0),("b",1),("a",1)]
+
+def test_enfiler_defiler(file_non_vide):
+    assert file_non_vide.enfiler_defiler(0) == 0
+    assert file_non_vide.enfiler_defiler(6) == 1
+    assert list(file_non_vide) == [2,3,4,5,6]
+
+def test_remplacer(file_non_vide):
+    assert file_non_vide.remplacer(0) == 1
+    assert file_non_vide.element == 0
+    assert list(file_non_vide) == [0,2,3,4,5]
+
+def test_remplacer_vide_erreur(file_vide):
+    with pytest.raises(FileDePrioriteVideErreur):
+        file_vide.remplacer(1)
+
+def test_non_comparable_erreur_construction():
+    with pytest.raises(ElementNonComparableErreur):
+        FileDePriorite((1, "a"))
+
+class Capricieux:
+    # Clé comparable à 1 et à elle-même seulement
+    def __lt__(self, autre):
+        if autre is not self and autre != 1:
+            raise TypeError("non comparable")
+        return False
+
+    __gt__ = __lt__
+
+@pytest.mark.parametrize("operation", ["enfiler", "remplacer"])
+def test_non_comparable_hors_tete(operation):
+    file = FileDePriorite((1, 5, 3))
+    with pytest.raises(ElementNonComparableErreur):
+        getattr(file, operation)(Capricieux())
+    assert list(file) == [1, 3, 5]
+    assert file.element == 1
+
+def test_file_ordre_du_tas(file_non_vide):
+    assert file_non_vide.file[0] == 1
+    assert sorted(file_non_vide.file) == list(file_non_vide)
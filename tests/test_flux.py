@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from huffman.compresseur import decompresser, FormatInvalideErreur
+from huffman.flux import (compressobj, decompressobj, compresser_flux, decompresser_flux,
+                          FluxTermineErreur)
+
+class FluxNonPositionnable(io.RawIOBase):
+    ''' Flux en lecture seule qui ne supporte pas seek, comme un tube. '''
+    def __init__(self, donnees, taille_lecture=1000):
+        self._donnees = io.BytesIO(donnees)
+        self._taille_lecture = taille_lecture
+
+    def readable(self):
+        return True
+
+    def read(self, taille=-1):
+        return self._donnees.read(min(taille, self._taille_lecture))
+
+class ExecuteurEnregistre(ThreadPoolExecutor):
+    ''' Exécuteur qui compte les tâches qui lui sont soumises. '''
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.nb_taches = 0
+
+    def submit(self, *args, **kwargs):
+        self.nb_taches += 1
+        return super().submit(*args, **kwargs)
+
+@pytest.fixture(scope="function")
+def octets():
+    generateur = random.Random(5)
+    mots = [bytes(generateur.choices(b"abcdefgh ", k=generateur.randint(1, 8))) for _ in range(50)]
+    return b"".join(generateur.choices(mots, k=20000))
+
+def compresser_par_morceaux(octets, taille_bloc, taille_morceau):
+    compresseur = compressobj(taille_bloc)
+    morceaux = [compresseur.compress(octets[i:i + taille_morceau])
+                for i in range(0, len(octets), taille_morceau)]
+    return b"".join(morceaux) + compresseur.flush()
+
+@pytest.mark.parametrize("taille_bloc, taille_morceau", [(1 << 20, 100000), (4096, 777), (100, 1)])
+def test_aller_retour(octets, taille_bloc, taille_morceau):
+    compresse = compresser_par_morceaux(octets[:30000], taille_bloc, taille_morceau)
+    decompresseur = decompressobj()
+    resultat = b"".join(decompresseur.decompress(compresse[i:i + 333])
+                        for i in range(0, len(compresse), 333))
+    assert resultat == octets[:30000]
+    assert decompresseur.eof
+
+def test_flux_vide():
+    compresseur = compressobj()
+    compresse = compresseur.compress(b"") + compresseur.flush()
+    decompresseur = decompressobj()
+    assert decompresseur.decompress(compresse) == b""
+    assert decompresseur.eof
+
+def test_blocs_produits_au_fil_de_l_eau(octets):
+    compresseur = compressobj(taille_bloc=1000)
+    assert len(compresseur.compress(octets[:999])) == 3
+    assert len(compresseur.compress(octets[999:2500])) > 3
+
+def test_max_length(octets):
+    compresse = compresser_par_morceaux(octets, 4096, 10000)
+    decompresseur = decompressobj()
+    morceaux = [decompresseur.decompress(compresse, max_length=1000)]
+    while not decompresseur.needs_input and not (decompresseur.eof and not morceaux[-1]):
+        morceaux.append(decompresseur.decompress(b"", max_length=1000))
+        assert len(morceaux[-1]) <= 1000
+    assert b"".join(morceaux) == octets
+
+def test_unused_data():
+    compresseur = compressobj()
+    compresse = compresseur.compress(b"abc") + compresseur.flush()
+    decompresseur = decompressobj()
+    assert decompresseur.decompress(compresse + b"suite") == b"abc"
+    assert decompresseur.unused_data == b"suite"
+
+def test_flux_termine_erreur():
+    compresseur = compressobj()
+    compresseur.flush()
+    with pytest.raises(FluxTermineErreur):
+        compresseur.compress(b"a")
+
+def test_entete_invalide():
+    with pytest.raises(FormatInvalideErreur):
+        decompressobj().decompress(b"43\x04")
+
+def test_flux_non_positionnable(octets):
+    compresse = io.BytesIO()
+    compresser_flux(FluxNonPositionnable(octets), compresse, taille_bloc=8192)
+    destination = io.BytesIO()
+    decompresser_flux(FluxNonPositionnable(compresse.getvalue()), destination)
+    assert destination.getvalue() == octets
+
+@pytest.mark.parametrize("index", [False, True])
+def test_decompresser_mode_blocs(octets, index):
+    compresse = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), compresse, taille_bloc=8192, index=index)
+    destination = io.BytesIO()
+    decompresser(io.BytesIO(compresse.getvalue()), destination)
+    assert destination.getvalue() == octets
+
+def test_decompression_executeur(octets):
+    compresse = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), compresse, taille_bloc=8192, nb_flux=4)
+    with ExecuteurEnregistre() as executeur:
+        destination = io.BytesIO()
+        decompresser_flux(io.BytesIO(compresse.getvalue()), destination, executeur=executeur)
+        assert destination.getvalue() == octets
+        nb_blocs = -(-len(octets) // 8192)
+        assert executeur.nb_taches == 4 * nb_blocs
+
+def test_flux_tronque(octets):
+    compresse = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), compresse, taille_bloc=8192)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_flux(io.BytesIO(compresse.getvalue()[:-20]), io.BytesIO())
+
+def test_octets_aleatoires():
+    octets = os.urandom(5000)
+    compresseur = compressobj(taille_bloc=2048, max_bits=11)
+    compresse = compresseur.compress(octets) + compresseur.flush()
+    assert decompressobj().decompress(compresse) == octets
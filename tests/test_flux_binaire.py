@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from huffman.flux_binaire import BitWriter, BitReader, FinDeFluxErreur, inverser_bits
+from huffman.code_binaire import CodeBinaire, Bit
+
+@pytest.fixture(scope="function")
+def codes():
+    generateur = random.Random(42)
+    longueurs = [generateur.randint(1, 40) for _ in range(2000)]
+    return [(generateur.getrandbits(l), l) for l in longueurs]
+
+def test_ecrire_poids_faible_en_premier():
+    ecrivain = BitWriter()
+    ecrivain.ecrire_code(CodeBinaire(Bit.BIT_1, Bit.BIT_0, Bit.BIT_0))
+    ecrivain.ecrire_code(CodeBinaire(Bit.BIT_0, Bit.BIT_1))
+    ecrivain.ecrire_code(CodeBinaire(Bit.BIT_0, Bit.BIT_0))
+    ecrivain.ecrire_code(CodeBinaire(Bit.BIT_1))
+    assert ecrivain.valeur() == bytes([145])
+
+@pytest.mark.parametrize("valeur, longueur, resultat",
+                         [(0b1, 1, 0b1), (0b100, 3, 0b001), (0b1101, 4, 0b1011), (0, 0, 0)])
+def test_inverser_bits(valeur, longueur, resultat):
+    assert inverser_bits(valeur, longueur) == resultat
+
+def test_vider_remplissage():
+    destination = io.BytesIO()
+    ecrivain = BitWriter(destination)
+    ecrivain.ecrire_code(CodeBinaire(Bit.BIT_1, Bit.BIT_1, Bit.BIT_0))
+    assert ecrivain.vider() == 5
+    assert destination.getvalue() == bytes([0b00000011])
+
+def test_ecrire_octets():
+    table = [(0, 0)] * 256
+    table[65], table[66] = (0b0, 1), (0b11, 2)
+    ecrivain = BitWriter()
+    ecrivain.ecrire_octets(b"ABBA" * 20, table)
+    ecrivain.vider()
+    assert ecrivain.valeur() == bytes([0b10011110, 0b11100111, 0b01111001]) * 5
+
+@pytest.mark.parametrize("taille_tampon", [1, 7, 1 << 16])
+def test_aller_retour_flux(codes, taille_tampon):
+    destination = io.BytesIO()
+    ecrivain = BitWriter(destination, taille_tampon)
+    for valeur, longueur in codes:
+        ecrivain.ecrire(valeur, longueur)
+    ecrivain.vider()
+    destination.seek(0)
+    lecteur = BitReader(destination, taille_tampon)
+    assert [lecteur.lire(longueur) for _, longueur in codes] == [valeur for valeur, _ in codes]
+
+def test_aller_retour_memoryview(codes):
+    ecrivain = BitWriter()
+    for valeur, longueur in codes:
+        ecrivain.ecrire(valeur, longueur)
+    ecrivain.vider()
+    lecteur = BitReader(memoryview(ecrivain.valeur()))
+    assert [lecteur.lire(longueur) for _, longueur in codes] == [valeur for valeur, _ in codes]
+
+def test_voir_completer_par_zeros():
+    lecteur = BitReader(bytes([0b00000101]))
+    assert lecteur.voir(12) == 0b000000000101
+    lecteur.consommer(3)
+    assert lecteur.voir(2) == 0b00
+
+def test_fin_de_flux():
+    lecteur = BitReader(b"\xff")
+    lecteur.lire(6)
+    with pytest.raises(FinDeFluxErreur):
+        lecteur.lire(3)
+
+def test_est_epuise():
+    lecteur = BitReader(io.BytesIO(b"\x01"))
+    assert not lecteur.est_epuise
+    lecteur.lire(8)
+    assert lecteur.est_epuise
+
+def test_lire_octets():
+    lecteur = BitReader(io.BytesIO(b"\x0fabcdefghijkl"), 4)
+    assert lecteur.lire(3) == 0b111
+    assert lecteur.lire_octets(5) == b"abcde"
+    assert lecteur.lire(8) == ord("f")
+    assert lecteur.lire_octets(6) == b"ghijkl"
+    with pytest.raises(FinDeFluxErreur):
+        lecteur.lire_octets(1)
+
+def table_aleatoire(generateur, longueur_max):
+    table = []
+    for _ in range(256):
+        longueur = generateur.randint(0, longueur_max)
+        table.append((generateur.getrandbits(longueur) if longueur else 0, longueur))
+    return table
+
+@pytest.mark.parametrize("longueur_max", [1, 8, 20, 63, 64, 100])
+@pytest.mark.parametrize("nb_bits_prealables", [0, 3, 61])
+def test_ecrire_octets_numpy_identique(longueur_max, nb_bits_prealables):
+    generateur = random.Random(longueur_max * 100 + nb_bits_prealables)
+    table = table_aleatoire(generateur, longueur_max)
+    donnees = bytes(generateur.choices(range(256), k=20000))
+    resultats = []
+    for utiliser_numpy in [True, False]:
+        ecrivain = BitWriter(utiliser_numpy=utiliser_numpy)
+        ecrivain.ecrire((1 << nb_bits_prealables) - 1, nb_bits_prealables)
+        ecrivain.ecrire_octets(donnees, table)
+        ecrivain.ecrire_octets(memoryview(donnees)[:5000], table)
+        ecrivain.ecrire(5, 3)
+        nb_bits = ecrivain.nb_bits_ecrits
+        ecrivain.vider()
+        resultats.append((nb_bits, ecrivain.valeur()))
+    assert resultats[0] == resultats[1]
+
+def test_ecrire_octets_numpy_destination():
+    generateur = random.Random(2)
+    table = table_aleatoire(generateur, 30)
+    donnees = bytes(generateur.choices(range(256), k=50000))
+    destinations = []
+    for utiliser_numpy in [True, False]:
+        destination = io.BytesIO()
+        ecrivain = BitWriter(destination, taille_tampon=1000, utiliser_numpy=utiliser_numpy)
+        ecrivain.ecrire_octets(donnees, table)
+        ecrivain.vider()
+        destinations.append(destination.getvalue())
+    assert destinations[0] == destinations[1]
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor
+import huffman.lecteur_indexe
+from huffman.blocs import lire_entete_bloc, TAILLE_ENTETE_BLOC, TYPE_FIN, TYPE_INDEX
+from huffman.compresseur import FormatInvalideErreur
+from huffman.flux import compresser_flux, decompresser_flux
+from huffman.lecteur_indexe import LecteurIndexe
+from huffman.parallele import compresser_parallele, decompresser_parallele
+
+TAILLE_BLOC = 1000
+
+class ExecuteurEnregistre(ThreadPoolExecutor):
+    ''' Exécuteur qui compte les tâches qui lui sont soumises. '''
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.nb_taches = 0
+
+    def submit(self, *args, **kwargs):
+        self.nb_taches += 1
+        return super().submit(*args, **kwargs)
+
+@pytest.fixture(scope="module")
+def octets():
+    generateur = random.Random(11)
+    mots = [bytes(generateur.choices(b"abcdefgh ", k=generateur.randint(1, 8))) for _ in range(50)]
+    return b"".join(generateur.choices(mots, k=2000))[:9500]
+
+def compresser(octets, index=True):
+    destination = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), destination, TAILLE_BLOC, index=index)
+    return destination.getvalue()
+
+def test_bloc_index(octets):
+    compresse = compresser(octets)
+    type_bloc, taille_index, _ = lire_entete_bloc(compresse, len(compresse) - TAILLE_ENTETE_BLOC)
+    assert type_bloc == TYPE_FIN
+    debut_index = len(compresse) - TAILLE_ENTETE_BLOC - taille_index
+    assert lire_entete_bloc(compresse, debut_index)[0] == TYPE_INDEX
+
+@pytest.mark.parametrize("index", [True, False])
+def test_decompression_sequentielle(octets, index):
+    compresse = compresser(octets, index)
+    destination = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse), destination)
+    assert destination.getvalue() == octets
+    destination = io.BytesIO()
+    decompresser_parallele(io.BytesIO(compresse), destination, 2)
+    assert destination.getvalue() == octets
+
+@pytest.mark.parametrize("index", [True, False])
+def test_lecture_aleatoire(octets, index):
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets, index)))
+    assert lecteur.taille == len(octets)
+    generateur = random.Random(3)
+    for _ in range(50):
+        debut = generateur.randrange(len(octets) + 10)
+        taille = generateur.randrange(3 * TAILLE_BLOC)
+        assert lecteur.seek(debut) == debut
+        assert lecteur.read(taille) == octets[debut:debut + taille]
+        assert lecteur.tell() == max(debut, min(debut + taille, len(octets)))
+
+def test_lecture_complete(octets):
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets)))
+    assert lecteur.read() == octets
+    assert lecteur.read(10) == b""
+    lecteur.seek(0)
+    assert io.BufferedReader(lecteur).read() == octets
+
+def test_readinto(octets):
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets)))
+    lecteur.seek(TAILLE_BLOC - 10)
+    tampon = bytearray(100)
+    # readinto s'arrête à la fin du bloc courant
+    assert lecteur.readinto(tampon) == 10
+    assert tampon[:10] == octets[TAILLE_BLOC - 10:TAILLE_BLOC]
+    assert lecteur.readinto(tampon) == 100
+    assert tampon == octets[TAILLE_BLOC:TAILLE_BLOC + 100]
+
+def test_seek(octets):
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets)))
+    assert lecteur.seek(-5, io.SEEK_END) == len(octets) - 5
+    assert lecteur.read() == octets[-5:]
+    lecteur.seek(100)
+    assert lecteur.seek(-50, io.SEEK_CUR) == 50
+    with pytest.raises(ValueError):
+        lecteur.seek(-1)
+    with pytest.raises(ValueError):
+        lecteur.seek(0, 3)
+
+def test_blocs_decodes(octets, monkeypatch):
+    decodes = []
+    decoder_bloc = huffman.lecteur_indexe.decoder_bloc
+    def decoder_bloc_compte(type_bloc, taille, corps, **options):
+        decodes.append(taille)
+        return decoder_bloc(type_bloc, taille, corps, **options)
+    monkeypatch.setattr(huffman.lecteur_indexe, "decoder_bloc", decoder_bloc_compte)
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets)))
+    lecteur.seek(5 * TAILLE_BLOC + 10)
+    assert lecteur.read(20) == octets[5 * TAILLE_BLOC + 10:5 * TAILLE_BLOC + 30]
+    assert lecteur.read(20) == octets[5 * TAILLE_BLOC + 30:5 * TAILLE_BLOC + 50]
+    assert len(decodes) == 1
+
+def test_compression_parallele(octets):
+    destination = io.BytesIO()
+    compresser_parallele(io.BytesIO(octets), destination, TAILLE_BLOC, 2, index=True)
+    assert destination.getvalue() == compresser(octets)
+    lecteur = LecteurIndexe(io.BytesIO(destination.getvalue()))
+    lecteur.seek(4321)
+    assert lecteur.read(1234) == octets[4321:4321 + 1234]
+
+def test_executeur(octets):
+    destination = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), destination, TAILLE_BLOC, index=True, nb_flux=2)
+    with ExecuteurEnregistre() as executeur:
+        lecteur = LecteurIndexe(io.BytesIO(destination.getvalue()), executeur)
+        lecteur.seek(2500)
+        assert lecteur.read(1000) == octets[2500:3500]
+        # Deux blocs de deux sous-flux chacun
+        assert executeur.nb_taches == 2 * 2
+
+def test_fichier_vide():
+    lecteur = LecteurIndexe(io.BytesIO(compresser(b"")))
+    assert lecteur.taille == 0
+    assert lecteur.read() == b""
+
+@pytest.mark.parametrize("compresse", [b"", b"42\x04", b"42\x04\x01" + bytes(8)])
+def test_format_invalide(compresse):
+    with pytest.raises(FormatInvalideErreur):
+        LecteurIndexe(io.BytesIO(compresse))
+
+def modifier_index(compresse, numero, valeur):
+    ''' Remplace la valeur de rang `numero` du corps du bloc d'index. '''
+    _, taille_index, _ = lire_entete_bloc(compresse, len(compresse) - TAILLE_ENTETE_BLOC)
+    debut = len(compresse) - TAILLE_ENTETE_BLOC - taille_index + TAILLE_ENTETE_BLOC + 8 * numero
+    return compresse[:debut] + valeur.to_bytes(8, byteorder="big") + compresse[debut + 8:]
+
+@pytest.mark.parametrize("numero, valeur", [(-1, 9600), (-1, 9400), (-1, 0), (0, 0), (2, 3)])
+def test_index_incoherent(octets, numero, valeur):
+    compresse = compresser(octets)
+    nb_valeurs = 2 * 10 + 1
+    with pytest.raises(FormatInvalideErreur):
+        LecteurIndexe(io.BytesIO(modifier_index(compresse, numero % nb_valeurs, valeur)))
+
+def test_taille_de_bloc_incoherente(octets):
+    # Le deuxième bloc commence un octet trop tard d'après l'index
+    lecteur = LecteurIndexe(io.BytesIO(modifier_index(compresser(octets), 3, TAILLE_BLOC + 1)))
+    with pytest.raises(FormatInvalideErreur):
+        lecteur.read()
+
+def test_lecture_sans_progression(octets, monkeypatch):
+    lecteur = LecteurIndexe(io.BytesIO(compresser(octets)))
+    monkeypatch.setattr(lecteur, "readinto", lambda tampon: 0)
+    with pytest.raises(FormatInvalideErreur):
+        lecteur.read()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from huffman.arbre_huffman import ArbreHuffman
+from huffman.compresseur import (arbre_de_huffman, arbre_de_huffman_limite, codes_binaire,
+                                 cout_longueur_limitee, compresser, decompresser)
+from huffman.compteur import Compteur
+from huffman.longueur_limitee import (longueurs_package_merge, arbre_depuis_longueurs, cout,
+                                      LongueurMaxInsuffisanteErreur, LongueursIncompletesErreur)
+
+@pytest.fixture(scope="function")
+def poids_fibonacci():
+    poids = [1, 1]
+    while len(poids) < 20:
+        poids.append(poids[-1] + poids[-2])
+    return dict(enumerate(poids))
+
+def test_sans_contrainte_effective():
+    stat = Compteur({65:4, 66:2, 67:3, 68:2, 69:1, 70:1, 71:2})
+    limite, optimal = cout_longueur_limitee(stat, 15)
+    assert limite == optimal == 40
+
+@pytest.mark.parametrize("max_bits", [5, 8, 11, 15])
+def test_longueurs_limitees(poids_fibonacci, max_bits):
+    longueurs = longueurs_package_merge(poids_fibonacci, max_bits)
+    assert max(longueurs.values()) <= max_bits
+    assert sum(2 ** -l for l in longueurs.values()) == 1
+
+def test_cout_limite_superieur(poids_fibonacci):
+    stat = Compteur(poids_fibonacci)
+    limite, optimal = cout_longueur_limitee(stat, 8)
+    assert max(len(code) for code in codes_binaire(arbre_de_huffman(stat)).values()) > 8
+    assert limite > optimal
+
+def test_arbre_limite(poids_fibonacci):
+    stat = Compteur(poids_fibonacci)
+    codes = codes_binaire(arbre_de_huffman_limite(stat, 6))
+    assert max(len(code) for code in codes.values()) == 6
+    assert sum(stat.nb_occurrences(e) * len(c) for e, c in codes.items()) == \
+        cout_longueur_limitee(stat, 6)[0]
+
+def test_arbre_un_element():
+    assert arbre_de_huffman_limite(Compteur({7: 3}), 1).equivalent(ArbreHuffman(7, 3))
+
+def test_max_bits_insuffisant(poids_fibonacci):
+    with pytest.raises(LongueurMaxInsuffisanteErreur):
+        longueurs_package_merge(poids_fibonacci, 4)
+
+def test_longueurs_incompletes():
+    with pytest.raises(LongueursIncompletesErreur):
+        arbre_depuis_longueurs({1: 1, 2: 1}, {1: 1, 2: 2})
+
+def test_cout():
+    assert cout({1: 3, 2: 5}, {1: 2, 2: 1}) == 11
+
+def test_compresser_canonique_limite():
+    generateur = random.Random(3)
+    octets = bytes(generateur.choices(range(40), weights=[2 ** min(i, 30) for i in range(40)],
+                                      k=50000)) + bytes(range(40))
+    compresse = io.BytesIO()
+    compresser(io.BytesIO(octets), compresse, canonique=True, max_bits=11)
+    compresse.seek(0)
+    destination = io.BytesIO()
+    decompresser(compresse, destination)
+    assert destination.getvalue() == octets
+
+def test_compresser_limite_sans_canonique():
+    with pytest.raises(ValueError):
+        compresser(io.BytesIO(b"abc"), io.BytesIO(), max_bits=11)
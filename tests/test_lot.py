@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor
+from huffman.codec import codec_pour
+from huffman.compresseur import compresser, decompresser, FormatInvalideErreur
+from huffman.compteur_octets import CompteurOctets
+from huffman.format_fichier import MODE_CANONIQUE
+from huffman.lot import (compresser_plusieurs, decompresser_plusieurs, compresser_tampon,
+                         decompresser_tampon)
+
+@pytest.fixture(scope="module")
+def tampons():
+    generateur = random.Random(4)
+    return [bytes(generateur.choices(b"abcdefgh{}:,\" ", k=generateur.randint(0, 600)))
+            for _ in range(60)] + [b"", b"z", bytes(range(256))]
+
+def compresse_par_fichier(octets, canonique=False, max_bits=None):
+    destination = io.BytesIO()
+    compresser(io.BytesIO(octets), destination, canonique, max_bits)
+    return destination.getvalue()
+
+@pytest.mark.parametrize("canonique, max_bits", [(False, None), (True, None), (True, 9)])
+def test_identique_a_compresser(tampons, canonique, max_bits):
+    for octets in tampons:
+        assert (compresser_tampon(octets, canonique=canonique, max_bits=max_bits)
+                == compresse_par_fichier(octets, canonique, max_bits))
+
+def test_decompresser_tampon(tampons):
+    for octets in tampons:
+        assert decompresser_tampon(compresse_par_fichier(octets)) == octets
+
+@pytest.mark.parametrize("nb_travailleurs, processus", [(1, None), (3, False), (2, True)])
+@pytest.mark.parametrize("table_commune", [False, True])
+def test_aller_retour(tampons, nb_travailleurs, processus, table_commune):
+    compresses = compresser_plusieurs(tampons, nb_travailleurs, processus,
+                                      table_commune=table_commune, canonique=True)
+    assert len(compresses) == len(tampons)
+    if not table_commune:
+        assert compresses == [compresse_par_fichier(octets, True) for octets in tampons]
+    assert decompresser_plusieurs(compresses, nb_travailleurs, processus) == tampons
+    for octets, compresse in zip(tampons, compresses):
+        destination = io.BytesIO()
+        decompresser(io.BytesIO(compresse), destination)
+        assert destination.getvalue() == octets
+
+def test_table_commune(tampons):
+    compresses = compresser_plusieurs(tampons, 1, table_commune=True, canonique=False)
+    entetes = {compresse[7:7 + 4 * 256] for compresse in compresses}
+    assert len(entetes) == 1
+
+def test_table_commune_canonique_par_defaut(tampons):
+    compresses = compresser_plusieurs(tampons, 1, table_commune=True)
+    assert {compresse[2] for compresse in compresses} == {MODE_CANONIQUE}
+    occurrences = compresser_plusieurs(tampons, 1, table_commune=True, canonique=False)
+    assert sum(map(len, compresses)) < sum(map(len, occurrences))
+    assert decompresser_plusieurs(compresses, 1) == tampons
+
+def test_tampon_sans_code():
+    codec = codec_pour(CompteurOctets({ord("a"): 3, ord("b"): 1}))
+    assert decompresser_tampon(compresser_tampon(b"abba", codec=codec)) == b"abba"
+    with pytest.raises(ValueError):
+        compresser_tampon(b"abc", codec=codec)
+
+def test_executeur_fourni(tampons):
+    with ThreadPoolExecutor(max_workers=2) as executeur:
+        compresses = compresser_plusieurs(iter(tampons), executeur=executeur)
+        assert decompresser_plusieurs(compresses, executeur=executeur) == tampons
+
+def test_lot_vide():
+    assert compresser_plusieurs([], table_commune=True) == []
+    assert decompresser_plusieurs([]) == []
+
+def test_max_bits_hors_canonique(tampons):
+    with pytest.raises(ValueError):
+        compresser_plusieurs(tampons, max_bits=8)
+
+def test_tampon_invalide(tampons):
+    compresses = compresser_plusieurs(tampons[:3], 1)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_plusieurs(compresses + [b"43"], 2, processus=False)
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+from huffman.blocs import lire_blocs
+from huffman.compresseur import FormatInvalideErreur
+from huffman.flux import compresser_flux, decompresser_flux
+from huffman.compresseur import statistiques
+from huffman.parallele import compresser_parallele, decompresser_parallele, statistiques_parallele
+
+@pytest.fixture(scope="module")
+def octets():
+    generateur = random.Random(9)
+    return bytes(generateur.choices(b"abcdefghij  \n", k=50000))
+
+@pytest.mark.parametrize("nb_flux", [1, 4])
+def test_identique_au_flux_sequentiel(octets, nb_flux):
+    parallele = io.BytesIO()
+    compresser_parallele(io.BytesIO(octets), parallele, taille_bloc=4096, nb_processus=2,
+                         nb_flux=nb_flux)
+    sequentiel = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), sequentiel, taille_bloc=4096, nb_flux=nb_flux)
+    assert parallele.getvalue() == sequentiel.getvalue()
+
+class FluxLecturesCourtes(io.RawIOBase):
+    ''' Flux qui retourne au plus 1000 octets par lecture, comme un tube. '''
+    def __init__(self, donnees):
+        self._donnees = io.BytesIO(donnees)
+
+    def readable(self):
+        return True
+
+    def read(self, taille=-1):
+        return self._donnees.read(min(taille, 1000))
+
+def test_lectures_courtes(octets):
+    parallele = io.BytesIO()
+    compresser_parallele(FluxLecturesCourtes(octets), parallele, taille_bloc=4096, nb_processus=2)
+    sequentiel = io.BytesIO()
+    compresser_flux(io.BytesIO(octets), sequentiel, taille_bloc=4096)
+    assert parallele.getvalue() == sequentiel.getvalue()
+
+def test_aller_retour(octets):
+    compresse = io.BytesIO()
+    compresser_parallele(io.BytesIO(octets), compresse, taille_bloc=3000, nb_processus=2)
+    assert len(list(lire_blocs(io.BytesIO(compresse.getvalue())))) == 17
+    destination = io.BytesIO()
+    decompresser_parallele(io.BytesIO(compresse.getvalue()), destination, nb_processus=2)
+    assert destination.getvalue() == octets
+    destination = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse.getvalue()), destination)
+    assert destination.getvalue() == octets
+
+def test_source_vide():
+    compresse = io.BytesIO()
+    compresser_parallele(io.BytesIO(b""), compresse, nb_processus=1)
+    destination = io.BytesIO()
+    decompresser_parallele(io.BytesIO(compresse.getvalue()), destination, nb_processus=1)
+    assert destination.getvalue() == b""
+
+def test_flux_tronque(octets):
+    compresse = io.BytesIO()
+    compresser_parallele(io.BytesIO(octets), compresse, taille_bloc=8192, nb_processus=1)
+    with pytest.raises(FormatInvalideErreur):
+        decompresser_parallele(io.BytesIO(compresse.getvalue()[:-30]), io.BytesIO(), nb_processus=1)
+
+@pytest.mark.parametrize("taille_plage", [None, 1000, 4093, 1 << 20])
+def test_statistiques_parallele(tmp_path, octets, taille_plage):
+    chemin = tmp_path / "donnees"
+    chemin.write_bytes(octets)
+    stat, taille = statistiques_parallele(str(chemin), nb_processus=2, taille_plage=taille_plage)
+    attendu, taille_attendue = statistiques(io.BytesIO(octets))
+    assert taille == taille_attendue
+    assert stat == attendu
+
+def test_statistiques_parallele_fichier_vide(tmp_path):
+    chemin = tmp_path / "vide"
+    chemin.write_bytes(b"")
+    stat, taille = statistiques_parallele(str(chemin), nb_processus=2)
+    assert (stat.elements, taille) == (set(), 0)
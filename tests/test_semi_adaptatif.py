@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import pytest
+import io
+import random
+import huffman.lecteur_indexe
+from huffman.blocs import (decoder_bloc, lire_blocs, encoder_bloc_codes, codes_du_bloc,
+                           TYPE_HUFFMAN, TYPE_HUFFMAN_TABLE_PRECEDENTE, TAILLE_ENTETE_BLOC)
+from huffman.compresseur import compresser, entropie, FormatInvalideErreur
+from huffman.compteur import Compteur
+from huffman.flux import compresser_flux, decompresser_flux
+from huffman.lecteur_indexe import LecteurIndexe
+from huffman.parallele import decompresser_parallele
+from huffman.semi_adaptatif import CompresseurSemiAdaptatif, compresser_semi_adaptatif
+
+TAILLE_FENETRE = 4096
+
+def texte(generateur, alphabet, taille):
+    return bytes(generateur.choices(alphabet, weights=range(len(alphabet), 0, -1), k=taille))
+
+@pytest.fixture(scope="module")
+def stationnaire():
+    return texte(random.Random(1), b"abcdefgh \n", 20 * TAILLE_FENETRE)
+
+@pytest.fixture(scope="module")
+def derive():
+    ''' Journal dont le contenu change trois fois de nature. '''
+    generateur = random.Random(2)
+    return b"".join(texte(generateur, alphabet, 8 * TAILLE_FENETRE)
+                    for alphabet in [b"abcdefgh \n", b"0123456789:-. \n", b"ABCDEFGHIJ", b"abcdefgh \n"])
+
+def types_blocs(compresse):
+    return [type_bloc for type_bloc, _, _ in lire_blocs(io.BytesIO(compresse))]
+
+def compresser_semi(octets, index=False):
+    destination = io.BytesIO()
+    nb_tables = compresser_semi_adaptatif(io.BytesIO(octets), destination, TAILLE_FENETRE,
+                                          index=index)
+    return destination.getvalue(), nb_tables
+
+def test_entropie():
+    assert entropie(Compteur({1: 4})) == 0
+    assert entropie(Compteur({1: 2, 2: 2})) == 4
+    assert entropie(Compteur({1: 1, 2: 1, 3: 2})) == 6
+
+def test_stationnaire_une_table(stationnaire):
+    compresse, nb_tables = compresser_semi(stationnaire)
+    assert nb_tables == 1
+    types = types_blocs(compresse)
+    assert types[0] == TYPE_HUFFMAN
+    assert set(types[1:]) == {TYPE_HUFFMAN_TABLE_PRECEDENTE}
+
+def test_derive_nouvelles_tables(derive):
+    compresse, nb_tables = compresser_semi(derive)
+    assert 4 <= nb_tables <= 8
+    assert types_blocs(compresse).count(TYPE_HUFFMAN) == nb_tables
+    # Plus compact qu'une seule table pour tout le fichier
+    statique = io.BytesIO()
+    compresser(io.BytesIO(derive), statique, canonique=True)
+    assert len(compresse) < 0.9 * len(statique.getvalue())
+    # Plus compact qu'une table par bloc
+    par_bloc = io.BytesIO()
+    compresser_flux(io.BytesIO(derive), par_bloc, TAILLE_FENETRE)
+    assert len(compresse) < len(par_bloc.getvalue())
+
+def test_seuil(derive):
+    compresseur = CompresseurSemiAdaptatif(TAILLE_FENETRE, seuil=0)
+    compresseur.compress(derive)
+    compresseur.flush()
+    assert compresseur.nb_tables > 8
+    compresseur = CompresseurSemiAdaptatif(TAILLE_FENETRE, seuil=100)
+    compresseur.compress(derive)
+    compresseur.flush()
+    # Une nouvelle table n'est construite que pour des octets sans code
+    assert compresseur.nb_tables == 4
+
+def test_aller_retour(derive):
+    compresse, _ = compresser_semi(derive)
+    destination = io.BytesIO()
+    decompresser_flux(io.BytesIO(compresse), destination)
+    assert destination.getvalue() == derive
+    destination = io.BytesIO()
+    decompresser_parallele(io.BytesIO(compresse), destination, nb_processus=2)
+    assert destination.getvalue() == derive
+
+def test_lecture_aleatoire(derive):
+    compresse, _ = compresser_semi(derive, index=True)
+    lecteur = LecteurIndexe(io.BytesIO(compresse))
+    for debut in [5 * TAILLE_FENETRE + 7, 0, 31 * TAILLE_FENETRE - 3, 17 * TAILLE_FENETRE]:
+        lecteur.seek(debut)
+        assert lecteur.read(TAILLE_FENETRE) == derive[debut:debut + TAILLE_FENETRE]
+
+def test_lecture_aleatoire_table_retenue(stationnaire, monkeypatch):
+    compresse, _ = compresser_semi(stationnaire, index=True)
+    lecteur = LecteurIndexe(io.BytesIO(compresse))
+    entetes_lues = []
+    lire_entete_bloc = huffman.lecteur_indexe.lire_entete_bloc
+    def lire_entete_bloc_compte(*args):
+        entetes_lues.append(args)
+        return lire_entete_bloc(*args)
+    monkeypatch.setattr(huffman.lecteur_indexe, "lire_entete_bloc", lire_entete_bloc_compte)
+    # Du dernier bloc au premier : un seul parcours des blocs sans table
+    nb_blocs = 20
+    for numero in reversed(range(nb_blocs)):
+        lecteur.seek(numero * TAILLE_FENETRE)
+        debut = numero * TAILLE_FENETRE
+        assert lecteur.read(10) == stationnaire[debut:debut + 10]
+    assert len(entetes_lues) <= 2 * nb_blocs
+
+def test_bloc_sans_table_precedente():
+    bloc = encoder_bloc_codes(b"abc", codes_du_bloc(Compteur({97: 1, 98: 1, 99: 1})),
+                              table_precedente=True)
+    with pytest.raises(FormatInvalideErreur):
+        decoder_bloc(TYPE_HUFFMAN_TABLE_PRECEDENTE, 3, bloc[TAILLE_ENTETE_BLOC:])
+    with pytest.raises(ValueError):
+        encoder_bloc_codes(b"abc", codes_du_bloc(Compteur({97: 1, 98: 1, 99: 1})), nb_flux=2,
+                           table_precedente=True)